@@ -0,0 +1,181 @@
+"""合成したLightroomのライブラリで主要な処理のスループットとメモリ使用量を計測する。
+
+synthetic_library.pyで生成したライブラリ（--libraryを省略した場合は一時
+ディレクトリに生成）に対して、以下の処理を計測します。
+
+- parse: XMPParser.parseによる全フィールドのパース
+- delete_rate_1: delete_rate_1のdry-runによる走査とパース
+- group_files: ディレクトリの走査とgroup_filesによるグループ分け
+- zip_chunker: zip_chunkerによるZIPアーカイブの作成（--recursive）
+
+各処理は独立した子プロセスで実行し、最大常駐メモリ（peak RSS）がほかの処理の
+影響を受けないようにします。結果はfiles/s・MB/s・peak RSSをJSONで出力するため、
+バージョン間の比較に使用できます（--repeatの最速の値）。
+
+Usage:
+    uv run python benchmarks/bench_library.py --sidecars 10000 --raw-size-kb 1024
+    uv run python benchmarks/bench_library.py --library /tmp/library --sidecars 10000
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from importlib.metadata import PackageNotFoundError, version
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from synthetic_library import LibraryStats, add_arguments, generate_from_arguments
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def peak_rss_mb() -> float | None:
+    """現在のプロセスの最大常駐メモリ（MiB）を返す。"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linuxはキロバイト、macOSはバイト単位
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(peak * scale / 1024**2, 1)
+
+
+def bench_parse(library: Path, options: dict[str, Any]) -> None:
+    from lrutility.xmp.XMPParser import XMPParser
+
+    parser = XMPParser()
+    for path in library.rglob("*.xmp"):
+        parser.parse(path)
+
+
+def bench_delete_rate_1(library: Path, options: dict[str, Any]) -> None:
+    from lrutility.cli.delete_rate_1 import delete_rate_1
+
+    delete_rate_1(library, dry_run=True, verbose=False, workers=options["workers"])
+
+
+def bench_group_files(library: Path, options: dict[str, Any]) -> None:
+    from lrutility.cli.zip_chunker import group_files
+    from lrutility.utils.walker import walk_files
+
+    entries = list(walk_files(library, sort=True))
+    sizes = {entry.path: entry.size for entry in entries}
+    group_files(list(sizes), options["size_chunk"], sizes)
+
+
+def bench_zip_chunker(library: Path, options: dict[str, Any]) -> None:
+    from lrutility.cli.zip_chunker import zip_chunker
+
+    with tempfile.TemporaryDirectory() as output:
+        zip_chunker(
+            [library],
+            options["size_chunk"],
+            verbose=False,
+            jobs=options["jobs"],
+            threads=options["threads"],
+            recursive=True,
+            output=Path(output) / "library",
+        )
+
+
+STAGES: dict[str, Callable[[Path, dict[str, Any]], None]] = {
+    "parse": bench_parse,
+    "delete_rate_1": bench_delete_rate_1,
+    "group_files": bench_group_files,
+    "zip_chunker": bench_zip_chunker,
+}
+
+
+def run_stage(name: str, library: Path, options: dict[str, Any]) -> dict[str, Any]:
+    """子プロセスで処理を1回実行し、経過時間と最大常駐メモリを返す。"""
+    # ログと進捗表示を計測から除く（configure_loguruは呼び出し時のstderrに出力する）
+    sys.stderr = open(os.devnull, "w")
+    start = time.perf_counter()
+    STAGES[name](library, options)
+    return {"seconds": time.perf_counter() - start, "peak_rss_mb": peak_rss_mb()}
+
+
+def measure(
+    name: str, library: Path, options: dict[str, Any], stats: LibraryStats
+) -> dict[str, Any]:
+    """処理をrepeat回実行し、最速の結果からスループットを計算する。"""
+    context = get_context("spawn")
+    runs = []
+    for _ in range(options["repeat"]):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            runs.append(pool.submit(run_stage, name, library, options).result())
+    best = min(runs, key=lambda run: run["seconds"])
+    if name in ("parse", "delete_rate_1"):
+        files, size = stats.sidecars, stats.xmp_bytes
+    else:
+        files = stats.sidecars + stats.raws
+        size = stats.xmp_bytes + stats.raw_bytes
+    return {
+        "files": files,
+        "bytes": size,
+        "seconds": round(best["seconds"], 3),
+        "files_per_second": round(files / best["seconds"], 1),
+        "mb_per_second": round(size / best["seconds"] / 1024**2, 1),
+        "peak_rss_mb": max(run["peak_rss_mb"] or 0 for run in runs) or None,
+    }
+
+
+def package_version() -> str:
+    try:
+        return version("lrutility")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--library", type=Path, help="Reuse or create a library here")
+    add_arguments(parser)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--size-chunk-mb", type=int, default=256)
+    args = parser.parse_args()
+
+    options = {
+        "repeat": args.repeat,
+        "workers": args.workers,
+        "jobs": args.jobs,
+        "threads": args.threads,
+        "size_chunk": args.size_chunk_mb * 1024**2,
+    }
+    with tempfile.TemporaryDirectory() as temporary:
+        library = args.library or Path(temporary) / "library"
+        # 生成時の概要をライブラリの外に保存し、再実行時に再利用する
+        stats_path = library.parent / f"{library.name}.json"
+        if stats_path.exists():
+            stats = LibraryStats(**json.loads(stats_path.read_text()))
+        else:
+            stats = generate_from_arguments(library, args)
+            stats_path.write_text(json.dumps(asdict(stats)))
+        results = {name: measure(name, library, options, stats) for name in args.stages}
+
+    report = {
+        "version": package_version(),
+        "python": platform.python_version(),
+        "library": asdict(stats),
+        "options": options,
+        "stages": results,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""XMPMetadataを大量に保持した場合の1レコードあたりのメモリ使用量を計測する。
+
+以下の3つの表現を比較します。
+
+- dict: __slots__を持たないデータクラス（従来の表現）、文字列の共有なし
+- slots: __slots__を持つデータクラス、文字列の共有なし
+- slots+intern: __slots__を持つデータクラス、StringPoolで文字列を共有
+
+Usage:
+    uv run python benchmarks/bench_memory.py --records 100000
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import MISSING, field, fields, make_dataclass
+from pathlib import Path
+from typing import Any
+
+from lrutility.xmp.XMPDataclass import XMPMetadata
+from lrutility.xmp.XMPParser import XMPParser
+
+ASSETS = [Path("tests/assets/rating_1.xmp"), Path("tests/assets/not_rating.xmp")]
+
+
+def dict_based(cls: type) -> type:
+    """同じフィールド構成で__slots__を持たないデータクラスを生成する。"""
+    specs = []
+    for f in fields(cls):
+        if f.default is not MISSING:
+            specs.append((f.name, f.type, field(default=f.default)))
+        else:
+            specs.append((f.name, f.type, field(default_factory=f.default_factory)))
+    return make_dataclass(f"Dict{cls.__name__}", specs)
+
+
+DICT_SECTIONS = [dict_based(f.type) for f in fields(XMPMetadata)]
+DictXMPMetadata = make_dataclass(
+    "DictXMPMetadata", [(f.name, Any) for f in fields(XMPMetadata)]
+)
+
+
+def to_dict_based(metadata: XMPMetadata) -> Any:
+    """XMPMetadataを同じ値を持つ__slots__なしの表現に変換する。"""
+    return DictXMPMetadata(
+        *(
+            section_type(*values)
+            for section_type, values in zip(DICT_SECTIONS, metadata.to_tuple())
+        )
+    )
+
+
+def measure(build: Callable[[], list[Any]]) -> int:
+    """buildが返すオブジェクトを保持するために確保されたバイト数を返す。"""
+    gc.collect()
+    tracemalloc.start()
+    records = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    paths = [ASSETS[i % len(ASSETS)] for i in range(args.records)]
+    plain = XMPParser(intern_strings=False)
+    pooled = XMPParser()
+    # パース計画のキャッシュ等の初回のみの確保を計測から除く
+    plain.parse(ASSETS[0])
+    pooled.parse(ASSETS[0])
+
+    results = {
+        "dict": measure(lambda: [to_dict_based(plain.parse(p)) for p in paths]),
+        "slots": measure(lambda: [plain.parse(p) for p in paths]),
+        "slots+intern": measure(lambda: [pooled.parse(p) for p in paths]),
+    }
+    report = {
+        "records": args.records,
+        "bytes_per_record": {
+            name: round(size / args.records) for name, size in results.items()
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
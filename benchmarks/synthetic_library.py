@@ -0,0 +1,289 @@
+"""ベンチマーク用のLightroomのライブラリを模したディレクトリを生成する。
+
+撮影日ごとのネストしたディレクトリ（<年>/<年-月-日>/）に、RAWファイル（ダミー）と
+XMPサイドカーの組を作成します。XMPはLightroom Classicが書き出す形式に合わせ、
+一部のファイルにはマスク（crs:MaskGroupBasedCorrections）によるローカル補正の
+大きなサブツリーを含めます。乱数のシードを固定するため、同じ引数からは同じ
+ライブラリが生成されます。
+
+Usage:
+    uv run python benchmarks/synthetic_library.py /tmp/library --sidecars 10000
+"""
+
+import argparse
+import json
+import random
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+XMP_TEMPLATE = """\
+<x:xmpmeta xmlns:x="adobe:ns:meta/" x:xmptk="Adobe XMP Core 7.0-c000 1.000000">
+ <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+  <rdf:Description rdf:about=""
+    xmlns:xmp="http://ns.adobe.com/xap/1.0/"
+    xmlns:xmpMM="http://ns.adobe.com/xap/1.0/mm/"
+    xmlns:stEvt="http://ns.adobe.com/xap/1.0/sType/ResourceEvent#"
+    xmlns:tiff="http://ns.adobe.com/tiff/1.0/"
+    xmlns:exif="http://ns.adobe.com/exif/1.0/"
+    xmlns:aux="http://ns.adobe.com/exif/1.0/aux/"
+    xmlns:exifEX="http://cipa.jp/exif/1.0/"
+    xmlns:photoshop="http://ns.adobe.com/photoshop/1.0/"
+    xmlns:dc="http://purl.org/dc/elements/1.1/"
+    xmlns:crd="http://ns.adobe.com/camera-raw-defaults/1.0/"
+    xmlns:xmpDM="http://ns.adobe.com/xmp/1.0/DynamicMedia/"
+    xmlns:crs="http://ns.adobe.com/camera-raw-settings/1.0/"
+   xmp:CreatorTool="ILCE-7M4 v5.00"
+   xmp:ModifyDate="{date}"
+   xmp:CreateDate="{date}"
+   xmp:MetadataDate="{date}"{rating}
+   xmpMM:DocumentID="urn:uuid:{document_id}"
+   xmpMM:InstanceID="xmp.iid:{instance_id}"
+   xmpMM:PreservedFileName="{raw_name}"
+   tiff:Make="SONY"
+   tiff:Model="ILCE-7M4"
+   tiff:Orientation="1"
+   tiff:ImageWidth="7008"
+   tiff:ImageLength="4672"
+   exif:ExposureTime="1/{shutter}"
+   exif:FNumber="{aperture}/10"
+   exif:ExposureProgram="1"
+   exif:FocalLength="{focal}/1"
+   exif:DateTimeOriginal="{date}"
+   exif:PixelXDimension="7008"
+   exif:PixelYDimension="4672"
+   aux:Lens="FE 70-200mm F2.8 GM OSS II"
+   exifEX:LensModel="FE 70-200mm F2.8 GM OSS II"
+   photoshop:DateCreated="{date}"
+   photoshop:SidecarForExtension="ARW"
+   dc:format="image/x-sony-arw"
+   crd:CameraProfile="Camera ST"
+   xmpDM:pick="0"
+   crs:Version="17.0"
+   crs:ProcessVersion="15.4"
+   crs:WhiteBalance="As Shot"
+   crs:Exposure2012="{exposure:+.2f}"
+   crs:Contrast2012="{contrast}"
+   crs:Highlights2012="-{highlights}"
+   crs:Shadows2012="+{shadows}"
+   crs:CropTop="0"
+   crs:CropLeft="0"
+   crs:CropBottom="1"
+   crs:CropRight="1"
+   crs:CropAngle="0"
+   crs:HasCrop="False"
+   crs:AlreadyApplied="False"
+   crs:RawFileName="{raw_name}">
+{masks}   <xmpMM:History>
+    <rdf:Seq>
+     <rdf:li
+      stEvt:action="saved"
+      stEvt:instanceID="xmp.iid:{instance_id}"
+      stEvt:when="{date}"
+      stEvt:softwareAgent="Adobe Photoshop Lightroom Classic 14.4 (Windows)"
+      stEvt:changed="/metadata"/>
+    </rdf:Seq>
+   </xmpMM:History>
+   <exif:ISOSpeedRatings>
+    <rdf:Seq>
+     <rdf:li>{iso}</rdf:li>
+    </rdf:Seq>
+   </exif:ISOSpeedRatings>
+  </rdf:Description>
+ </rdf:RDF>
+</x:xmpmeta>
+"""
+
+MASK_TEMPLATE = """\
+     <rdf:li>
+      <rdf:Description
+       crs:What="Correction"
+       crs:CorrectionAmount="1.000000"
+       crs:CorrectionActive="true"
+       crs:CorrectionName="Mask {index}"
+       crs:LocalExposure2012="{exposure:.6f}"
+       crs:LocalContrast2012="0.000000"
+       crs:LocalClarity2012="{clarity:.6f}">
+      <crs:CorrectionMasks>
+       <rdf:Seq>
+        <rdf:li
+         crs:What="Mask/Paint"
+         crs:MaskValue="1.000000"
+         crs:Radius="0.045000"
+         crs:Flow="1.000000"
+         crs:CenterWeight="0.000000">
+        <crs:Dabs>
+         <rdf:Seq>
+{dabs}         </rdf:Seq>
+        </crs:Dabs>
+        </rdf:li>
+       </rdf:Seq>
+      </crs:CorrectionMasks>
+      </rdf:Description>
+     </rdf:li>
+"""
+
+
+@dataclass(slots=True)
+class LibraryStats:
+    """生成したライブラリの概要。"""
+
+    sidecars: int  # XMPファイルの数
+    raws: int  # RAWファイルの数
+    directories: int  # 撮影日ごとのディレクトリの数
+    rating_1: int  # レーティング1のXMPファイルの数
+    xmp_bytes: int  # XMPファイルの合計サイズ
+    raw_bytes: int  # RAWファイルの合計サイズ
+
+
+def render_masks(rng: random.Random, count: int, dabs: int) -> str:
+    """マスクによるローカル補正のサブツリーを生成する。"""
+    if not count:
+        return ""
+    masks = []
+    for index in range(count):
+        lines = "".join(
+            f"          <rdf:li>d {rng.random():.6f} {rng.random():.6f}</rdf:li>\n"
+            for _ in range(dabs)
+        )
+        masks.append(
+            MASK_TEMPLATE.format(
+                index=index + 1,
+                exposure=rng.uniform(-1, 1),
+                clarity=rng.uniform(-0.5, 0.5),
+                dabs=lines,
+            )
+        )
+    return (
+        "   <crs:MaskGroupBasedCorrections>\n    <rdf:Seq>\n"
+        + "".join(masks)
+        + "    </rdf:Seq>\n   </crs:MaskGroupBasedCorrections>\n"
+    )
+
+
+def render_xmp(
+    rng: random.Random, raw_name: str, taken: datetime, rating: int, masks: str
+) -> str:
+    """1枚の画像のXMPを生成する。"""
+    return XMP_TEMPLATE.format(
+        date=taken.isoformat(timespec="milliseconds"),
+        rating=f'\n   xmp:Rating="{rating}"' if rating else "",
+        document_id=uuid.UUID(int=rng.getrandbits(128)),
+        instance_id=uuid.UUID(int=rng.getrandbits(128)),
+        raw_name=raw_name,
+        shutter=rng.choice([60, 125, 250, 500, 1000]),
+        aperture=rng.choice([28, 40, 56, 80]),
+        focal=rng.randint(70, 200),
+        exposure=rng.uniform(-1, 1),
+        contrast=rng.randint(-20, 20),
+        highlights=rng.randint(0, 100),
+        shadows=rng.randint(0, 100),
+        iso=rng.choice([100, 400, 1250, 3200]),
+        masks=masks,
+    )
+
+
+def write_raw(path: Path, size: int, block: bytes) -> None:
+    """圧縮しにくいダミーのRAWファイルを作成する（blockを繰り返し書き込む）。"""
+    with path.open("wb") as f:
+        remaining = size
+        while remaining > 0:
+            written = f.write(block[:remaining])
+            remaining -= written
+
+
+def generate_library(
+    root: Path,
+    sidecars: int = 1000,
+    raw_size: int = 64 * 1024,
+    per_directory: int = 200,
+    masked_ratio: float = 0.3,
+    max_masks: int = 8,
+    dabs: int = 200,
+    rating_1_ratio: float = 0.2,
+    seed: int = 0,
+) -> LibraryStats:
+    """ライブラリを生成する。
+
+    Args:
+        root: 生成先のディレクトリ（存在しない場合は作成する）
+        sidecars: XMPとRAWファイルの組の数
+        raw_size: RAWファイルのサイズ（バイト、0の場合はRAWファイルを作成しない）
+        per_directory: 撮影日ごとのディレクトリに含める組の数
+        masked_ratio: マスクによるローカル補正を含むXMPの割合
+        max_masks: 1つのXMPに含めるマスクの最大数
+        dabs: 1つのマスクに含めるブラシの点の数
+        rating_1_ratio: レーティング1とする割合（残りは0・2〜5から選ぶ）
+        seed: 乱数のシード
+    """
+    rng = random.Random(seed)
+    block = random.Random(seed).randbytes(min(raw_size, 1024**2)) if raw_size else b""
+    stats = LibraryStats(0, 0, 0, 0, 0, 0)
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    directory = root
+    for i in range(sidecars):
+        taken = start + timedelta(days=i // per_directory, seconds=i % per_directory)
+        if i % per_directory == 0:
+            directory = root / f"{taken:%Y}" / f"{taken:%Y-%m-%d}"
+            directory.mkdir(parents=True, exist_ok=True)
+            stats.directories += 1
+        stem = f"DSC{i:05d}"
+        if rng.random() < rating_1_ratio:
+            rating = 1
+            stats.rating_1 += 1
+        else:
+            rating = rng.choice([0, 2, 3, 4, 5])
+        count = rng.randint(1, max_masks) if rng.random() < masked_ratio else 0
+        xmp = render_xmp(
+            rng, f"{stem}.ARW", taken, rating, render_masks(rng, count, dabs)
+        ).encode()
+        (directory / f"{stem}.xmp").write_bytes(xmp)
+        stats.sidecars += 1
+        stats.xmp_bytes += len(xmp)
+        if raw_size:
+            write_raw(directory / f"{stem}.ARW", raw_size, block)
+            stats.raws += 1
+            stats.raw_bytes += raw_size
+    return stats
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """ライブラリの生成の引数を追加する。"""
+    parser.add_argument("--sidecars", type=int, default=1000)
+    parser.add_argument("--raw-size-kb", type=int, default=64)
+    parser.add_argument("--per-directory", type=int, default=200)
+    parser.add_argument("--masked-ratio", type=float, default=0.3)
+    parser.add_argument("--max-masks", type=int, default=8)
+    parser.add_argument("--dabs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def generate_from_arguments(root: Path, args: argparse.Namespace) -> LibraryStats:
+    """add_argumentsで追加した引数でライブラリを生成する。"""
+    return generate_library(
+        root,
+        sidecars=args.sidecars,
+        raw_size=args.raw_size_kb * 1024,
+        per_directory=args.per_directory,
+        masked_ratio=args.masked_ratio,
+        max_masks=args.max_masks,
+        dabs=args.dabs,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", type=Path)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.root.exists() and any(args.root.iterdir()):
+        parser.error(f"{args.root} is not empty")
+    stats = generate_from_arguments(args.root, args)
+    print(json.dumps(asdict(stats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
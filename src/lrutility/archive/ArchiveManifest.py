@@ -0,0 +1,153 @@
+import json
+import os
+import zipfile
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from lrutility.utils.walker import FileEntry
+
+
+def manifest_path(directory: Path) -> Path:
+    """ディレクトリのアーカイブと同じ場所に置くマニフェストのパスを返す。"""
+    return directory.parent / f"{directory.name}_manifest.jsonl"
+
+
+@dataclass(slots=True)
+class ManifestEntry:
+    """アーカイブに格納したファイル。"""
+
+    path: str  # アーカイブ内の名前（対象ディレクトリからの相対パス）
+    size: int  # 格納時のファイルサイズ（バイト）
+    mtime_ns: int  # 格納時の更新日時（ナノ秒）
+    crc: int  # CRC32
+
+
+@dataclass(slots=True)
+class ArchiveRecord:
+    """書き込みが完了したアーカイブ。"""
+
+    index: int  # アーカイブの番号（1から）
+    name: str  # アーカイブのファイル名
+    size: int  # アーカイブのファイルサイズ（バイト）
+    files: list[ManifestEntry] = field(default_factory=list)
+
+    def matches(self, archive_path: Path, entries: Mapping[str, FileEntry]) -> bool:
+        """アーカイブが完了時のまま存在し、同じファイルを格納しているか判定する。
+
+        Args:
+            archive_path: アーカイブのパス
+            entries: アーカイブ内の名前から格納する予定のファイルへの対応
+                （格納順。名前・サイズ・更新日時を比較する）
+        """
+        try:
+            size = archive_path.stat().st_size
+        except OSError:
+            return False
+        if archive_path.name != self.name or size != self.size:
+            return False
+        expected = [(name, e.size, e.mtime_ns) for name, e in entries.items()]
+        recorded = [(file.path, file.size, file.mtime_ns) for file in self.files]
+        return expected == recorded
+
+
+class ArchiveManifest:
+    """zip_chunkerが作成したアーカイブと格納したファイルを追記していくマニフェスト。
+
+    1行1レコードのJSONで、アーカイブごとに書き込みが完了した時点で記録します。
+    同じ番号のアーカイブが複数回記録されている場合は最後のレコードを使用します。
+    再実行時に完了済みのアーカイブを省略したり、前回以降に追加・変更された
+    ファイルだけをアーカイブするために使用します。
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Args:
+            path: マニフェストファイルのパス
+        """
+        self.path = path
+
+    def load(self) -> dict[int, ArchiveRecord]:
+        """記録されたアーカイブを番号順に返す（ファイルがない場合は空）。"""
+        records: dict[int, ArchiveRecord] = {}
+        if not self.path.exists():
+            return records
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # 中断時に書きかけとなった最終行は無視する
+                    continue
+                files = [ManifestEntry(**file) for file in data.pop("files")]
+                record = ArchiveRecord(**data, files=files)
+                records[record.index] = record
+        return dict(sorted(records.items()))
+
+    def append(self, record: ArchiveRecord) -> None:
+        """完了したアーカイブを記録する。"""
+        line = json.dumps(asdict(record), ensure_ascii=False)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def record_archive(
+    archive_path: Path,
+    index: int,
+    entries: Mapping[str, FileEntry],
+    crcs: Mapping[str, int] | None = None,
+) -> ArchiveRecord:
+    """作成したアーカイブのレコードを作成する。
+
+    Args:
+        archive_path: アーカイブのパス
+        index: アーカイブの番号
+        entries: アーカイブ内の名前からファイルへの対応
+        crcs: 書き込み時に計算した格納順のメンバーのCRC32。Noneの場合はZIPの
+            セントラルディレクトリから読み込む。
+    """
+    if crcs is None:
+        with zipfile.ZipFile(archive_path) as zf:
+            crcs = {zinfo.filename: zinfo.CRC for zinfo in zf.infolist()}
+    files = [
+        ManifestEntry(
+            path=name,
+            size=entries[name].size,
+            mtime_ns=entries[name].mtime_ns,
+            crc=crc,
+        )
+        for name, crc in crcs.items()
+    ]
+    return ArchiveRecord(
+        index=index,
+        name=archive_path.name,
+        size=archive_path.stat().st_size,
+        files=files,
+    )
+
+
+def verify_archive(archive_path: Path, entries: Mapping[str, FileEntry]) -> bool:
+    """マニフェストに記録されていないアーカイブが完全に書き込まれているか検証する。
+
+    格納されたファイルの名前とサイズが予定と一致し、全メンバーのCRC32が
+    正しい場合にTrueを返す。書き込みの途中で中断したアーカイブはFalse。
+    tar形式のアーカイブは検証せずにFalseを返す（書き直す）。
+    """
+    expected = [(name, entry.size) for name, entry in entries.items()]
+    try:
+        with zipfile.ZipFile(archive_path) as zf:
+            members = [(zinfo.filename, zinfo.file_size) for zinfo in zf.infolist()]
+            return members == expected and zf.testzip() is None
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def archived_files(records: Mapping[int, ArchiveRecord]) -> dict[str, tuple[int, int]]:
+    """記録されたファイルの最新のサイズと更新日時を返す。"""
+    return {
+        file.path: (file.size, file.mtime_ns)
+        for record in records.values()
+        for file in record.files
+    }
@@ -0,0 +1,247 @@
+import tarfile
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, Literal
+
+from lrutility.archive.checksums import new_hasher
+from lrutility.archive.CompressionPolicy import CompressionPolicy
+from lrutility.archive.ingest import READ_SIZE, advise, read_exact
+from lrutility.archive.ParallelZipWriter import write_members
+from lrutility.archive.ZipStreamWriter import ZipStreamWriter
+from lrutility.options import DEFAULT_MEMORY_BUDGET, ArchiveFormat, HashAlgorithm
+from lrutility.utils.instrument import stage
+
+# 形式ごとのアーカイブの拡張子
+EXTENSIONS: dict[ArchiveFormat, str] = {
+    "zip": ".zip",
+    "tar": ".tar",
+    "tar.gz": ".tar.gz",
+    "tar.xz": ".tar.xz",
+}
+
+
+class StreamSink:
+    """シークできない書き込み先として扱うためのラッパー。
+
+    ファイルに書き込む場合でもシークせずに書き込むため（ZIPは常にデータ
+    ディスクリプタを使う）、連結した各アーカイブはそれぞれ単独のアーカイブとして
+    読み込めます。
+    """
+
+    def __init__(self, fileobj: BinaryIO) -> None:
+        self.fileobj = fileobj
+
+    def write(self, data: bytes) -> int:
+        return self.fileobj.write(data)
+
+    def flush(self) -> None:
+        self.fileobj.flush()
+
+
+class ArchiveWriter(ABC):
+    """アーカイブの形式ごとの書き込みの基底クラス。
+
+    パイプや名前付きパイプ等のシークできない書き込み先にも書き込めます
+    （StreamSinkを参照）。書き込み先のファイルオブジェクトは閉じません。
+
+    Attributes:
+        crcs: アーカイブ内の名前からCRC32への対応
+        digests: アーカイブ内の名前からハッシュ値への対応（hash_algorithmを
+            指定した場合）
+    """
+
+    def __init__(
+        self, fileobj: Any, hash_algorithm: HashAlgorithm | None = None
+    ) -> None:
+        """
+        Args:
+            fileobj: 書き込み先
+            hash_algorithm: 指定した場合、書き込みと同じ読み込みでハッシュ値を計算する
+        """
+        self.fileobj = fileobj
+        self.hash_algorithm = hash_algorithm
+        self.crcs: dict[str, int] = {}
+        self.digests: dict[str, str] = {}
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @abstractmethod
+    def write(
+        self,
+        members: Iterable[tuple[Path, str]],
+        progress: Callable[[int], None] | None = None,
+    ) -> None:
+        """ファイルをアーカイブのメンバーとして書き込む。
+
+        Args:
+            members: (ファイルのパス, アーカイブ内の名前)の列
+            progress: 書き込んだ元データのバイト数を受け取る関数
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """アーカイブの終端を書き込む。"""
+
+
+class ZipArchiveWriter(ArchiveWriter):
+    """ZIPアーカイブの書き込み（メンバーごとの圧縮方式の選択と並列圧縮に対応）。"""
+
+    def __init__(
+        self,
+        fileobj: Any,
+        hash_algorithm: HashAlgorithm | None = None,
+        policy: CompressionPolicy | None = None,
+        threads: int = 1,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ) -> None:
+        """
+        Args:
+            fileobj: 書き込み先（シークできなくてもよい）
+            hash_algorithm: 指定した場合、書き込みと同じ読み込みでハッシュ値を計算する
+            policy: メンバーごとの圧縮方式の選択。Noneの場合は"auto"。
+            threads: 圧縮を行うスレッド数
+            memory_budget: threads > 1の場合のメモリの上限（バイト）
+        """
+        super().__init__(fileobj, hash_algorithm)
+        self.policy = policy or CompressionPolicy()
+        self.threads = threads
+        self.memory_budget = memory_budget
+        self.zf = ZipStreamWriter(fileobj)
+
+    def write(
+        self,
+        members: Iterable[tuple[Path, str]],
+        progress: Callable[[int], None] | None = None,
+    ) -> None:
+        digests = write_members(
+            self.zf,
+            members,
+            self.policy,
+            self.threads,
+            self.memory_budget,
+            progress,
+            self.hash_algorithm,
+        )
+        self.digests.update(digests)
+
+    def close(self) -> None:
+        self.crcs.update((zinfo.filename, zinfo.CRC) for zinfo in self.zf.entries)
+        self.zf.close()
+
+
+class _TapReader:
+    """tarfileに渡すファイルの読み込み。読み込んだデータからCRC32とハッシュ値を計算する。"""
+
+    def __init__(
+        self,
+        path: Path,
+        hasher: Any,
+        progress: Callable[[int], None] | None,
+    ) -> None:
+        self.file = path.open("rb", buffering=0)
+        self.hasher = hasher
+        self.progress = progress
+        self.crc = 0
+        self.offset = 0
+        advise(self.file.fileno(), 0, 0, "POSIX_FADV_SEQUENTIAL")
+
+    def read(self, size: int) -> bytes:
+        with stage("read"):
+            data = read_exact(self.file, size)
+        if data:
+            advise(self.file.fileno(), self.offset, len(data), "POSIX_FADV_DONTNEED")
+            self.offset += len(data)
+            self.crc = zlib.crc32(data, self.crc)
+            if self.hasher:
+                self.hasher.update(data)
+            if self.progress is not None:
+                self.progress(len(data))
+        return data
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class TarArchiveWriter(ArchiveWriter):
+    """tarアーカイブの書き込み（ストリーム全体をgzip・xzで圧縮することもできる）。"""
+
+    def __init__(
+        self,
+        fileobj: Any,
+        hash_algorithm: HashAlgorithm | None = None,
+        compression: Literal["", "gz", "xz"] = "",
+    ) -> None:
+        """
+        Args:
+            fileobj: 書き込み先
+            hash_algorithm: 指定した場合、書き込みと同じ読み込みでハッシュ値を計算する
+            compression: ""は無圧縮、"gz"はgzip、"xz"はxz
+        """
+        super().__init__(fileobj, hash_algorithm)
+        self.tar = tarfile.open(
+            fileobj=fileobj,
+            mode=f"w|{compression}",
+            format=tarfile.PAX_FORMAT,
+            copybufsize=READ_SIZE,
+        )
+
+    def write(
+        self,
+        members: Iterable[tuple[Path, str]],
+        progress: Callable[[int], None] | None = None,
+    ) -> None:
+        for path, arcname in members:
+            tarinfo = self.tar.gettarinfo(path, arcname)
+            hasher = self.hash_algorithm and new_hasher(self.hash_algorithm)
+            reader = _TapReader(path, hasher, progress)
+            try:
+                # 読み込みを除いたtarの書き込みとストリームの圧縮の時間
+                with stage("compress", items=1, nbytes=tarinfo.size):
+                    self.tar.addfile(tarinfo, reader)
+            finally:
+                reader.close()
+            self.crcs[tarinfo.name] = reader.crc
+            if hasher:
+                self.digests[tarinfo.name] = hasher.hexdigest()
+
+    def close(self) -> None:
+        self.tar.close()
+
+
+def open_writer(
+    archive_format: ArchiveFormat,
+    fileobj: Any,
+    hash_algorithm: HashAlgorithm | None = None,
+    policy: CompressionPolicy | None = None,
+    threads: int = 1,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+) -> ArchiveWriter:
+    """形式に対応するArchiveWriterを返す。
+
+    policy・threads・memory_budgetはzipの場合のみ使用する（tarは
+    ストリーム全体を1つのスレッドで圧縮する）。
+
+    Raises:
+        ValueError: 未知の形式が指定された場合
+    """
+    if archive_format == "zip":
+        return ZipArchiveWriter(fileobj, hash_algorithm, policy, threads, memory_budget)
+    if archive_format == "tar":
+        return TarArchiveWriter(fileobj, hash_algorithm)
+    if archive_format == "tar.gz":
+        return TarArchiveWriter(fileobj, hash_algorithm, "gz")
+    if archive_format == "tar.xz":
+        return TarArchiveWriter(fileobj, hash_algorithm, "xz")
+    raise ValueError(f"Unknown archive format: {archive_format}")
@@ -0,0 +1,146 @@
+import zipfile
+import zlib
+from pathlib import Path
+
+from lrutility.index.SidecarIndex import RAW_SUFFIXES
+from lrutility.options import CompressionMode
+
+# 圧縮済みの形式のため、deflateしてもほとんど小さくならない拡張子
+STORED_SUFFIXES = RAW_SUFFIXES | frozenset(
+    {
+        ".jpg",
+        ".jpeg",
+        ".heic",
+        ".heif",
+        ".hif",
+        ".png",
+        ".webp",
+        ".avif",
+        ".jxl",
+        ".mp4",
+        ".mov",
+        ".m4v",
+        ".mts",
+        ".avi",
+        ".mp3",
+        ".m4a",
+        ".aac",
+        ".zip",
+        ".gz",
+        ".xz",
+        ".bz2",
+        ".zst",
+        ".7z",
+        ".rar",
+    }
+)
+
+# テキスト形式のため、deflateで大きく小さくなる拡張子
+DEFLATED_SUFFIXES = frozenset(
+    {
+        ".xmp",
+        ".xml",
+        ".txt",
+        ".json",
+        ".csv",
+        ".dop",
+        ".pp3",
+        ".on1",
+        ".cos",
+        ".lrcat",
+        ".log",
+    }
+)
+
+# 試験圧縮を行わずにdeflateするファイルサイズの上限
+SMALL_FILE_SIZE = 64 * 1024
+
+# 試験圧縮で読み込むブロックの大きさと数（先頭・中央・末尾から読み込む）
+SAMPLE_SIZE = 64 * 1024
+SAMPLE_BLOCKS = 3
+
+# 試験圧縮の圧縮率（圧縮後/圧縮前）がこの値以上の場合は無圧縮で格納する
+STORE_RATIO = 0.95
+
+
+def sample_ratio(path: Path, size: int) -> float:
+    """ファイルの一部を試験的に圧縮し、圧縮率（圧縮後/圧縮前）を返す。
+
+    先頭・中央・末尾からSAMPLE_SIZEずつ読み込み、最速の圧縮レベルで圧縮する。
+
+    Args:
+        path: ファイルのパス
+        size: ファイルサイズ
+
+    Returns:
+        圧縮率。読み込んだデータが空の場合は0。
+    """
+    step = max(size - SAMPLE_SIZE, 0) // max(SAMPLE_BLOCKS - 1, 1)
+    offsets = sorted({step * i for i in range(SAMPLE_BLOCKS)})
+    raw = compressed = 0
+    with path.open("rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            block = f.read(SAMPLE_SIZE)
+            raw += len(block)
+            compressed += len(zlib.compress(block, 1))
+    return compressed / raw if raw else 0.0
+
+
+class CompressionPolicy:
+    """ZIPアーカイブのメンバーごとに圧縮方式を選択する。
+
+    mode="auto"の場合、RAWやJPEG等の圧縮済みの形式はZIP_STORED、XMP等の
+    テキスト形式はZIP_DEFLATEDとし、それ以外は一部を試験的に圧縮して
+    ほとんど小さくならない場合にZIP_STOREDを選択します。
+
+    Examples:
+        >>> policy = CompressionPolicy()
+        >>> policy.choose(Path("IMG_0001.ARW"), 25_000_000)
+        0
+    """
+
+    def __init__(self, mode: CompressionMode = "auto") -> None:
+        """
+        Args:
+            mode: "auto"は形式に応じて選択、"deflate"は全てZIP_DEFLATED、
+                "store"は全てZIP_STORED
+        """
+        if mode not in ("auto", "deflate", "store"):
+            raise ValueError(f"Unknown compression mode: {mode}")
+        self.mode = mode
+
+    def known(self, path: Path, size: int) -> int | None:
+        """ファイルを読み込まずに決まる圧縮方式を返す（試験圧縮が必要な場合はNone）。
+
+        Args:
+            path: ファイルのパス
+            size: ファイルサイズ
+        """
+        if self.mode == "store":
+            return zipfile.ZIP_STORED
+        if self.mode == "deflate":
+            return zipfile.ZIP_DEFLATED
+        suffix = path.suffix.lower()
+        if suffix in STORED_SUFFIXES:
+            return zipfile.ZIP_STORED
+        if suffix in DEFLATED_SUFFIXES or size <= SMALL_FILE_SIZE:
+            return zipfile.ZIP_DEFLATED
+        return None
+
+    def choose(self, path: Path, size: int) -> int:
+        """ファイルの圧縮方式（zipfile.ZIP_STOREDまたはZIP_DEFLATED）を返す。
+
+        Args:
+            path: ファイルのパス
+            size: ファイルサイズ
+        """
+        compress_type = self.known(path, size)
+        if compress_type is not None:
+            return compress_type
+        try:
+            ratio = sample_ratio(path, size)
+        except OSError:
+            # 読み込めない場合は書き込み時のエラーとして扱う
+            return zipfile.ZIP_DEFLATED
+        return zipfile.ZIP_STORED if ratio >= STORE_RATIO else zipfile.ZIP_DEFLATED
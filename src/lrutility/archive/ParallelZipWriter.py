@@ -0,0 +1,338 @@
+import queue
+import threading
+import zipfile
+import zlib
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from lrutility.archive.checksums import new_hasher
+from lrutility.archive.CompressionPolicy import CompressionPolicy
+from lrutility.archive.ingest import iter_blocks, iter_views
+from lrutility.archive.ZipStreamWriter import ZipStreamWriter
+from lrutility.options import DEFAULT_MEMORY_BUDGET, HashAlgorithm
+from lrutility.utils.instrument import count, stage, timed
+
+# 並列に圧縮する単位（ファイルはこのサイズのブロックに分割して圧縮する）
+BLOCK_SIZE = 1024**2
+
+# deflateが参照する直前のデータの長さ（ブロックの境界をまたいだ圧縮に使用する）
+WINDOW_SIZE = 32 * 1024
+
+
+class ByteBudget:
+    """同時に保持するデータのバイト数を制限するセマフォ。"""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.used = 0
+        self._cancelled = False
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> None:
+        """sizeバイトを確保できるまで待つ（上限を超えるサイズは単独で確保する）。"""
+        with self._condition:
+            while (
+                self.used > 0 and self.used + size > self.limit and not self._cancelled
+            ):
+                self._condition.wait()
+            self.used += size
+
+    def release(self, size: int) -> None:
+        with self._condition:
+            self.used -= size
+            self._condition.notify_all()
+
+    def cancel(self) -> None:
+        """待機中のacquireを解除する。"""
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify_all()
+
+
+def deflate_block(data: bytes, zdict: bytes, level: int, final: bool) -> bytes:
+    """1ブロックをヘッダーのないdeflateストリームの一部として圧縮する。
+
+    直前のブロックの末尾をzdictとして与えることで、ブロックの境界をまたいだ一致も
+    圧縮に使用する。最後以外のブロックはZ_SYNC_FLUSHでバイト境界に揃えるため、
+    各ブロックの出力を連結したものが1つの有効なdeflateストリームとなる。
+
+    Args:
+        data: 圧縮するデータ
+        zdict: 直前のブロックの末尾（最初のブロックの場合は空）
+        level: 圧縮レベル
+        final: メンバーの最後のブロックの場合True
+
+    Returns:
+        圧縮されたデータ
+    """
+    if zdict:
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    flush = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+    return compressor.compress(data) + compressor.flush(flush)
+
+
+class ParallelZipWriter:
+    """ZIPアーカイブのメンバーを複数スレッドで圧縮し、1つのスレッドで順に書き込む。
+
+    読み込みスレッドがファイルをBLOCK_SIZEごとに読み込んで圧縮をスレッドプールに
+    渡し（zlibは圧縮中にGILを解放する）、呼び出し元のスレッドが圧縮済みの
+    データをファイルの順にZipStreamWriterへ書き込みます。policyでZIP_STOREDとした
+    メンバーは圧縮せずにそのまま書き込みます。CRC32とサイズは書き込み時に
+    計算してデータディスクリプタに記録するため、出力は通常のZIP_DEFLATEDの
+    アーカイブとして読み込めます。読み込み済み・圧縮中のデータのメモリは
+    memory_budgetで制限されます。
+
+    Examples:
+        >>> with ZipStreamWriter.open(path) as zf:
+        ...     ParallelZipWriter(zf, threads=8).write([(file_path, "IMG_0001.ARW")])
+    """
+
+    def __init__(
+        self,
+        zf: ZipStreamWriter,
+        threads: int,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        block_size: int = BLOCK_SIZE,
+        compresslevel: int = zlib.Z_DEFAULT_COMPRESSION,
+        policy: CompressionPolicy | None = None,
+        hash_algorithm: HashAlgorithm | None = None,
+    ) -> None:
+        """
+        Args:
+            zf: 書き込み先のアーカイブ
+            threads: 圧縮を行うスレッド数
+            memory_budget: 読み込み済み・圧縮中のデータに使用するメモリの上限（バイト）
+            block_size: 並列に圧縮する単位（バイト）
+            compresslevel: 圧縮レベル
+            policy: メンバーごとの圧縮方式の選択。Noneの場合は全てZIP_DEFLATED。
+            hash_algorithm: 指定した場合、圧縮と同じ読み込み済みのデータから
+                メンバーのハッシュ値を計算してdigestsに格納する
+        """
+        self.zf = zf
+        self.threads = max(1, threads)
+        self.memory_budget = memory_budget
+        self.block_size = block_size
+        self.compresslevel = compresslevel
+        self.policy = policy or CompressionPolicy("deflate")
+        self.hash_algorithm = hash_algorithm
+        self.digests: dict[str, str] = {}
+
+    def write(
+        self,
+        members: Iterable[tuple[Path, str]],
+        progress: Callable[[int], None] | None = None,
+    ) -> None:
+        """ファイルをアーカイブのメンバーとして順に書き込む。
+
+        Args:
+            members: (ファイルのパス, アーカイブ内の名前)の列
+            progress: 書き込んだ元データのバイト数を受け取る関数
+        """
+        budget = ByteBudget(self.memory_budget)
+        stop = threading.Event()
+        items: queue.Queue[tuple[Any, ...]] = queue.Queue()
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            reader = threading.Thread(
+                target=self._read,
+                args=(members, pool, budget, stop, items),
+                daemon=True,
+            )
+            reader.start()
+            try:
+                self._write_items(items, budget, progress)
+            finally:
+                stop.set()
+                budget.cancel()
+                reader.join()
+
+    def _read(
+        self,
+        members: Iterable[tuple[Path, str]],
+        pool: ThreadPoolExecutor,
+        budget: ByteBudget,
+        stop: threading.Event,
+        items: "queue.Queue[tuple[Any, ...]]",
+    ) -> None:
+        try:
+            for path, arcname in members:
+                if stop.is_set():
+                    return
+                zinfo = zipfile.ZipInfo.from_file(path, arcname)
+                zinfo.compress_type = self.policy.choose(path, zinfo.file_size)
+                items.put(("member", zinfo))
+                deflate = zinfo.compress_type == zipfile.ZIP_DEFLATED
+                hasher = self.hash_algorithm and new_hasher(self.hash_algorithm)
+                self._read_blocks(path, deflate, pool, budget, stop, items, hasher)
+                if hasher:
+                    self.digests[arcname] = hasher.hexdigest()
+        except BaseException as e:
+            items.put(("error", e))
+        else:
+            items.put(("done",))
+
+    def _read_blocks(
+        self,
+        path: Path,
+        deflate: bool,
+        pool: ThreadPoolExecutor,
+        budget: ByteBudget,
+        stop: threading.Event,
+        items: "queue.Queue[tuple[Any, ...]]",
+        hasher: Any = None,
+    ) -> None:
+        zdict = b""
+        for block in timed("read", iter_blocks(path, self.block_size)):
+            if stop.is_set():
+                return
+            count("read", nbytes=len(block))
+            final = len(block) < self.block_size
+            if hasher:
+                # hashlibは計算中にGILを解放するため、圧縮・書き込みと並行して進む
+                with stage("hash", nbytes=len(block)):
+                    hasher.update(block)
+            if deflate:
+                # 元データと圧縮後のデータ（元データ程度以下）の分を確保する
+                reserved = 2 * len(block)
+                budget.acquire(reserved)
+                future = pool.submit(
+                    deflate_block, block, zdict, self.compresslevel, final
+                )
+            else:
+                reserved = len(block)
+                budget.acquire(reserved)
+                future = None
+            items.put(("block", block, future, final, reserved))
+            zdict = block[-WINDOW_SIZE:]
+
+    def _write_items(
+        self,
+        items: "queue.Queue[tuple[Any, ...]]",
+        budget: ByteBudget,
+        progress: Callable[[int], None] | None,
+    ) -> None:
+        try:
+            self._write_loop(items, budget, progress)
+        except BaseException:
+            # 書き込み途中のメンバーを破棄し、アーカイブを閉じられる状態に戻す
+            self.zf.abort()
+            raise
+
+    def _write_loop(
+        self,
+        items: "queue.Queue[tuple[Any, ...]]",
+        budget: ByteBudget,
+        progress: Callable[[int], None] | None,
+    ) -> None:
+        while True:
+            item = items.get()
+            if item[0] == "member":
+                self.zf.begin(item[1])
+            elif item[0] == "block":
+                _, block, future, final, reserved = item
+                if future is None:
+                    with stage("write", nbytes=len(block)):
+                        self.zf.write(block)
+                else:
+                    with stage("compress", nbytes=len(block)):
+                        data = future.result()
+                    with stage("write", nbytes=len(data)):
+                        self.zf.write(data, block)
+                budget.release(reserved)
+                if progress is not None:
+                    progress(len(block))
+                if final:
+                    # データディスクリプタにCRC32とサイズを書き込む
+                    self.zf.end()
+            elif item[0] == "error":
+                raise item[1]
+            else:
+                return
+
+
+def _write_member(
+    zf: ZipStreamWriter,
+    path: Path,
+    zinfo: zipfile.ZipInfo,
+    progress: Callable[[int], None] | None,
+    hasher: Any,
+) -> None:
+    """1つのファイルを読み込みながら圧縮して書き込む。"""
+    compressor = None
+    if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS
+        )
+    zf.begin(zinfo)
+    try:
+        # バッファを使い回して読み込み、コピーせずにCRC32・圧縮・ハッシュに渡す
+        for view in timed("read", iter_views(path)):
+            count("read", nbytes=len(view))
+            if hasher:
+                with stage("hash", nbytes=len(view)):
+                    hasher.update(view)
+            if compressor is None:
+                with stage("write", nbytes=len(view)):
+                    zf.write(view)
+            else:
+                with stage("compress", nbytes=len(view)):
+                    data = compressor.compress(view)
+                with stage("write", nbytes=len(data)):
+                    zf.write(data, view)
+            if progress is not None:
+                progress(len(view))
+        if compressor is not None:
+            with stage("compress"):
+                data = compressor.flush()
+            with stage("write", nbytes=len(data)):
+                zf.write(data, b"")
+    except BaseException:
+        zf.abort()
+        raise
+    zf.end()
+
+
+def write_members(
+    zf: ZipStreamWriter,
+    members: Iterable[tuple[Path, str]],
+    policy: CompressionPolicy,
+    threads: int = 1,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    progress: Callable[[int], None] | None = None,
+    hash_algorithm: HashAlgorithm | None = None,
+) -> dict[str, str]:
+    """ファイルをZIPアーカイブのメンバーとして書き込む。
+
+    Args:
+        zf: 書き込み先のアーカイブ
+        members: (ファイルのパス, アーカイブ内の名前)の列
+        policy: メンバーごとの圧縮方式の選択
+        threads: 圧縮を行うスレッド数。1の場合は読み込みながら順に圧縮する。
+        memory_budget: threads > 1の場合のメモリの上限（バイト）
+        progress: 書き込んだ元データのバイト数を受け取る関数
+        hash_algorithm: 指定した場合、書き込みと同じ読み込みでハッシュ値を計算する
+
+    Returns:
+        アーカイブ内の名前からハッシュ値（16進数）への対応（hash_algorithmが
+        Noneの場合は空）
+    """
+    if threads > 1:
+        writer = ParallelZipWriter(
+            zf, threads, memory_budget, policy=policy, hash_algorithm=hash_algorithm
+        )
+        writer.write(members, progress)
+        return writer.digests
+    digests = {}
+    for path, arcname in members:
+        zinfo = zipfile.ZipInfo.from_file(path, arcname)
+        zinfo.compress_type = policy.choose(path, zinfo.file_size)
+        hasher = hash_algorithm and new_hasher(hash_algorithm)
+        _write_member(zf, path, zinfo, progress, hasher)
+        if hasher:
+            digests[arcname] = hasher.hexdigest()
+    return digests
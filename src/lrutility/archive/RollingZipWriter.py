@@ -0,0 +1,188 @@
+import zipfile
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from types import TracebackType
+
+from loguru import logger
+
+from lrutility.archive.checksums import write_checksums
+from lrutility.archive.CompressionPolicy import CompressionPolicy
+from lrutility.archive.ParallelZipWriter import write_members
+from lrutility.archive.ZipStreamWriter import (
+    DATA_DESCRIPTOR_SIZE,
+    ZIP64_DATA_DESCRIPTOR_SIZE,
+    ZipStreamWriter,
+    encode_name,
+    needs_zip64,
+)
+from lrutility.options import DEFAULT_MEMORY_BUDGET, HashAlgorithm
+
+# ZIPの固定長の構造の大きさ（バイト）
+LOCAL_HEADER_SIZE = 30
+CENTRAL_DIRECTORY_ENTRY_SIZE = 46
+# ZIP64の拡張フィールドのヘッダー（ID・長さ）と1項目の大きさ
+ZIP64_EXTRA_HEADER_SIZE = 4
+ZIP64_EXTRA_FIELD_SIZE = 8
+
+
+def minimum_member_size(
+    path: Path, arcname: str, size: int, policy: CompressionPolicy
+) -> int:
+    """メンバーを追加したときに増えるアーカイブサイズの下限を返す。
+
+    ヘッダーとセントラルディレクトリのエントリに加え、ファイルを読み込まずに
+    無圧縮で格納すると分かるメンバーはデータの大きさを含める。
+    """
+    name = len(encode_name(arcname)[0])
+    local = LOCAL_HEADER_SIZE + name + DATA_DESCRIPTOR_SIZE
+    if needs_zip64(size):
+        # この大きさのメンバーはローカルヘッダーとデータディスクリプタがZIP64となる
+        local += ZIP64_EXTRA_HEADER_SIZE + 2 * ZIP64_EXTRA_FIELD_SIZE
+        local += ZIP64_DATA_DESCRIPTOR_SIZE - DATA_DESCRIPTOR_SIZE
+    data = size if policy.known(path, size) == zipfile.ZIP_STORED else 0
+    return local + data + CENTRAL_DIRECTORY_ENTRY_SIZE + name
+
+
+class RollingZipWriter:
+    """アーカイブのファイルサイズが上限を超えないように、次のアーカイブへ切り替えながら書き込む。
+
+    組（画像とサイドカー等）ごとに書き込み、実際に書き込んだバイト数と
+    セントラルディレクトリ等の大きさから閉じた時点のファイルサイズを計算します
+    （ZipStreamWriter.sizeを参照）。
+    上限を超えた場合はその組を書き込む前の位置まで切り詰めて、次のアーカイブに
+    書き込み直します。上限を超える組は単独で1つのアーカイブとします。
+
+    Examples:
+        >>> with RollingZipWriter(lambda i: Path(f"photos_{i}.zip"), 4 * 1024**3) as w:
+        ...     w.add([(Path("IMG_0001.ARW"), "IMG_0001.ARW")], 25_000_000)
+        >>> w.archives
+        [PosixPath('photos_1.zip')]
+    """
+
+    def __init__(
+        self,
+        archive_path: Callable[[int], Path],
+        limit: int,
+        policy: CompressionPolicy | None = None,
+        threads: int = 1,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        progress: Callable[[int], None] | None = None,
+        first_index: int = 1,
+        on_close: Callable[[int, Path], None] | None = None,
+        hash_algorithm: HashAlgorithm | None = None,
+    ) -> None:
+        """
+        Args:
+            archive_path: アーカイブの番号からパスを返す関数
+            limit: 1つのアーカイブの最大ファイルサイズ（バイト）
+            policy: メンバーごとの圧縮方式の選択。Noneの場合は"auto"。
+            threads: 圧縮を行うスレッド数
+            memory_budget: threads > 1の場合のメモリの上限（バイト）
+            progress: 書き込んだ元データのバイト数を受け取る関数
+                （書き込み直す組の分は負の値で取り消す）
+            first_index: 最初のアーカイブの番号
+            on_close: アーカイブを閉じた後に番号とパスを受け取る関数
+            hash_algorithm: 指定した場合、アーカイブごとにチェックサムファイルを作成する
+        """
+        self.archive_path = archive_path
+        self.limit = limit
+        self.policy = policy or CompressionPolicy()
+        self.threads = threads
+        self.memory_budget = memory_budget
+        self.progress = progress
+        self.first_index = first_index
+        self.on_close = on_close
+        self.hash_algorithm = hash_algorithm
+        self.archives: list[Path] = []
+        self._zf: ZipStreamWriter | None = None
+        self._key: str | None = None
+        self._digests: dict[str, str] = {}
+
+    def __enter__(self) -> "RollingZipWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def add(
+        self,
+        members: Sequence[tuple[Path, str]],
+        size: int,
+        key: str | None = None,
+        sizes: Sequence[int] | None = None,
+    ) -> None:
+        """1つの組を現在のアーカイブ、または収まらない場合は次のアーカイブに書き込む。
+
+        Args:
+            members: (ファイルのパス, アーカイブ内の名前)の列
+            size: 組の元データの合計サイズ（バイト）
+            key: 前の組と異なる場合は次のアーカイブに切り替える（Noneは区別しない）
+            sizes: メンバーごとの元データのサイズ（membersの順。走査時のstat情報等）。
+                Noneの場合は、書き込む前の切り替えの判断にデータの大きさを含めない。
+        """
+        if self._zf is not None and self._zf.entries:
+            lower = sum(
+                minimum_member_size(path, arcname, member_size, self.policy)
+                for (path, arcname), member_size in zip(
+                    members, sizes or [0] * len(members), strict=True
+                )
+            )
+            if key != self._key or self._zf.size() + lower > self.limit:
+                self.close()
+        zf = self._open()
+        empty = not zf.entries
+        checkpoint = zf.checkpoint()
+        digests = self._write(zf, members)
+        if not empty and zf.size() > self.limit:
+            # 書き込む前の状態に戻し、次のアーカイブに書き込み直す
+            zf.truncate(checkpoint)
+            if self.progress is not None:
+                self.progress(-size)
+            self.close()
+            zf = self._open()
+            digests = self._write(zf, members)
+        self._digests.update(digests)
+        if zf.size() > self.limit:
+            logger.warning(
+                f"{members[0][1]} alone exceeds the size limit of {self.limit} bytes"
+            )
+        self._key = key
+
+    def close(self) -> None:
+        """現在のアーカイブを閉じる。"""
+        if self._zf is None:
+            return
+        zf, self._zf = self._zf, None
+        zf.close()
+        path = self.archives[-1]
+        if self.hash_algorithm is not None:
+            write_checksums(path, self.hash_algorithm, self._digests)
+        self._digests = {}
+        logger.info(f"Created {path} ({path.stat().st_size} bytes)")
+        if self.on_close is not None:
+            self.on_close(self.first_index + len(self.archives) - 1, path)
+
+    def _open(self) -> ZipStreamWriter:
+        if self._zf is None:
+            path = self.archive_path(self.first_index + len(self.archives))
+            self._zf = ZipStreamWriter.open(path)
+            self.archives.append(path)
+        return self._zf
+
+    def _write(
+        self, zf: ZipStreamWriter, members: Sequence[tuple[Path, str]]
+    ) -> dict[str, str]:
+        return write_members(
+            zf,
+            members,
+            self.policy,
+            self.threads,
+            self.memory_budget,
+            self.progress,
+            self.hash_algorithm,
+        )
@@ -0,0 +1,78 @@
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+
+from lrutility.archive.packing import PackUnit, iter_units
+from lrutility.utils.walker import DEFAULT_WORKERS, FileEntry, walk_directories
+
+
+class SourceCatalog:
+    """アーカイブする1つ以上のディレクトリのファイルと、そのアーカイブ内の名前。
+
+    ディレクトリを走査しながらファイルの組を逐次返し、見つかったファイルの
+    stat情報とアーカイブ内の名前を記録します。名前はディレクトリからの相対パスで、
+    複数のディレクトリを指定した場合は先頭にディレクトリ名を付けます。
+    走査は並列に行いつつ、結果は常に同じ順序（名前順・深さ優先）で返します。
+
+    Examples:
+        >>> catalog = SourceCatalog([Path("2024"), Path("2025")], recursive=True)
+        >>> for unit in catalog.units():
+        ...     catalog.members(unit.files)
+        [(PosixPath('2024/a/IMG_0001.ARW'), '2024/a/IMG_0001.ARW'), ...]
+    """
+
+    def __init__(
+        self,
+        roots: Sequence[Path],
+        recursive: bool = False,
+        workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        """
+        Args:
+            roots: アーカイブするディレクトリ
+            recursive: Trueの場合、サブディレクトリのファイルも含める
+            workers: 並列に走査するスレッド数
+
+        Raises:
+            ValueError: 複数のディレクトリに同じ名前のものがある場合
+        """
+        if len({root.name for root in roots}) < len(roots):
+            raise ValueError("Source directories must have distinct names")
+        self.roots = list(roots)
+        self.recursive = recursive
+        self.workers = workers
+        self.entries: dict[str, FileEntry] = {}  # アーカイブ内の名前 → ファイル
+        self.names: dict[Path, str] = {}  # ファイルのパス → アーカイブ内の名前
+
+    def units(self) -> Iterator[PackUnit]:
+        """全ディレクトリのファイルの組を、走査しながら逐次返す。"""
+        return iter_units(self._batches())
+
+    def _batches(self) -> Iterator[list[FileEntry]]:
+        prefix = len(self.roots) > 1
+        for root in self.roots:
+            for _, files in walk_directories(
+                root,
+                recursive=self.recursive,
+                sort=True,
+                workers=self.workers,
+                ordered=True,
+            ):
+                for entry in files:
+                    name = entry.path.relative_to(root).as_posix()
+                    if prefix:
+                        name = f"{root.name}/{name}"
+                    self.entries[name] = entry
+                    self.names[entry.path] = name
+                yield files
+
+    def members(self, files: Iterable[Path]) -> list[tuple[Path, str]]:
+        """ファイルの(パス, アーカイブ内の名前)のリストを返す。"""
+        return [(path, self.names[path]) for path in files]
+
+    def sizes(self, files: Iterable[Path]) -> list[int]:
+        """走査時に記録したファイルのサイズのリストを返す（filesの順）。"""
+        return [self.entries[self.names[path]].size for path in files]
+
+    def expected(self, files: Iterable[Path]) -> dict[str, FileEntry]:
+        """アーカイブ内の名前から、ファイルへの対応を返す（filesの順）。"""
+        return {self.names[path]: self.entries[self.names[path]] for path in files}
@@ -0,0 +1,310 @@
+import struct
+import zipfile
+import zlib
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+# ZIPの構造（APPNOTE.TXT 4.3）のシグネチャと形式
+_LOCAL_DATA_DESCRIPTOR = struct.Struct("<4sLLL")
+_ZIP64_DATA_DESCRIPTOR = struct.Struct("<4sLQQ")
+_CENTRAL_DIRECTORY = struct.Struct("<4s4B4HL2L5H2L")
+_ZIP64_END_RECORD = struct.Struct("<4sQ2H2L4Q")
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+_CENTRAL_DIRECTORY_SIGNATURE = b"PK\x01\x02"
+_ZIP64_END_RECORD_SIGNATURE = b"PK\x06\x06"
+_ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+_END_RECORD_SIGNATURE = b"PK\x05\x06"
+
+# 汎用フラグ（bit 3: データディスクリプタを使用、bit 11: 名前がUTF-8）
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+# ZIP64が必要となる値の上限
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+ZIP_MAX_32 = (1 << 32) - 1
+
+# 展開に必要なバージョン（2.0: deflate、4.5: ZIP64）
+DEFAULT_VERSION = 20
+ZIP64_VERSION = 45
+
+# ZIP64の拡張フィールドのID
+ZIP64_EXTRA_ID = 0x0001
+
+# データディスクリプタの大きさ（通常・ZIP64）
+DATA_DESCRIPTOR_SIZE = _LOCAL_DATA_DESCRIPTOR.size
+ZIP64_DATA_DESCRIPTOR_SIZE = _ZIP64_DATA_DESCRIPTOR.size
+
+
+def encode_name(filename: str) -> tuple[bytes, int]:
+    """アーカイブ内の名前をエンコードし、(名前, 追加する汎用フラグ)を返す。
+
+    ASCIIで表せない名前はUTF-8でエンコードし、FLAG_UTF8を付ける。
+    """
+    try:
+        return filename.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return filename.encode("utf-8"), FLAG_UTF8
+
+
+def needs_zip64(file_size: int) -> bool:
+    """ローカルヘッダーにZIP64の拡張を付けるかを返す（圧縮後の増加を見込む）。"""
+    return file_size * 1.05 > ZIP64_LIMIT
+
+
+def central_directory_entry(zinfo: zipfile.ZipInfo) -> bytes:
+    """メンバーのセントラルディレクトリのエントリを返す。"""
+    extra: list[int] = []
+    file_size, compress_size = zinfo.file_size, zinfo.compress_size
+    if file_size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT:
+        extra += [file_size, compress_size]
+        file_size = compress_size = ZIP_MAX_32
+    header_offset = zinfo.header_offset
+    if header_offset > ZIP64_LIMIT:
+        extra.append(header_offset)
+        header_offset = ZIP_MAX_32
+    extra_data = zinfo.extra
+    version = DEFAULT_VERSION
+    if extra:
+        extra_data = (
+            struct.pack(f"<HH{len(extra)}Q", ZIP64_EXTRA_ID, 8 * len(extra), *extra)
+            + extra_data
+        )
+        version = ZIP64_VERSION
+    filename, utf8 = encode_name(zinfo.filename)
+    date_time = zinfo.date_time
+    dos_time = date_time[3] << 11 | date_time[4] << 5 | date_time[5] // 2
+    dos_date = (date_time[0] - 1980) << 9 | date_time[1] << 5 | date_time[2]
+    header = _CENTRAL_DIRECTORY.pack(
+        _CENTRAL_DIRECTORY_SIGNATURE,
+        max(version, zinfo.create_version),
+        zinfo.create_system,
+        max(version, zinfo.extract_version),
+        zinfo.reserved,
+        zinfo.flag_bits | utf8,
+        zinfo.compress_type,
+        dos_time,
+        dos_date,
+        zinfo.CRC,
+        compress_size,
+        file_size,
+        len(filename),
+        len(extra_data),
+        len(zinfo.comment),
+        0,
+        zinfo.internal_attr,
+        zinfo.external_attr,
+        header_offset,
+    )
+    return header + filename + extra_data + zinfo.comment
+
+
+def end_records(count: int, offset: int, directory_size: int) -> bytes:
+    """セントラルディレクトリの後に書き込む終端レコードを返す。
+
+    Args:
+        count: メンバー数
+        offset: セントラルディレクトリの開始位置
+        directory_size: セントラルディレクトリの大きさ
+    """
+    records = b""
+    if (
+        count >= ZIP_FILECOUNT_LIMIT
+        or offset > ZIP64_LIMIT
+        or directory_size > ZIP64_LIMIT
+    ):
+        records += _ZIP64_END_RECORD.pack(
+            _ZIP64_END_RECORD_SIGNATURE,
+            _ZIP64_END_RECORD.size - 12,
+            ZIP64_VERSION,
+            ZIP64_VERSION,
+            0,
+            0,
+            count,
+            count,
+            directory_size,
+            offset,
+        )
+        records += _ZIP64_LOCATOR.pack(
+            _ZIP64_LOCATOR_SIGNATURE, 0, offset + directory_size, 1
+        )
+        count = min(count, ZIP_FILECOUNT_LIMIT)
+        directory_size = min(directory_size, ZIP_MAX_32)
+        offset = min(offset, ZIP_MAX_32)
+    return records + _END_RECORD.pack(
+        _END_RECORD_SIGNATURE, 0, 0, count, count, directory_size, offset, 0
+    )
+
+
+class ZipStreamWriter:
+    """ZIPアーカイブを先頭から順に書き込む（シークしない）。
+
+    各メンバーはローカルヘッダー（ZipInfo.FileHeader）、データ、CRC32と
+    サイズを記録したデータディスクリプタの順に書き込み、closeでセントラル
+    ディレクトリと終端レコードを書き込みます。圧縮済みのデータをそのまま
+    書き込めるため、ブロックごとに並列に圧縮したdeflateストリームを格納できます。
+    書き込み先はパイプ等のシークできないファイルでも構いません。
+
+    アーカイブの状態（書き込んだバイト数とメンバー）はこのクラスが保持するため、
+    閉じた時点のファイルサイズの計算や、メンバーを書き込む前の位置への
+    切り詰めをzipfileの内部に依存せずに行えます。
+
+    Examples:
+        >>> with ZipStreamWriter.open(Path("photos.zip")) as writer:
+        ...     writer.begin(zipfile.ZipInfo.from_file(path, "IMG_0001.ARW"))
+        ...     writer.write(data)
+        ...     writer.end()
+    """
+
+    def __init__(self, fileobj: Any, owned: bool = False) -> None:
+        """
+        Args:
+            fileobj: 書き込み先（writeのみ使用する。truncateする場合はseekと
+                truncateも必要）
+            owned: Trueの場合、closeでfileobjも閉じる
+        """
+        self.fileobj = fileobj
+        self.owned = owned
+        self.offset = 0
+        self.entries: list[zipfile.ZipInfo] = []
+        self._member: zipfile.ZipInfo | None = None
+        self._zip64 = False
+        self._directory_size = 0
+        self._closed = False
+
+    @classmethod
+    def open(cls, path: Path) -> "ZipStreamWriter":
+        """pathに新しいアーカイブを作成する。"""
+        return cls(path.open("wb"), owned=True)
+
+    def __enter__(self) -> "ZipStreamWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _write(self, data: Any) -> None:
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+    def begin(self, zinfo: zipfile.ZipInfo) -> None:
+        """メンバーのローカルヘッダーを書き込む。
+
+        zinfoのfile_sizeは、ZIP64の拡張を付けるかの判定に使用する（CRC32と
+        サイズはwriteで書き込んだデータから計算する）。
+        """
+        if self._member is not None:
+            raise ValueError(f"Member {self._member.filename} is not finished")
+        self._zip64 = needs_zip64(zinfo.file_size)
+        zinfo.flag_bits |= FLAG_DATA_DESCRIPTOR
+        zinfo.header_offset = self.offset
+        zinfo.CRC = zinfo.compress_size = zinfo.file_size = 0
+        self._write(zinfo.FileHeader(self._zip64))
+        self._member = zinfo
+
+    def write(self, data: Any, original: Any = None) -> None:
+        """メンバーのデータを書き込む。
+
+        Args:
+            data: 書き込むデータ（deflateの場合は圧縮済みのデータ）
+            original: dataの元データ。CRC32と元のサイズの計算に使用する。
+                Noneの場合（無圧縮の場合）はdataと同じ。
+        """
+        zinfo = self._member
+        if zinfo is None:
+            raise ValueError("No member is open")
+        if original is None:
+            original = data
+        self._write(data)
+        zinfo.compress_size += len(data)
+        zinfo.file_size += len(original)
+        zinfo.CRC = zlib.crc32(original, zinfo.CRC)
+
+    def end(self) -> zipfile.ZipInfo:
+        """メンバーのデータディスクリプタを書き込み、メンバーを確定する。
+
+        Raises:
+            zipfile.LargeZipFile: ZIP64の拡張を付けずに書き始めたメンバーが
+                4GiBを超えた場合
+        """
+        zinfo = self._member
+        if zinfo is None:
+            raise ValueError("No member is open")
+        if self._zip64:
+            descriptor = _ZIP64_DATA_DESCRIPTOR.pack(
+                _DATA_DESCRIPTOR_SIGNATURE,
+                zinfo.CRC,
+                zinfo.compress_size,
+                zinfo.file_size,
+            )
+        elif zinfo.file_size > ZIP64_LIMIT or zinfo.compress_size > ZIP64_LIMIT:
+            raise zipfile.LargeZipFile(
+                f"{zinfo.filename} grew beyond the size given when it was started"
+            )
+        else:
+            descriptor = _LOCAL_DATA_DESCRIPTOR.pack(
+                _DATA_DESCRIPTOR_SIGNATURE,
+                zinfo.CRC,
+                zinfo.compress_size,
+                zinfo.file_size,
+            )
+        self._write(descriptor)
+        self._member = None
+        self.entries.append(zinfo)
+        self._directory_size += len(central_directory_entry(zinfo))
+        return zinfo
+
+    def abort(self) -> None:
+        """書き込み途中のメンバーを破棄する（データはアーカイブ内に残るが参照されない）。"""
+        self._member = None
+
+    def size(self) -> int:
+        """現在の状態で閉じた場合のアーカイブのファイルサイズを返す。"""
+        return (
+            self.offset
+            + self._directory_size
+            + len(end_records(len(self.entries), self.offset, self._directory_size))
+        )
+
+    def checkpoint(self) -> tuple[int, int]:
+        """truncateで戻すための、現在の(書き込んだ位置, メンバー数)を返す。"""
+        if self._member is not None:
+            raise ValueError(f"Member {self._member.filename} is not finished")
+        return self.offset, len(self.entries)
+
+    def truncate(self, checkpoint: tuple[int, int]) -> None:
+        """checkpointを取得した時点の状態に戻す（以降のメンバーを切り詰める）。
+
+        書き込み先はseekとtruncateに対応している必要がある。
+        """
+        offset, count = checkpoint
+        self.fileobj.seek(offset)
+        self.fileobj.truncate()
+        self.offset = offset
+        for zinfo in self.entries[count:]:
+            self._directory_size -= len(central_directory_entry(zinfo))
+        del self.entries[count:]
+        self._member = None
+
+    def close(self) -> None:
+        """セントラルディレクトリと終端レコードを書き込む。"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            start = self.offset
+            directory = b"".join(central_directory_entry(z) for z in self.entries)
+            self._write(directory)
+            self._write(end_records(len(self.entries), start, len(directory)))
+            self.fileobj.flush()
+        finally:
+            if self.owned:
+                self.fileobj.close()
@@ -0,0 +1,192 @@
+import hashlib
+import os
+import zipfile
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from lrutility.options import DEFAULT_VERIFY_WORKERS, HashAlgorithm
+
+HASH_ALGORITHMS: tuple[HashAlgorithm, ...] = ("sha256", "blake2b")
+
+# 検証時にメンバーを読み込む単位
+READ_SIZE = 1024**2
+
+
+def new_hasher(algorithm: HashAlgorithm) -> Any:
+    """ハッシュ計算用のオブジェクトを返す。
+
+    Raises:
+        ValueError: 未知のアルゴリズムが指定された場合
+    """
+    if algorithm not in HASH_ALGORITHMS:
+        raise ValueError(f"Unknown hash algorithm: {algorithm}")
+    return hashlib.new(algorithm)
+
+
+def checksum_path(archive_path: Path, algorithm: HashAlgorithm) -> Path:
+    """アーカイブのチェックサムファイルのパスを返す（例: photos_1.zip.sha256）。"""
+    return archive_path.with_name(f"{archive_path.name}.{algorithm}")
+
+
+def find_checksums(archive_path: Path) -> tuple[Path, HashAlgorithm] | None:
+    """アーカイブのチェックサムファイルとそのアルゴリズムを返す（ない場合はNone）。"""
+    for algorithm in HASH_ALGORITHMS:
+        path = checksum_path(archive_path, algorithm)
+        if path.exists():
+            return path, algorithm
+    return None
+
+
+def write_checksums(
+    archive_path: Path, algorithm: HashAlgorithm, digests: Mapping[str, str]
+) -> Path:
+    """アーカイブのメンバーのハッシュ値をチェックサムファイルに書き込む。
+
+    sha256sum・b2sumと同じ"<ハッシュ値>  <名前>"の形式で、展開したファイルを
+    `sha256sum -c`等で検証することもできる。
+
+    Args:
+        archive_path: アーカイブのパス
+        algorithm: ハッシュアルゴリズム
+        digests: アーカイブ内の名前からハッシュ値（16進数）への対応
+
+    Returns:
+        チェックサムファイルのパス
+    """
+    path = checksum_path(archive_path, algorithm)
+    temporary = path.with_name(f"{path.name}.tmp")
+    with temporary.open("w", encoding="utf-8") as f:
+        for name, digest in digests.items():
+            f.write(f"{digest}  {name}\n")
+        f.flush()
+        os.fsync(f.fileno())
+    temporary.replace(path)
+    return path
+
+
+def read_checksums(path: Path) -> dict[str, str]:
+    """チェックサムファイルを読み込み、名前からハッシュ値への対応を返す。"""
+    digests = {}
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            digest, _, name = line.rstrip("\n").partition("  ")
+            if name:
+                digests[name] = digest
+    return digests
+
+
+@dataclass
+class VerifyResult:
+    """アーカイブの検証結果。
+
+    Attributes:
+        archive: アーカイブのパス
+        verified: ハッシュ値が一致したメンバー数
+        mismatched: ハッシュ値が一致しない、または読み込めないメンバーとその理由
+        missing: チェックサムファイルにあり、アーカイブにないメンバー
+        unlisted: アーカイブにあり、チェックサムファイルにないメンバー
+    """
+
+    archive: Path
+    verified: int = 0
+    mismatched: dict[str, str] = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+    unlisted: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.mismatched or self.missing or self.unlisted)
+
+
+def hash_member(zf: zipfile.ZipFile, name: str, algorithm: HashAlgorithm) -> str:
+    """アーカイブのメンバーを展開しながらハッシュ値を計算する。
+
+    展開時にCRC32も検証され、一致しない場合はzipfile.BadZipFileが送出される。
+    """
+    hasher = new_hasher(algorithm)
+    with zf.open(name) as member:
+        while block := member.read(READ_SIZE):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def verify_archives(
+    archives: Iterable[Path], workers: int = DEFAULT_VERIFY_WORKERS
+) -> list[VerifyResult]:
+    """アーカイブのメンバーをチェックサムファイルと照合する。
+
+    アーカイブを1つずつ開き、そのメンバーをスレッドプールで並列に展開・
+    ハッシュ計算する（zlibとhashlibは処理中にGILを解放する）。
+
+    Args:
+        archives: 検証するアーカイブ
+        workers: ワーカースレッド数
+
+    Returns:
+        アーカイブごとの検証結果
+
+    Raises:
+        FileNotFoundError: チェックサムファイルがないアーカイブがある場合
+    """
+    plans = []
+    for archive in archives:
+        found = find_checksums(archive)
+        if found is None:
+            raise FileNotFoundError(f"Checksum file not found for {archive}")
+        plans.append((archive, found[1], read_checksums(found[0])))
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for archive, algorithm, expected in plans:
+            result = VerifyResult(archive)
+            results.append(result)
+            _verify_archive(result, algorithm, expected, pool)
+    return results
+
+
+def _verify_archive(
+    result: VerifyResult,
+    algorithm: HashAlgorithm,
+    expected: dict[str, str],
+    pool: ThreadPoolExecutor,
+) -> None:
+    """1つのアーカイブを開き、メンバーを並列に照合してから閉じる。
+
+    多数のアーカイブを検証する場合もファイルディスクリプタを使い切らないよう、
+    同時に開くアーカイブは1つとする。
+    """
+    try:
+        zf = zipfile.ZipFile(result.archive)
+    except (OSError, zipfile.BadZipFile) as e:
+        result.mismatched = dict.fromkeys(expected, str(e))
+        return
+    with zf:
+        names = set(zf.namelist())
+        result.missing = [name for name in expected if name not in names]
+        result.unlisted = [n for n in zf.namelist() if n not in expected]
+        pending = [
+            (name, pool.submit(hash_member, zf, name, algorithm), digest)
+            for name, digest in expected.items()
+            if name in names
+        ]
+        try:
+            for name, future, digest in pending:
+                _check(result, name, future, digest)
+        finally:
+            # 中断した場合も、実行中の計算の完了を待ってからアーカイブを閉じる
+            wait([future for _, future, _ in pending if not future.cancel()])
+
+
+def _check(result: VerifyResult, name: str, future: Any, expected: str) -> None:
+    try:
+        digest = future.result()
+    except (OSError, zipfile.BadZipFile) as e:
+        result.mismatched[name] = str(e)
+        return
+    if digest == expected:
+        result.verified += 1
+    else:
+        result.mismatched[name] = f"expected {expected}, got {digest}"
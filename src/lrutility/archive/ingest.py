@@ -0,0 +1,113 @@
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+# 使い回すバッファで読み込む場合の1回の読み込みの大きさ（ページサイズの倍数）
+READ_SIZE = 8 * 1024**2
+
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+
+def advise(fd: int, offset: int, length: int, advice: str) -> None:
+    """posix_fadviseでカーネルにファイルのアクセス方法を伝える。
+
+    posix_fadviseがない環境（macOS・Windows）や、対応していないファイル
+    システムでは何もしない。
+
+    Args:
+        fd: ファイルディスクリプタ
+        offset: 範囲の開始位置
+        length: 範囲の長さ（0の場合はファイルの末尾まで）
+        advice: "POSIX_FADV_SEQUENTIAL"等のosモジュールの定数名
+    """
+    if not _HAS_FADVISE:
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, getattr(os, advice))
+    except OSError:
+        pass
+
+
+def read_into(f: BinaryIO, view: memoryview) -> int:
+    """viewが埋まるか、ファイルの末尾に達するまで読み込み、読み込んだバイト数を返す。"""
+    filled = 0
+    while filled < len(view):
+        count = f.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled
+
+
+def read_exact(f: BinaryIO, size: int) -> bytes:
+    """sizeバイト読み込む（ファイルの末尾に達した場合はそれまでのデータ）。
+
+    バッファリングなしの読み込みは要求より短く返る場合があるため、繰り返し読み込む。
+    """
+    data = f.read(size)
+    while 0 < len(data) < size:
+        rest = f.read(size - len(data))
+        if not rest:
+            break
+        data += rest
+    return data
+
+
+def iter_views(
+    path: Path, read_size: int = READ_SIZE, drop_cache: bool = True
+) -> Iterator[memoryview]:
+    """1つのバッファを使い回してファイルを先頭から読み込み、その範囲を逐次返す。
+
+    バッファリングなしで開いたファイルからバッファへ直接読み込むため、
+    読み込みごとのbytesの確保とコピーが発生しない。返すmemoryviewは次の
+    読み込みで上書きされるため、次の要素を取得する前に使い終える必要がある。
+
+    Args:
+        path: ファイルのパス
+        read_size: 1回の読み込みの大きさ
+        drop_cache: Trueの場合、読み込んだ範囲をページキャッシュから解放する
+
+    Yields:
+        読み込んだデータのmemoryview（空のファイルの場合は何も返さない）
+    """
+    view = memoryview(bytearray(read_size))
+    with path.open("rb", buffering=0) as f:
+        fd = f.fileno()
+        advise(fd, 0, 0, "POSIX_FADV_SEQUENTIAL")
+        offset = 0
+        while count := read_into(f, view):
+            if drop_cache:
+                # 読み込み済みのデータは再び読まないため、他のファイルのキャッシュを残す
+                advise(fd, offset, count, "POSIX_FADV_DONTNEED")
+            offset += count
+            yield view[:count]
+            if count < read_size:
+                return
+
+
+def iter_blocks(
+    path: Path, block_size: int, drop_cache: bool = True
+) -> Iterator[bytes]:
+    """ファイルをblock_sizeごとの独立したbytesとして逐次返す。
+
+    他のスレッドに渡して保持するブロック向け。最後のブロックは常に
+    block_size未満（ファイルサイズがblock_sizeの倍数の場合は空）となる。
+
+    Args:
+        path: ファイルのパス
+        block_size: ブロックの大きさ
+        drop_cache: Trueの場合、読み込んだ範囲をページキャッシュから解放する
+    """
+    with path.open("rb", buffering=0) as f:
+        fd = f.fileno()
+        advise(fd, 0, 0, "POSIX_FADV_SEQUENTIAL")
+        offset = 0
+        while True:
+            block = read_exact(f, block_size)
+            if drop_cache and block:
+                advise(fd, offset, len(block), "POSIX_FADV_DONTNEED")
+            offset += len(block)
+            yield block
+            if len(block) < block_size:
+                return
@@ -0,0 +1,180 @@
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from lrutility.index.SidecarIndex import SIDECAR_SUFFIX, SidecarIndex
+from lrutility.options import PackingStrategy
+from lrutility.utils.walker import FileEntry
+from lrutility.xmp.XMPParser import XMPParser
+
+
+@dataclass(slots=True)
+class PackUnit:
+    """1つのアーカイブに必ず一緒に格納するファイルの組（画像とサイドカー等）。"""
+
+    files: list[Path]  # ファイル名順のパス
+    size: int  # 合計サイズ（バイト）
+    key: str | None = None  # グループ分けのキー（撮影日等）
+
+
+@dataclass(slots=True)
+class Bin:
+    """1つのアーカイブに格納するファイルの組の集まり。"""
+
+    units: list[PackUnit] = field(default_factory=list)
+    size: int = 0
+
+    def add(self, unit: PackUnit) -> None:
+        self.units.append(unit)
+        self.size += unit.size
+
+    @property
+    def files(self) -> list[Path]:
+        return [path for unit in self.units for path in unit.files]
+
+
+def build_units(entries: Iterable[FileEntry]) -> list[PackUnit]:
+    """画像ファイルと同じファイル名を持つサイドカー等を1つの組にまとめる。
+
+    Args:
+        entries: アーカイブするファイル
+
+    Returns:
+        先頭のファイル名順のPackUnitのリスト
+    """
+    units = [
+        PackUnit(
+            files=[entry.path for entry in group],
+            size=sum(entry.size for entry in group),
+        )
+        for group in SidecarIndex(entries).groups()
+    ]
+    units.sort(key=lambda unit: unit.files[0])
+    return units
+
+
+def iter_units(batches: Iterable[list[FileEntry]]) -> Iterator[PackUnit]:
+    """ディレクトリごとのファイルから、組を逐次返す。
+
+    画像とサイドカーは同じディレクトリにあるため、ディレクトリ単位で組にまとめる。
+
+    Args:
+        batches: 1つのディレクトリのファイルのリストの列（walk_directories等）
+    """
+    for batch in batches:
+        yield from build_units(batch)
+
+
+def assign_capture_dates(units: list[PackUnit], workers: int = 1) -> None:
+    """XMPファイルの撮影日時から、各組のkeyに撮影日（YYYY-MM-DD）を設定する。
+
+    XMPファイルを含まない組や、撮影日時が記録されていない組のkeyはNoneのまま。
+
+    Args:
+        units: ファイルの組
+        workers: XMPファイルのパースに使用するワーカー数
+    """
+    owners = {
+        path: unit
+        for unit in units
+        for path in unit.files
+        if path.suffix.lower() == SIDECAR_SUFFIX
+    }
+    results = XMPParser().parse_many(
+        owners, fields={"exif_info.date_time_original"}, workers=workers
+    )
+    for path, metadata in results:
+        if isinstance(metadata, Exception):
+            continue
+        taken = metadata.exif_info.date_time_original
+        if taken is not None and owners[path].key is None:
+            owners[path].key = taken.date().isoformat()
+
+
+def iter_next_fit(units: Iterable[PackUnit], capacity: int) -> Iterator[Bin]:
+    """next_fitと同じ分け方で、アーカイブが確定するたびに逐次返す。
+
+    unitsを最後まで受け取る前に最初のアーカイブの書き込みを開始できる。
+    """
+    current = Bin()
+    for unit in units:
+        if current.units and current.size + unit.size > capacity:
+            yield current
+            current = Bin()
+        current.add(unit)
+    if current.units:
+        yield current
+
+
+def next_fit(units: Iterable[PackUnit], capacity: int) -> list[Bin]:
+    """順序を保ったまま、収まらなくなった時点で次のアーカイブに移る。
+
+    capacityを超える組は単独で1つのアーカイブとする。
+    """
+    return list(iter_next_fit(units, capacity))
+
+
+def first_fit_decreasing(units: Iterable[PackUnit], capacity: int) -> list[Bin]:
+    """大きい組から順に、収まる最初のアーカイブに格納する。
+
+    アーカイブ数が最適解の11/9倍程度以下となり、各アーカイブをcapacityに
+    近づけられる。capacityを超える組は単独で1つのアーカイブとする。
+    """
+    bins: list[Bin] = []
+    for unit in sorted(units, key=lambda unit: unit.size, reverse=True):
+        for candidate in bins:
+            if candidate.size + unit.size <= capacity:
+                candidate.add(unit)
+                break
+        else:
+            new_bin = Bin()
+            new_bin.add(unit)
+            bins.append(new_bin)
+    # アーカイブ内・アーカイブ間の順序はファイル名順とする
+    for packed in bins:
+        packed.units.sort(key=lambda unit: unit.files[0])
+    bins.sort(key=lambda packed: packed.files[0])
+    return bins
+
+
+STRATEGIES: dict[PackingStrategy, Callable[[Iterable[PackUnit], int], list[Bin]]] = {
+    "next-fit": next_fit,
+    "ffd": first_fit_decreasing,
+}
+
+
+def pack(
+    units: Iterable[PackUnit],
+    capacity: int,
+    strategy: PackingStrategy = "next-fit",
+    group_by_key: bool = False,
+) -> list[Bin]:
+    """ファイルの組をcapacity以下のアーカイブに分ける。
+
+    Args:
+        units: ファイルの組（next-fitの場合はこの順序でアーカイブに格納する）
+        capacity: 1つのアーカイブの最大サイズ（バイト）
+        strategy: "next-fit"は順序を保持、"ffd"はアーカイブ数を最小化
+        group_by_key: Trueの場合、keyの異なる組を同じアーカイブに格納しない
+            （keyの順、keyがNoneの組は最後）
+
+    Returns:
+        アーカイブごとのBinのリスト
+
+    Raises:
+        ValueError: 未知のstrategyが指定された場合
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown packing strategy: {strategy}")
+    packer = STRATEGIES[strategy]
+    units = list(units)
+    if not group_by_key:
+        return packer(units, capacity)
+
+    groups: dict[str | None, list[PackUnit]] = {}
+    for unit in units:
+        groups.setdefault(unit.key, []).append(unit)
+    bins = []
+    for key in sorted(groups, key=lambda key: (key is None, key or "")):
+        bins.extend(packer(groups[key], capacity))
+    return bins
@@ -0,0 +1,225 @@
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+from lrutility.xmp.XMPDataclass import XMPMetadata
+from lrutility.xmp.XMPParser import XMPParser
+
+ColumnKind = Literal["int", "float", "category", "datetime"]
+
+# カテゴリ列で値が存在しないことを表すコード
+MISSING_CODE = -1
+
+# 日時列の精度
+DATETIME_UNIT = "datetime64[ms]"
+
+
+@dataclass(frozen=True)
+class Column:
+    """カタログの1列の定義。
+
+    Attributes:
+        name: 列名（例: "rating"）
+        field: 値の取得元のXMPフィールド名（例: "xmp_info.rating"）
+        kind: 列の種類。
+            "int"は欠損のない整数、"float"は欠損をNaNとする数値、
+            "category"は文字列をコード化した整数（欠損は-1）、
+            "datetime"はdatetime64（欠損はNaT）。
+        dtype: NumPyの型
+        extract: XMPフィールドの値を列の値に変換する関数
+    """
+
+    name: str
+    field: str
+    kind: ColumnKind
+    dtype: str
+    extract: Callable[[Any], Any] = lambda value: value
+
+    def get(self, metadata: XMPMetadata) -> Any:
+        """XMPMetadataからこの列の値を取得する。"""
+        section, name = self.field.split(".")
+        return self.extract(getattr(getattr(metadata, section), name))
+
+
+def _first(values: list[Any] | None) -> Any:
+    return values[0] if values else None
+
+
+def _local_datetime(value: Any) -> Any:
+    # タイムゾーンは撮影地の現地時刻として扱い、変換せずに取り除く
+    return None if value is None else value.replace(tzinfo=None)
+
+
+COLUMNS: tuple[Column, ...] = (
+    Column("rating", "xmp_info.rating", "float", "float32"),
+    Column("pick", "dynamic_media_info.pick", "int", "int8"),
+    Column("label", "xmp_info.label", "category", "int32"),
+    Column("make", "tiff_info.make", "category", "int32"),
+    Column("model", "tiff_info.model", "category", "int32"),
+    Column("lens", "lens_info.lens", "category", "int32"),
+    Column("iso", "exif_info.iso_speed_ratings", "float", "float32", _first),
+    Column("focal_length", "exif_info.focal_length", "float", "float32"),
+    Column("f_number", "exif_info.f_number", "float", "float32"),
+    Column(
+        "exposure_time",
+        "exif_info.exposure_time",
+        "float",
+        "float64",
+        XMPParser.parse_fraction,
+    ),
+    Column(
+        "date_time_original",
+        "exif_info.date_time_original",
+        "datetime",
+        DATETIME_UNIT,
+        _local_datetime,
+    ),
+)
+
+COLUMNS_BY_NAME: dict[str, Column] = {column.name: column for column in COLUMNS}
+
+# カタログの構築に必要なXMPフィールド
+CATALOG_FIELDS: frozenset[str] = frozenset(column.field for column in COLUMNS)
+
+
+class Catalog:
+    """多数のXMPメタデータを列ごとのNumPy配列として保持するカタログ。
+
+    数値列はNumPy配列、文字列列はカテゴリコード（int32）と
+    カテゴリ一覧、撮影日時はdatetime64として保持し、
+    条件による絞り込みをライブラリ全体に対するベクトル演算で行います。
+
+    Examples:
+        >>> catalog = Catalog.from_records(records)
+        >>> mask = (catalog["rating"] <= 1) & (catalog["pick"] == -1)
+        >>> mask &= catalog.equals("lens", "FE 70-200mm F2.8 GM OSS II")
+        >>> catalog.select(mask)
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[Path],
+        columns: dict[str, np.ndarray],
+        categories: dict[str, list[str]],
+    ) -> None:
+        """
+        Args:
+            paths: 各行のXMPファイルのパス
+            columns: 列名をキーとする配列（長さはpathsと同じ）
+            categories: カテゴリ列の列名をキーとする、コード順のカテゴリ一覧
+        """
+        self.paths = list(paths)
+        self.columns = columns
+        self.categories = categories
+        self._codes = {
+            name: {value: code for code, value in enumerate(values)}
+            for name, values in categories.items()
+        }
+
+    @classmethod
+    def from_records(cls, records: Iterable[tuple[Path, XMPMetadata]]) -> "Catalog":
+        """(パス, XMPMetadata)の列からカタログを構築する。
+
+        XMPMetadataはCATALOG_FIELDSのフィールドのみを取得したものでもよい。
+
+        Args:
+            records: (パス, XMPMetadata)のタプルの列
+
+        Returns:
+            Catalogオブジェクト
+        """
+        paths: list[Path] = []
+        values: dict[str, list[Any]] = {column.name: [] for column in COLUMNS}
+        codes: dict[str, dict[str, int]] = {
+            column.name: {} for column in COLUMNS if column.kind == "category"
+        }
+        for path, metadata in records:
+            paths.append(path)
+            for column in COLUMNS:
+                value = column.get(metadata)
+                if column.kind == "category":
+                    if value is None:
+                        value = MISSING_CODE
+                    else:
+                        value = codes[column.name].setdefault(
+                            value, len(codes[column.name])
+                        )
+                elif value is None and column.kind == "float":
+                    value = np.nan
+                values[column.name].append(value)
+
+        columns = {}
+        for column in COLUMNS:
+            column_values = values[column.name]
+            if column.kind == "datetime":
+                column_values = [
+                    np.datetime64("NaT") if value is None else value
+                    for value in column_values
+                ]
+            columns[column.name] = np.array(column_values, dtype=column.dtype)
+        categories = {name: list(mapping) for name, mapping in codes.items()}
+        return cls(paths, columns, categories)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """列の配列を返す（カテゴリ列の場合はコードの配列）。
+
+        Raises:
+            KeyError: 未知の列名が指定された場合
+        """
+        if name not in self.columns:
+            raise KeyError(f"Unknown catalog column: {name}")
+        return self.columns[name]
+
+    def code(self, name: str, value: str | None) -> int:
+        """カテゴリ列の値に対応するコードを返す。
+
+        Args:
+            name: カテゴリ列の列名
+            value: カテゴリの値。Noneの場合は欠損を表すコード。
+
+        Returns:
+            コード。カタログに存在しない値の場合は、どの行とも一致しない負の値。
+
+        Raises:
+            KeyError: カテゴリ列でない列名が指定された場合
+        """
+        if name not in self._codes:
+            raise KeyError(f"Not a category column: {name}")
+        if value is None:
+            return MISSING_CODE
+        return self._codes[name].get(value, MISSING_CODE - 1)
+
+    def equals(self, name: str, value: Any) -> np.ndarray:
+        """列の値がvalueと等しい行のマスクを返す（カテゴリ列は値で比較する）。"""
+        if name in self._codes:
+            return self[name] == self.code(name, value)
+        return self[name] == value
+
+    def isin(self, name: str, values: Iterable[Any]) -> np.ndarray:
+        """列の値がvaluesのいずれかと等しい行のマスクを返す。
+
+        valuesは列の型に変換してから比較する（float32の列とfloat64の値を比較すると、
+        `==`では一致する2.8等が一致しないため）。
+        """
+        values = list(values)
+        if name in self._codes:
+            values = [self.code(name, value) for value in values]
+        column = self[name]
+        return np.isin(column, np.asarray(values, dtype=column.dtype))
+
+    def decode(self, name: str, index: int) -> Any:
+        """指定された行の列の値を返す（カテゴリ列は文字列に戻す）。"""
+        value = self[name][index]
+        if name in self._codes:
+            return None if value < 0 else self.categories[name][value]
+        return value
+
+    def select(self, mask: np.ndarray) -> list[Path]:
+        """マスクがTrueの行のパスを返す。"""
+        return [self.paths[index] for index in np.flatnonzero(mask)]
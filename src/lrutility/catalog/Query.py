@@ -0,0 +1,252 @@
+import ast
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+from lrutility.catalog.Catalog import COLUMNS_BY_NAME, Catalog, Column
+from lrutility.xmp.XMPDataclass import XMPMetadata
+
+Predicate = Callable[[XMPMetadata], bool]
+MaskFunction = Callable[[Catalog], np.ndarray]
+
+_OPERATORS: dict[type[ast.cmpop], Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+# 左右を入れ替えた場合の比較演算子（例: 1 >= rating → rating <= 1）
+_FLIPPED: dict[type[ast.cmpop], type[ast.cmpop]] = {
+    ast.Eq: ast.Eq,
+    ast.NotEq: ast.NotEq,
+    ast.Lt: ast.Gt,
+    ast.LtE: ast.GtE,
+    ast.Gt: ast.Lt,
+    ast.GtE: ast.LtE,
+}
+
+
+class QueryError(ValueError):
+    """クエリ式が不正な場合に発生する例外。"""
+
+
+@dataclass(frozen=True)
+class Query:
+    """コンパイル済みのクエリ式。
+
+    Attributes:
+        expression: 元のクエリ式
+        columns: クエリ式で参照している列名
+        fields: クエリの評価に必要なXMPフィールド名
+    """
+
+    expression: str
+    columns: frozenset[str]
+    fields: frozenset[str]
+    _predicate: Predicate
+    _mask: MaskFunction
+
+    def matches(self, metadata: XMPMetadata) -> bool:
+        """XMPMetadataがクエリ条件を満たすかを返す。"""
+        return self._predicate(metadata)
+
+    def mask(self, catalog: Catalog) -> np.ndarray:
+        """カタログの各行がクエリ条件を満たすかを表すマスクを返す。"""
+        return self._mask(catalog)
+
+
+def compile_query(expression: str) -> Query:
+    """クエリ式をコンパイルする。
+
+    クエリ式はPythonの式の構文のうち、列名と定数の比較
+    （==, !=, <, <=, >, >=, in, not in）と、and / or / not、括弧のみを使用できます。
+    値が存在しない列との比較は、`== None`と`!= 定数`を除いて偽となります。
+    日時列は"2025-08-10T18:00"のようなISO 8601形式の文字列と比較します。
+
+    Args:
+        expression: クエリ式（例: "rating <= 1 or pick == -1 or label == 'Red'"）
+
+    Returns:
+        Queryオブジェクト
+
+    Raises:
+        QueryError: 構文や列名、比較の組み合わせが不正な場合
+
+    Examples:
+        >>> query = compile_query("rating <= 1 and lens == 'FE 24-70mm F2.8 GM II'")
+        >>> query.matches(metadata)
+        >>> catalog.select(query.mask(catalog))
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise QueryError(f"Invalid query: {expression} ({e.msg})") from None
+
+    columns: set[str] = set()
+    predicate, mask = _compile(tree.body, columns)
+    return Query(
+        expression=expression,
+        columns=frozenset(columns),
+        fields=frozenset(COLUMNS_BY_NAME[name].field for name in columns),
+        _predicate=predicate,
+        _mask=mask,
+    )
+
+
+def _compile(node: ast.expr, columns: set[str]) -> tuple[Predicate, MaskFunction]:
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(value, columns) for value in node.values]
+        predicates = [predicate for predicate, _ in parts]
+        masks = [mask for _, mask in parts]
+        if isinstance(node.op, ast.And):
+            return (
+                lambda metadata: all(predicate(metadata) for predicate in predicates),
+                lambda catalog: np.logical_and.reduce([m(catalog) for m in masks]),
+            )
+        return (
+            lambda metadata: any(predicate(metadata) for predicate in predicates),
+            lambda catalog: np.logical_or.reduce([m(catalog) for m in masks]),
+        )
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        predicate, mask = _compile(node.operand, columns)
+        return (
+            lambda metadata: not predicate(metadata),
+            lambda catalog: ~mask(catalog),
+        )
+
+    if isinstance(node, ast.Compare):
+        operands = [node.left, *node.comparators]
+        parts = [
+            _compile_comparison(left, op, right, columns)
+            for left, op, right in zip(operands, node.ops, operands[1:])
+        ]
+        if len(parts) == 1:
+            return parts[0]
+        # 1 <= rating <= 3 のような連続した比較はandとして扱う
+        return (
+            lambda metadata: all(predicate(metadata) for predicate, _ in parts),
+            lambda catalog: np.logical_and.reduce([mask(catalog) for _, mask in parts]),
+        )
+
+    raise QueryError(f"Unsupported expression: {ast.unparse(node)}")
+
+
+def _compile_comparison(
+    left: ast.expr, op: ast.cmpop, right: ast.expr, columns: set[str]
+) -> tuple[Predicate, MaskFunction]:
+    if not isinstance(left, ast.Name) and isinstance(right, ast.Name):
+        if type(op) not in _FLIPPED:
+            raise QueryError(f"Column must be on the left of '{ast.unparse(op)}'")
+        left, op, right = right, _FLIPPED[type(op)](), left
+    if not isinstance(left, ast.Name):
+        raise QueryError(f"Comparison needs a column: {ast.unparse(left)}")
+
+    column = COLUMNS_BY_NAME.get(left.id)
+    if column is None:
+        names = ", ".join(COLUMNS_BY_NAME)
+        raise QueryError(f"Unknown column: {left.id} (available: {names})")
+    columns.add(column.name)
+
+    if isinstance(op, ast.In | ast.NotIn):
+        if not isinstance(right, ast.List | ast.Tuple | ast.Set):
+            raise QueryError(f"'in' needs a list of values: {ast.unparse(right)}")
+        values = [_constant(column, element) for element in right.elts]
+        predicate, mask = _compile_in(column, values)
+        if isinstance(op, ast.NotIn):
+            return (lambda metadata: not predicate(metadata), lambda c: ~mask(c))
+        return predicate, mask
+
+    return _compile_operator(column, type(op), _constant(column, right))
+
+
+def _constant(column: Column, node: ast.expr) -> Any:
+    try:
+        value = ast.literal_eval(node)
+    except ValueError:
+        raise QueryError(f"Expected a constant value: {ast.unparse(node)}") from None
+    if value is None:
+        return None
+    if column.kind == "datetime":
+        if not isinstance(value, str):
+            raise QueryError(f"Expected an ISO 8601 string for {column.name}")
+        try:
+            return datetime.fromisoformat(value).replace(tzinfo=None)
+        except ValueError:
+            raise QueryError(f"Invalid datetime for {column.name}: {value}") from None
+    if column.kind == "category":
+        if not isinstance(value, str):
+            raise QueryError(f"Expected a string value for {column.name}")
+        return value
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        raise QueryError(f"Expected a numeric value for {column.name}")
+    return value
+
+
+def _compile_operator(
+    column: Column, op: type[ast.cmpop], value: Any
+) -> tuple[Predicate, MaskFunction]:
+    if op not in _OPERATORS:
+        raise QueryError(f"Unsupported operator: {op.__name__}")
+    compare = _OPERATORS[op]
+    if column.kind == "category" and op not in (ast.Eq, ast.NotEq):
+        raise QueryError(f"Column {column.name} only supports == and !=")
+
+    if value is None:
+        if op not in (ast.Eq, ast.NotEq):
+            raise QueryError("None can only be compared with == and !=")
+        expected = op is ast.Eq
+        return (
+            lambda metadata: (column.get(metadata) is None) is expected,
+            lambda catalog: _missing(catalog, column) == expected,
+        )
+
+    def predicate(metadata: XMPMetadata) -> bool:
+        actual = column.get(metadata)
+        if actual is None:
+            return op is ast.NotEq
+        return bool(compare(actual, value))
+
+    def mask(catalog: Catalog) -> np.ndarray:
+        if column.kind == "category":
+            return compare(catalog[column.name], catalog.code(column.name, value))
+        if column.kind == "datetime":
+            return compare(catalog[column.name], np.datetime64(value))
+        return compare(catalog[column.name], value)
+
+    return predicate, mask
+
+
+def _compile_in(column: Column, values: list[Any]) -> tuple[Predicate, MaskFunction]:
+    def predicate(metadata: XMPMetadata) -> bool:
+        return column.get(metadata) in values
+
+    present = [value for value in values if value is not None]
+    if column.kind == "datetime":
+        present = [np.datetime64(value) for value in present]
+
+    def mask(catalog: Catalog) -> np.ndarray:
+        result = catalog.isin(column.name, present)
+        if None in values:
+            result |= _missing(catalog, column)
+        return result
+
+    return predicate, mask
+
+
+def _missing(catalog: Catalog, column: Column) -> np.ndarray:
+    values = catalog[column.name]
+    if column.kind == "category":
+        return values == catalog.code(column.name, None)
+    if column.kind == "datetime":
+        return np.isnat(values)
+    if column.kind == "float":
+        return np.isnan(values)
+    return np.zeros(len(values), dtype=bool)
@@ -4,13 +4,27 @@ from typing import Annotated
 import typer
 from typer import Typer
 
-from lrutility.cli.delete_rate_1 import delete_rate_1
-from lrutility.cli.zip_chunker import zip_chunker
+# コマンドの実装は実行時にimportする（--helpや補完で全コマンドの依存を読み込まない）
+from lrutility.options import (
+    DEFAULT_MEMORY_BUDGET,
+    DEFAULT_VERIFY_WORKERS,
+    ArchiveFormat,
+    CompressionMode,
+    HashAlgorithm,
+    PackingStrategy,
+    ProfileMode,
+    SizeMode,
+    WatchMode,
+)
 
 app = Typer(
     name="lru",
     help="LrUtility: A collection of utilities for Adobe Lightroom",
 )
+index_app = Typer(help="Manage the XMP metadata index of a library")
+app.add_typer(index_app, name="index")
+journal_app = Typer(help="Resume, roll back or purge interrupted deletions")
+app.add_typer(journal_app, name="journal")
 
 
 @app.command("delete-rate-1")
@@ -34,14 +48,301 @@ def delete_rate_1_runner(
             help="Enable verbose logging (DEBUG level)",
         ),
     ] = False,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Number of processes used to parse XMP files (0: CPU count)",
+        ),
+    ] = 1,
+    use_index: Annotated[
+        bool,
+        typer.Option(
+            "--index",
+            "-i",
+            help="Use the metadata index in <directory>/.lrutility "
+            "and only re-parse changed XMP files",
+        ),
+    ] = False,
+    trash: Annotated[
+        bool,
+        typer.Option(
+            "--trash",
+            "-t",
+            help="Move files to <directory>/.lrutility/trash instead of deleting "
+            "them (can be undone with 'lru journal rollback')",
+        ),
+    ] = False,
+    with_companions: Annotated[
+        bool,
+        typer.Option(
+            "--with-companions",
+            help="Also delete files sharing the image's name, such as the JPEG of "
+            "a RAW+JPEG pair or exported DNG/TIFF/PSD/video files (by default "
+            "only other editors' sidecars like .dop/.pp3/.on1 are deleted)",
+        ),
+    ] = False,
+    stats: Annotated[
+        bool,
+        typer.Option(
+            "--stats",
+            help="Log wall/CPU time, counts and bytes per stage "
+            "(walk, parse, unlink, read, hash, compress, write, ...) at the end",
+        ),
+    ] = False,
+    stats_file: Annotated[
+        Path | None,
+        typer.Option("--stats-file", help="Write the per-stage stats as JSON"),
+    ] = None,
+    profile: Annotated[
+        Path | None,
+        typer.Option("--profile", help="Profile the run and write the result here"),
+    ] = None,
+    profile_mode: Annotated[
+        ProfileMode,
+        typer.Option(
+            "--profile-mode",
+            help="cprofile: pstats file (e.g. for snakeviz); "
+            "sample: low-overhead sampling, collapsed stacks for flame graphs",
+        ),
+    ] = "cprofile",
+    log_file: Annotated[
+        Path | None,
+        typer.Option("--log-file", help="Also write the log to this file"),
+    ] = None,
+    log_async: Annotated[
+        bool,
+        typer.Option(
+            "--log-async",
+            help="Write log lines from a background thread so slow terminals "
+            "or log files do not block deletion",
+        ),
+    ] = False,
+    summary: Annotated[
+        bool,
+        typer.Option(
+            "--summary",
+            help="Count per-file outcomes (not matched, deleted, no image, ...) "
+            "and log the totals instead of one line per file (errors are kept)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.delete_rate_1 import delete_rate_1
+    from lrutility.utils.instrument import instrumented
+    from lrutility.utils.logger import LogOptions
+
+    log_options = LogOptions(log_file, log_async, summary)
+    with instrumented(stats, stats_file, profile, profile_mode):
+        delete_rate_1(
+            directory,
+            dry_run,
+            verbose,
+            workers,
+            use_index,
+            trash,
+            log_options,
+            with_companions,
+        )
+
+
+@app.command("cull")
+def cull_runner(
+    directory: Annotated[
+        Path, typer.Argument(help="Target directory to search for XMP files")
+    ],
+    where: Annotated[
+        str,
+        typer.Option(
+            "--where",
+            "-q",
+            help="Delete images matching the query, e.g. "
+            "\"rating <= 1 or pick == -1 or label == 'Red'\". "
+            "Columns: rating, pick, label, make, model, lens, iso, "
+            "focal_length, f_number, exposure_time, date_time_original",
+        ),
+    ],
+    dry_run: Annotated[
+        bool,
+        typer.Option(
+            "--dry-run",
+            "-d",
+            help="Perform a dry run without actually deleting files",
+        ),
+    ] = False,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Number of processes used to parse XMP files (0: CPU count)",
+        ),
+    ] = 1,
+    use_index: Annotated[
+        bool,
+        typer.Option(
+            "--index",
+            "-i",
+            help="Use the metadata index in <directory>/.lrutility "
+            "and only re-parse changed XMP files",
+        ),
+    ] = False,
+    trash: Annotated[
+        bool,
+        typer.Option(
+            "--trash",
+            "-t",
+            help="Move files to <directory>/.lrutility/trash instead of deleting "
+            "them (can be undone with 'lru journal rollback')",
+        ),
+    ] = False,
+    with_companions: Annotated[
+        bool,
+        typer.Option(
+            "--with-companions",
+            help="Also delete files sharing the image's name, such as the JPEG of "
+            "a RAW+JPEG pair or exported DNG/TIFF/PSD/video files (by default "
+            "only other editors' sidecars like .dop/.pp3/.on1 are deleted)",
+        ),
+    ] = False,
+    stats: Annotated[
+        bool,
+        typer.Option(
+            "--stats",
+            help="Log wall/CPU time, counts and bytes per stage "
+            "(walk, parse, unlink, read, hash, compress, write, ...) at the end",
+        ),
+    ] = False,
+    stats_file: Annotated[
+        Path | None,
+        typer.Option("--stats-file", help="Write the per-stage stats as JSON"),
+    ] = None,
+    profile: Annotated[
+        Path | None,
+        typer.Option("--profile", help="Profile the run and write the result here"),
+    ] = None,
+    profile_mode: Annotated[
+        ProfileMode,
+        typer.Option(
+            "--profile-mode",
+            help="cprofile: pstats file (e.g. for snakeviz); "
+            "sample: low-overhead sampling, collapsed stacks for flame graphs",
+        ),
+    ] = "cprofile",
+    log_file: Annotated[
+        Path | None,
+        typer.Option("--log-file", help="Also write the log to this file"),
+    ] = None,
+    log_async: Annotated[
+        bool,
+        typer.Option(
+            "--log-async",
+            help="Write log lines from a background thread so slow terminals "
+            "or log files do not block deletion",
+        ),
+    ] = False,
+    summary: Annotated[
+        bool,
+        typer.Option(
+            "--summary",
+            help="Count per-file outcomes (not matched, deleted, no image, ...) "
+            "and log the totals instead of one line per file (errors are kept)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.cull import cull
+    from lrutility.utils.instrument import instrumented
+    from lrutility.utils.logger import LogOptions
+
+    log_options = LogOptions(log_file, log_async, summary)
+    with instrumented(stats, stats_file, profile, profile_mode):
+        cull(
+            directory,
+            where,
+            dry_run,
+            verbose,
+            workers,
+            use_index,
+            trash,
+            log_options,
+            with_companions,
+        )
+
+
+@app.command("orphans")
+def orphans_runner(
+    directory: Annotated[Path, typer.Argument(help="Library root directory")],
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.orphans import orphans
+
+    orphans(directory, verbose)
+
+
+@app.command("watch")
+def watch_runner(
+    directory: Annotated[Path, typer.Argument(help="Library root directory")],
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Number of processes used to parse XMP files (0: CPU count)",
+        ),
+    ] = 1,
+    debounce: Annotated[
+        float,
+        typer.Option(
+            "--debounce",
+            help="Seconds without further changes before re-parsing changed XMP "
+            "files (Lightroom rewrites sidecars in bursts)",
+        ),
+    ] = 2.0,
+    mode: Annotated[
+        WatchMode,
+        typer.Option(
+            "--mode",
+            help="inotify: Linux inotify; poll: rescan every --interval seconds; "
+            "auto: inotify, falling back to polling",
+        ),
+    ] = "auto",
+    interval: Annotated[
+        float,
+        typer.Option("--interval", help="Polling interval in seconds"),
+    ] = 5.0,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
 ) -> None:
-    delete_rate_1(directory, dry_run, verbose)
+    from lrutility.cli.watch import watch
+
+    watch(directory, workers, debounce, mode, interval, verbose)
 
 
 @app.command(name="zip-chunker")
 def zip_chunker_runner(
-    directory: Annotated[
-        Path, typer.Argument(help="Target directory to search for files")
+    directories: Annotated[
+        list[Path], typer.Argument(help="Target directories to search for files")
     ],
     size_chunk: Annotated[
         int,
@@ -59,5 +360,329 @@ def zip_chunker_runner(
             help="Enable verbose logging (DEBUG level)",
         ),
     ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            help="Number of archives created in parallel (0: CPU count)",
+        ),
+    ] = 1,
+    threads: Annotated[
+        int,
+        typer.Option(
+            "--threads",
+            "-t",
+            help="Number of threads compressing each archive (0: CPU count)",
+        ),
+    ] = 1,
+    memory_budget: Annotated[
+        int,
+        typer.Option(
+            "--memory-budget",
+            "-m",
+            help="Maximum bytes of file data buffered per archive when --threads > 1",
+        ),
+    ] = DEFAULT_MEMORY_BUDGET,
+    compression: Annotated[
+        CompressionMode,
+        typer.Option(
+            "--compression",
+            "-c",
+            help="auto: store RAW/JPEG/video and deflate sidecars and text, "
+            "deciding unknown types by trial compression; "
+            "deflate/store: use one method for all files",
+        ),
+    ] = "auto",
+    strategy: Annotated[
+        PackingStrategy,
+        typer.Option(
+            "--strategy",
+            help="next-fit: keep file name order; "
+            "ffd: first-fit-decreasing, fewer and fuller archives",
+        ),
+    ] = "next-fit",
+    group_by_date: Annotated[
+        bool,
+        typer.Option(
+            "--group-by-date",
+            help="Do not mix capture dates (from XMP) in one archive",
+        ),
+    ] = False,
+    size_mode: Annotated[
+        SizeMode,
+        typer.Option(
+            "--size-mode",
+            help="uncompressed: budget by file sizes; "
+            "written: keep each archive file under --size-chunk",
+        ),
+    ] = "uncompressed",
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            "--incremental",
+            "-i",
+            help="Archive only files added or changed since the last run "
+            "into new archives",
+        ),
+    ] = False,
+    hash_algorithm: Annotated[
+        HashAlgorithm | None,
+        typer.Option(
+            "--hash",
+            help="Hash every file while archiving and write <archive>.<algorithm> "
+            "checksum files for zip-verify",
+        ),
+    ] = None,
+    recursive: Annotated[
+        bool,
+        typer.Option(
+            "--recursive",
+            "-r",
+            help="Include files in subdirectories, keeping relative paths",
+        ),
+    ] = False,
+    output: Annotated[
+        Path | None,
+        typer.Option(
+            "--output",
+            "-o",
+            help="Name archives <output>_1.zip, ... "
+            "(default: after the first directory)",
+        ),
+    ] = None,
+    archive_format: Annotated[
+        ArchiveFormat,
+        typer.Option(
+            "--format",
+            "-f",
+            help="zip: per-file compression and --threads; "
+            "tar/tar.gz/tar.xz: compress the whole stream",
+        ),
+    ] = "zip",
+    sink: Annotated[
+        str | None,
+        typer.Option(
+            "--sink",
+            help="Stream archives without seeking: '-' for stdout, a path with "
+            "{name} for one file per archive, or a path (e.g. a named pipe) "
+            "receiving all archives in turn. Disables resume and --hash",
+        ),
+    ] = None,
+    stats: Annotated[
+        bool,
+        typer.Option(
+            "--stats",
+            help="Log wall/CPU time, counts and bytes per stage "
+            "(walk, parse, unlink, read, hash, compress, write, ...) at the end",
+        ),
+    ] = False,
+    stats_file: Annotated[
+        Path | None,
+        typer.Option("--stats-file", help="Write the per-stage stats as JSON"),
+    ] = None,
+    profile: Annotated[
+        Path | None,
+        typer.Option("--profile", help="Profile the run and write the result here"),
+    ] = None,
+    profile_mode: Annotated[
+        ProfileMode,
+        typer.Option(
+            "--profile-mode",
+            help="cprofile: pstats file (e.g. for snakeviz); "
+            "sample: low-overhead sampling, collapsed stacks for flame graphs",
+        ),
+    ] = "cprofile",
+) -> None:
+    from lrutility.cli.zip_chunker import zip_chunker
+    from lrutility.utils.instrument import instrumented
+
+    with instrumented(stats, stats_file, profile, profile_mode):
+        zip_chunker(
+            directories,
+            size_chunk,
+            verbose,
+            jobs,
+            threads,
+            memory_budget,
+            compression,
+            strategy,
+            group_by_date,
+            size_mode,
+            incremental,
+            hash_algorithm,
+            recursive,
+            output,
+            archive_format,
+            sink,
+        )
+
+
+@app.command(name="zip-verify")
+def zip_verify_runner(
+    paths: Annotated[
+        list[Path],
+        typer.Argument(
+            help="Archives, or directories whose archives have checksum files"
+        ),
+    ],
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Number of threads decompressing and hashing members",
+        ),
+    ] = DEFAULT_VERIFY_WORKERS,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.zip_verify import zip_verify
+
+    if not zip_verify(paths, workers, verbose):
+        raise typer.Exit(code=1)
+
+
+@index_app.command("rebuild")
+def index_rebuild_runner(
+    directory: Annotated[Path, typer.Argument(help="Library root directory")],
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Number of processes used to parse XMP files (0: CPU count)",
+        ),
+    ] = 1,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.index import index_rebuild
+
+    index_rebuild(directory, workers, verbose)
+
+
+@index_app.command("stats")
+def index_stats_runner(
+    directory: Annotated[Path, typer.Argument(help="Library root directory")],
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.index import index_stats
+
+    index_stats(directory, verbose)
+
+
+@index_app.command("vacuum")
+def index_vacuum_runner(
+    directory: Annotated[Path, typer.Argument(help="Library root directory")],
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.index import index_vacuum
+
+    index_vacuum(directory, verbose)
+
+
+@journal_app.command("list")
+def journal_list_runner(
+    directory: Annotated[Path, typer.Argument(help="Library root directory")],
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.journal import journal_list
+
+    journal_list(directory, verbose)
+
+
+@journal_app.command("resume")
+def journal_resume_runner(
+    directory: Annotated[Path, typer.Argument(help="Library root directory")],
+    run_id: Annotated[
+        str | None,
+        typer.Argument(help="Run ID of the journal (default: latest)"),
+    ] = None,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
 ) -> None:
-    zip_chunker(directory, size_chunk, verbose)
+    from lrutility.cli.journal import journal_resume
+
+    journal_resume(directory, run_id, verbose)
+
+
+@journal_app.command("rollback")
+def journal_rollback_runner(
+    directory: Annotated[Path, typer.Argument(help="Library root directory")],
+    run_id: Annotated[
+        str | None,
+        typer.Argument(help="Run ID of the journal (default: latest)"),
+    ] = None,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.journal import journal_rollback
+
+    journal_rollback(directory, run_id, verbose)
+
+
+@journal_app.command("purge")
+def journal_purge_runner(
+    directory: Annotated[Path, typer.Argument(help="Library root directory")],
+    run_id: Annotated[
+        str | None,
+        typer.Argument(help="Run ID of the journal (default: latest)"),
+    ] = None,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Enable verbose logging (DEBUG level)",
+        ),
+    ] = False,
+) -> None:
+    from lrutility.cli.journal import journal_purge
+
+    journal_purge(directory, run_id, verbose)
@@ -0,0 +1,193 @@
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
+from pathlib import Path
+
+from loguru import logger
+
+from lrutility.catalog.Catalog import Catalog
+from lrutility.catalog.Query import Query, QueryError, compile_query
+from lrutility.deletion.Deleter import Deleter
+from lrutility.deletion.DeletionJournal import (
+    DeletionJournal,
+    DeletionMode,
+    new_run_id,
+)
+from lrutility.index.MetadataIndex import MetadataIndex
+from lrutility.index.SidecarIndex import SidecarIndex
+from lrutility.utils.instrument import count, stage, timed
+from lrutility.utils.logger import (
+    LogOptions,
+    configure_loguru,
+    log_outcome,
+    log_outcome_summary,
+)
+from lrutility.utils.walker import FileEntry
+from lrutility.xmp.XMPParser import XMPParser
+
+# 画像ファイルの特定に必要なXMPフィールド
+RAW_FIELDS = frozenset({"camera_raw_settings.raw_file_name"})
+
+
+def deletion_group(
+    sidecars: SidecarIndex,
+    meta_path: Path,
+    raw_file_name: str | None,
+    with_companions: bool = False,
+) -> list[Path] | None:
+    """条件を満たしたXMPファイルと共に削除するファイルを返す。
+
+    画像ファイル、付随ファイル、XMPファイルの順に並べる。XMPファイルを最後に
+    削除することで、途中で失敗した場合も再実行で対象となるようにする。
+    付随ファイルは、既定では他の現像ソフトのサイドカー（.dop等）のみとする。
+
+    Args:
+        sidecars: ライブラリのSidecarIndex
+        meta_path: 条件を満たしたXMPファイルのパス
+        raw_file_name: XMPに記録されたRAWファイル名
+        with_companions: Trueの場合、同じファイル名のJPEG・DNG・書き出した画像・
+            動画等も付随ファイルとして削除する（別に管理している可能性があるため、
+            明示的に指定した場合のみ）
+
+    Returns:
+        削除するファイルのリスト。画像ファイルが見つからない場合はNone。
+    """
+    raw_path = sidecars.resolve(meta_path, raw_file_name)
+    if raw_path is None:
+        log_outcome("no_image", "WARNING", "No image found for xmp: {}", meta_path)
+        return None
+    sidecars_only = not with_companions
+    companions = dict.fromkeys(
+        [
+            *sidecars.companions(meta_path, sidecars_only),
+            *sidecars.companions(raw_path, sidecars_only),
+        ]
+    )
+    companions.pop(raw_path, None)
+    companions.pop(meta_path, None)
+    return [raw_path, *companions, meta_path]
+
+
+def select_by_parsing(
+    meta_paths: Iterable[Path], query: Query, workers: int
+) -> Iterator[tuple[Path, str | None]]:
+    """XMPファイルをクエリに必要なフィールドのみパースし、条件を満たすものを返す。
+
+    Yields:
+        (XMPファイルのパス, RAWファイル名)のタプル
+    """
+    parser = XMPParser()
+    results = parser.parse_many(
+        meta_paths, fields=query.fields | RAW_FIELDS, workers=workers
+    )
+    for meta_path, metadata in results:
+        if isinstance(metadata, Exception):
+            log_outcome(
+                "parse_failed",
+                "ERROR",
+                "Failed to parse xmp: {} ({})",
+                meta_path,
+                metadata,
+            )
+            continue
+        if not query.matches(metadata):
+            log_outcome("not_matched", "DEBUG", "Not matched: {}", meta_path)
+            continue
+        yield meta_path, metadata.camera_raw_settings.raw_file_name
+
+
+def select_from_index(
+    index: MetadataIndex, entries: Iterable[FileEntry], query: Query, workers: int
+) -> Iterator[tuple[Path, str | None]]:
+    """インデックスからカタログを構築し、クエリ条件をベクトル演算で評価する。
+
+    Yields:
+        (XMPファイルのパス, RAWファイル名)のタプル
+    """
+    raw_file_names: dict[Path, str | None] = {}
+
+    def records() -> Iterator:
+        for meta_path, metadata in index.refresh(entries, XMPParser(), workers):
+            if isinstance(metadata, Exception):
+                log_outcome(
+                    "parse_failed",
+                    "ERROR",
+                    "Failed to parse xmp: {} ({})",
+                    meta_path,
+                    metadata,
+                )
+                continue
+            raw_file_names[meta_path] = metadata.camera_raw_settings.raw_file_name
+            yield meta_path, metadata
+
+    catalog = Catalog.from_records(records())
+    stats = index.last_refresh
+    logger.debug(
+        f"Index: {stats.hits} cached, {stats.parsed} parsed, {stats.pruned} pruned"
+    )
+    for meta_path in catalog.select(query.mask(catalog)):
+        yield meta_path, raw_file_names[meta_path]
+
+
+def cull(
+    directory: Path,
+    where: str,
+    dry_run: bool,
+    verbose: bool,
+    workers: int = 1,
+    use_index: bool = False,
+    trash: bool = False,
+    log_options: LogOptions | None = None,
+    with_companions: bool = False,
+) -> None:
+    configure_loguru(verbose, log_options)
+
+    if not directory.exists():
+        logger.error("Target Directory is not specified")
+        return
+
+    try:
+        query = compile_query(where)
+    except QueryError as e:
+        logger.error(str(e))
+        return
+
+    logger.info(f"Target Directory: {directory}")
+    logger.info(f"Query: {query.expression}")
+
+    with stage("walk"):
+        sidecars = SidecarIndex.build(directory)
+    entries = sidecars.sidecars
+    count("walk", items=len(entries))
+    journal = None if dry_run else DeletionJournal(directory, new_run_id())
+    mode: DeletionMode = "trash" if trash else "unlink"
+    # インデックスを更新するコールバックが参照するため、ExitStackの前に作成する
+    deleter = Deleter(directory, mode=mode, journal=journal, dry_run=dry_run)
+    with ExitStack() as stack:
+        if use_index:
+            index = stack.enter_context(MetadataIndex(directory))
+            matches = timed("select", select_from_index(index, entries, query, workers))
+            if not dry_run:
+                # 削除処理の終了後（中断時を含む）に、削除したXMPをインデックスから除く
+                stack.callback(
+                    lambda: index.remove(
+                        group[-1] for group in deleter.summary.completed
+                    )
+                )
+        else:
+            meta_paths = (entry.path for entry in entries)
+            matches = timed("select", select_by_parsing(meta_paths, query, workers))
+
+        stack.enter_context(deleter)
+        for meta_path, raw_file_name in matches:
+            with stage("plan"):
+                group = deletion_group(
+                    sidecars, meta_path, raw_file_name, with_companions
+                )
+            if group is not None:
+                with stage("submit", items=len(group)):
+                    deleter.submit(group, sidecars.sizes(group))
+
+    log_outcome_summary()
+    deleter.summary.log(dry_run)
+    if journal is not None and journal.path.exists():
+        logger.info(f"Journal: {journal.path}")
@@ -1,46 +1,27 @@
 from pathlib import Path
 
-from loguru import logger
-
-from lrutility.utils.logger import configure_loguru
-from lrutility.xmp.XMPParser import XMPParser
-
-
-def delete_image_and_xmp(raw_path: Path, xmp_path: Path, dry_run: bool) -> None:
-    message_template = "Deleted: {path}"
-    if dry_run:
-        logger.debug(f"[DRY RUN]: {message_template.format(path=raw_path)}")
-        logger.debug(f"[DRY RUN]: {message_template.format(path=xmp_path)}")
-    else:
-        raw_path.unlink()
-        logger.info(message_template.format(path=raw_path))
-        xmp_path.unlink()
-        logger.info(message_template.format(path=xmp_path))
+from lrutility.cli.cull import cull
+from lrutility.utils.logger import LogOptions
 
 
 def delete_rate_1(
     directory: Path,
     dry_run: bool,
     verbose: bool,
+    workers: int = 1,
+    use_index: bool = False,
+    trash: bool = False,
+    log_options: LogOptions | None = None,
+    with_companions: bool = False,
 ) -> None:
-    configure_loguru(verbose=verbose)
-
-    if not directory.exists():
-        logger.error("Target Directory is not specified")
-        return
-
-    logger.info(f"Target Directory: {directory}")
-    parser = XMPParser()
-
-    meta_paths = directory.glob("**/*.xmp")
-    meta_paths = sorted(meta_paths)
-    for meta_path in meta_paths:
-        metadata = parser.parse(meta_path)
-        if metadata.xmp_info.rating is None:
-            logger.debug(f"No Rating in xmp: {meta_path}")
-            continue
-        rating = metadata.xmp_info.rating
-        raw_filename = metadata.camera_raw_settings.raw_file_name
-        raw_path = directory / raw_filename
-        if rating == 1:
-            delete_image_and_xmp(raw_path, meta_path, dry_run)
+    cull(
+        directory,
+        "rating == 1",
+        dry_run,
+        verbose,
+        workers,
+        use_index,
+        trash,
+        log_options,
+        with_companions,
+    )
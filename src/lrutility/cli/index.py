@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from loguru import logger
+from tqdm import tqdm
+
+from lrutility.index.MetadataIndex import MetadataIndex
+from lrutility.utils.logger import configure_loguru
+from lrutility.utils.walker import walk_files
+from lrutility.xmp.XMPParser import XMPParser
+
+
+def index_rebuild(directory: Path, workers: int, verbose: bool) -> None:
+    configure_loguru(verbose=verbose)
+
+    if not directory.is_dir():
+        logger.error(f"{directory} is not a valid directory")
+        return
+
+    entries = walk_files(directory, suffixes=[".xmp"])
+    with MetadataIndex(directory) as index:
+        index.clear()
+        results = index.refresh(entries, XMPParser(), workers=workers)
+        for meta_path, metadata in tqdm(results, desc="Indexing XMP files"):
+            if isinstance(metadata, Exception):
+                logger.error(f"Failed to parse xmp: {meta_path} ({metadata})")
+        stats = index.last_refresh
+    logger.info(
+        f"Indexed {stats.parsed} files ({stats.failed} failed): {index.index_path}"
+    )
+
+
+def index_stats(directory: Path, verbose: bool) -> None:
+    configure_loguru(verbose=verbose)
+
+    index = MetadataIndex(directory)
+    if not index.index_path.exists():
+        logger.error(f"Index not found: {index.index_path}")
+        return
+
+    with index:
+        stats = index.stats()
+    logger.info(f"Index: {stats.path}")
+    logger.info(f"Entries: {stats.entries}")
+    logger.info(f"File size: {stats.file_size} bytes")
+
+
+def index_vacuum(directory: Path, verbose: bool) -> None:
+    configure_loguru(verbose=verbose)
+
+    index = MetadataIndex(directory)
+    if not index.index_path.exists():
+        logger.error(f"Index not found: {index.index_path}")
+        return
+
+    with index:
+        before = index.stats().file_size
+        index.vacuum()
+        after = index.stats().file_size
+    logger.info(f"Vacuumed {index.index_path}: {before} -> {after} bytes")
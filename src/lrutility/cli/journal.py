@@ -0,0 +1,83 @@
+import shutil
+from pathlib import Path
+
+from loguru import logger
+
+from lrutility.deletion.Deleter import Deleter, restore, trash_dir
+from lrutility.deletion.DeletionJournal import DeletionJournal, list_journals
+from lrutility.utils.logger import configure_loguru
+
+
+def find_journal(directory: Path, run_id: str | None) -> DeletionJournal | None:
+    """実行IDに対応するジャーナルを返す（Noneの場合は最新のジャーナル）。"""
+    if run_id is None:
+        journals = list_journals(directory)
+        if not journals:
+            logger.error(f"No journal found in {directory}")
+            return None
+        run_id = journals[-1].stem
+    journal = DeletionJournal(directory, run_id)
+    if not journal.path.exists():
+        logger.error(f"Journal not found: {journal.path}")
+        return None
+    return journal
+
+
+def journal_list(directory: Path, verbose: bool) -> None:
+    configure_loguru(verbose=verbose)
+
+    for path in list_journals(directory):
+        state = DeletionJournal(directory, path.stem).load()
+        files = sum(len(group) for group in state.planned)
+        logger.info(
+            f"{state.run_id}: mode={state.mode}, planned={files}, "
+            f"done={len(state.done)}, failed={len(state.failed)}, "
+            f"restored={len(state.restored)}"
+        )
+
+
+def journal_resume(directory: Path, run_id: str | None, verbose: bool) -> None:
+    configure_loguru(verbose=verbose)
+
+    journal = find_journal(directory, run_id)
+    if journal is None:
+        return
+    state = journal.load()
+    pending = state.pending()
+    logger.info(f"Resuming {state.run_id}: {len(pending)} groups remaining")
+
+    with Deleter(directory, mode=state.mode, journal=journal) as deleter:
+        for group in pending:
+            deleter.submit([directory / path for path in group])
+    deleter.summary.log()
+
+
+def journal_rollback(directory: Path, run_id: str | None, verbose: bool) -> None:
+    configure_loguru(verbose=verbose)
+
+    journal = find_journal(directory, run_id)
+    if journal is None:
+        return
+    state = journal.load()
+    if state.mode != "trash":
+        logger.error(f"Files of {state.run_id} were deleted and cannot be restored")
+        return
+
+    summary = restore(directory, state, journal)
+    logger.info(f"Restored {summary.files} files, {len(summary.failed)} failed")
+    for path, error in summary.failed:
+        logger.error(f"Failed to restore: {path} ({error})")
+
+
+def journal_purge(directory: Path, run_id: str | None, verbose: bool) -> None:
+    configure_loguru(verbose=verbose)
+
+    journal = find_journal(directory, run_id)
+    if journal is None:
+        return
+    trash = trash_dir(directory, journal.run_id)
+    if trash.exists():
+        shutil.rmtree(trash)
+        logger.info(f"Removed trash: {trash}")
+    journal.path.unlink()
+    logger.info(f"Removed journal: {journal.path}")
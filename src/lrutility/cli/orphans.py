@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from loguru import logger
+
+from lrutility.index.SidecarIndex import SidecarIndex
+from lrutility.utils.logger import configure_loguru
+
+
+def orphans(directory: Path, verbose: bool) -> None:
+    configure_loguru(verbose=verbose)
+
+    if not directory.is_dir():
+        logger.error(f"{directory} is not a valid directory")
+        return
+
+    sidecars = SidecarIndex.build(directory)
+    result = sidecars.orphans()
+    for path in result.sidecars:
+        logger.warning(f"XMP without image: {path}")
+    for path in result.images:
+        logger.warning(f"Image without XMP: {path}")
+    logger.info(
+        f"Scanned {len(sidecars)} files: {len(result.sidecars)} XMP without image, "
+        f"{len(result.images)} images without XMP"
+    )
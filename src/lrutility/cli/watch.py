@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from loguru import logger
+
+from lrutility.index.IndexWatcher import IndexWatcher, open_source
+from lrutility.index.MetadataIndex import MetadataIndex
+from lrutility.options import WatchMode
+from lrutility.utils.logger import configure_loguru
+from lrutility.xmp.XMPParser import XMPParser
+
+
+def watch(
+    directory: Path,
+    workers: int,
+    debounce: float,
+    mode: WatchMode,
+    interval: float,
+    verbose: bool,
+) -> None:
+    configure_loguru(verbose=verbose)
+
+    if not directory.is_dir():
+        logger.error(f"{directory} is not a valid directory")
+        return
+
+    # 同期中の変更も検出するため、同期の前に監視を開始する
+    with (
+        open_source(directory, mode, interval) as source,
+        MetadataIndex(directory) as index,
+    ):
+        watcher = IndexWatcher(index, source, XMPParser(), workers, debounce)
+        stats = watcher.sync()
+        logger.info(
+            f"Synced index: {stats.hits} cached, {stats.parsed} parsed, "
+            f"{stats.pruned} pruned, {stats.failed} failed"
+        )
+        logger.info(
+            f"Watching {directory} ({type(source).__name__}), press Ctrl+C to stop"
+        )
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            logger.info("Stopped watching")
@@ -1,59 +1,630 @@
-import zipfile
+import os
+import queue
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from multiprocessing import Manager
 from pathlib import Path
 
 from loguru import logger
 from tqdm import tqdm
 
+from lrutility.archive.ArchiveManifest import (
+    ArchiveManifest,
+    ArchiveRecord,
+    archived_files,
+    manifest_path,
+    record_archive,
+    verify_archive,
+)
+from lrutility.archive.ArchiveWriter import EXTENSIONS, StreamSink, open_writer
+from lrutility.archive.checksums import write_checksums
+from lrutility.archive.CompressionPolicy import CompressionPolicy
+from lrutility.archive.packing import (
+    Bin,
+    PackUnit,
+    assign_capture_dates,
+    iter_next_fit,
+    next_fit,
+    pack,
+)
+from lrutility.archive.RollingZipWriter import RollingZipWriter
+from lrutility.archive.SourceCatalog import SourceCatalog
+from lrutility.options import (
+    DEFAULT_MEMORY_BUDGET,
+    ArchiveFormat,
+    CompressionMode,
+    HashAlgorithm,
+    PackingStrategy,
+    SizeMode,
+)
+from lrutility.utils.instrument import stage, timed
 from lrutility.utils.logger import configure_loguru
+from lrutility.utils.walker import FileEntry
 
 
-def group_files(files: list[Path], max_group_size: int) -> list[list[Path]]:
+def group_files(
+    files: list[Path], max_group_size: int, sizes: Mapping[Path, int] | None = None
+) -> list[list[Path]]:
     """Group files into chunks with size <= max_group_size.
 
+    Files are packed one by one in the given order (next-fit). Use
+    lrutility.archive.packing.pack to keep images and sidecars together.
+
     Args:
         files (list[Path]): List of file paths to be grouped.
         max_group_size (int): Maximum size of each chunk in bytes.
+        sizes (Mapping[Path, int] | None): Known file sizes, e.g. from the
+            directory walk. Files not in the mapping are stat'ed.
     """
-    groups = []
-    current_group = []  # type: ignore[var-annotated]
-    current_group_size = 0
+    units = []
     for file in files:
         try:
-            file_size = file.stat().st_size
+            file_size = sizes[file] if sizes and file in sizes else file.stat().st_size
         except OSError:
             logger.error(f"Failed to get file size: {file}")
             continue
+        units.append(PackUnit(files=[file], size=file_size))
+    return [packed.files for packed in next_fit(units, max_group_size)]
+
+
+def write_archive(
+    archive_path: Path,
+    members: list[tuple[Path, str]],
+    progress: Callable[[int], None] | None = None,
+    threads: int = 1,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    compression: CompressionMode = "auto",
+    hash_algorithm: HashAlgorithm | None = None,
+    archive_format: ArchiveFormat = "zip",
+) -> tuple[Path, dict[str, int]]:
+    """Write files into an archive.
+
+    Args:
+        archive_path (Path): Path of the archive to create.
+        members (list[tuple[Path, str]]): Files and their names in the archive.
+        progress (Callable[[int], None] | None): Called with the number of
+            bytes added to the archive.
+        threads (int): Number of threads compressing the members. With 1,
+            members are compressed serially by zipfile.
+        memory_budget (int): Maximum bytes of read and compressed data held
+            in memory when threads > 1.
+        compression (CompressionMode): "auto" stores already-compressed formats
+            (RAW, JPEG, ...) and deflates the rest, "deflate" or "store" use
+            one method for every member.
+        hash_algorithm (HashAlgorithm | None): Hash every member from the same
+            reads as the compressor and write a checksum file next to the archive.
+        archive_format (ArchiveFormat): "zip", or "tar", "tar.gz" and "tar.xz"
+            which compress the whole stream and ignore threads and compression.
 
-        if current_group and current_group_size + file_size > max_group_size:
-            groups.append(current_group)
-            current_group = []
-            current_group_size = 0
-        current_group.append(file)
-        current_group_size += file_size
-    if current_group:
-        groups.append(current_group)
-    return groups
+    Returns:
+        tuple[Path, dict[str, int]]: The archive path and the CRC32 of each member.
+    """
+    policy = CompressionPolicy(compression)
+    with (
+        stage("archive", items=1),
+        archive_path.open("wb") as f,
+        open_writer(
+            archive_format, f, hash_algorithm, policy, threads, memory_budget
+        ) as writer,
+    ):
+        writer.write(members, progress)
+    if hash_algorithm is not None:
+        write_checksums(archive_path, hash_algorithm, writer.digests)
+    return archive_path, writer.crcs
+
+
+def write_archives_parallel(
+    archives: Iterable[tuple[Path, list[tuple[Path, str]], int]],
+    jobs: int,
+    threads: int = 1,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    compression: CompressionMode = "auto",
+    on_created: Callable[[Path, dict[str, int]], None] | None = None,
+    hash_algorithm: HashAlgorithm | None = None,
+    archive_format: ArchiveFormat = "zip",
+) -> None:
+    """Write archives concurrently in a process pool with a combined progress bar.
 
+    Archives are submitted as soon as they are yielded, so writing starts while
+    the source directories are still being walked.
+
+    Args:
+        archives (Iterable[tuple[Path, list[tuple[Path, str]], int]]): Archive
+            paths, their members and total size in bytes.
+        jobs (int): Number of worker processes.
+        threads (int): Number of compression threads per archive.
+        memory_budget (int): Memory budget of each archive in bytes.
+        compression (CompressionMode): Compression method selection.
+        on_created (Callable[[Path, dict[str, int]], None] | None): Called with
+            the path and member CRC32s of each completed archive.
+        hash_algorithm (HashAlgorithm | None): Write a checksum file per archive.
+        archive_format (ArchiveFormat): Format of the archives.
+    """
+    with (
+        Manager() as manager,
+        ProcessPoolExecutor(max_workers=jobs) as pool,
+        tqdm(total=0, unit="B", unit_scale=True, desc="Creating archives") as bar,
+    ):
+        progress = manager.Queue()
+        pending: set[Future] = set()
+        for path, members, size in archives:
+            pending.add(
+                pool.submit(
+                    write_archive,
+                    path,
+                    members,
+                    progress.put,
+                    threads,
+                    memory_budget,
+                    compression,
+                    hash_algorithm,
+                    archive_format,
+                )
+            )
+            bar.total += size
+            pending = _collect(pending, progress, bar, on_created, timeout=0)
+        while pending:
+            pending = _collect(pending, progress, bar, on_created, timeout=0.2)
+        _drain(progress, bar)
+
+
+def _collect(
+    pending: set[Future],
+    progress: "queue.Queue[int]",
+    bar: tqdm,
+    on_created: Callable[[Path, dict[str, int]], None] | None,
+    timeout: float,
+) -> set[Future]:
+    with stage("wait"):
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+    _drain(progress, bar)
+    for future in done:
+        try:
+            archive_path, crcs = future.result()
+        except Exception as e:
+            logger.error(f"Failed to create archive: {e}")
+            continue
+        logger.info(f"Created {archive_path}")
+        if on_created is not None:
+            on_created(archive_path, crcs)
+    return pending
+
+
+def _drain(progress: "queue.Queue[int]", bar: tqdm) -> None:
+    while True:
+        try:
+            bar.update(progress.get_nowait())
+        except queue.Empty:
+            return
 
-def zip_chunker(directory: Path, size_chunk: int, verbose: bool) -> None:
+
+def archive_path(base: Path, index: int, archive_format: ArchiveFormat = "zip") -> Path:
+    """Return the path of the index-th archive named after base."""
+    return base.parent / f"{base.name}_{index}{EXTENSIONS[archive_format]}"
+
+
+def write_archives_rolling(
+    units: Iterable[PackUnit],
+    base: Path,
+    catalog: SourceCatalog,
+    size_chunk: int,
+    threads: int = 1,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    compression: CompressionMode = "auto",
+    group_by_key: bool = False,
+    first_index: int = 1,
+    on_created: Callable[[int, Path], None] | None = None,
+    hash_algorithm: HashAlgorithm | None = None,
+) -> list[Path]:
+    """Write units in order, rolling over when an archive file would exceed
+    size_chunk.
+
+    Archives are budgeted by the bytes actually written (compressed data,
+    headers, central directory and ZIP64 records), so each archive ends up just
+    under size_chunk regardless of how well its members compress.
+
+    Args:
+        units (Iterable[PackUnit]): Units to write, in order.
+        base (Path): Archives are named after this path (see archive_path).
+        catalog (SourceCatalog): Member names of the files.
+        size_chunk (int): Maximum size of each archive file in bytes.
+        threads (int): Number of threads compressing each archive.
+        memory_budget (int): Memory budget in bytes when threads > 1.
+        compression (CompressionMode): Compression method selection.
+        group_by_key (bool): Start a new archive when the unit key changes.
+        first_index (int): Number of the first archive.
+        on_created (Callable[[int, Path], None] | None): Called with the number
+            and path of each completed archive.
+        hash_algorithm (HashAlgorithm | None): Write a checksum file per archive.
+    """
+    with (
+        tqdm(total=0, unit="B", unit_scale=True, desc="Adding files") as bar,
+        RollingZipWriter(
+            lambda i: archive_path(base, i),
+            size_chunk,
+            CompressionPolicy(compression),
+            threads,
+            memory_budget,
+            bar.update,
+            first_index,
+            on_created,
+            hash_algorithm,
+        ) as writer,
+    ):
+        for unit in units:
+            bar.total += unit.size
+            with stage("archive"):
+                writer.add(
+                    catalog.members(unit.files),
+                    unit.size,
+                    unit.key if group_by_key else None,
+                    catalog.sizes(unit.files),
+                )
+    return writer.archives
+
+
+def select_changed(
+    units: Iterable[PackUnit],
+    records: Mapping[int, ArchiveRecord],
+    catalog: SourceCatalog,
+) -> Iterator[PackUnit]:
+    """Yield the units with a file that is new or changed since it was archived.
+
+    Args:
+        units (Iterable[PackUnit]): Units of the source directories.
+        records (Mapping[int, ArchiveRecord]): Archives recorded in the manifest.
+        catalog (SourceCatalog): Member names and stat results of the files.
+    """
+    archived = archived_files(records)
+    selected = 0
+    for unit in units:
+        expected = catalog.expected(unit.files)
+        if any(
+            archived.get(name) != (entry.size, entry.mtime_ns)
+            for name, entry in expected.items()
+        ):
+            selected += 1
+            yield unit
+    logger.info(f"Found {selected} new or changed units since the last run")
+
+
+def is_completed(
+    index: int,
+    path: Path,
+    expected: Mapping[str, FileEntry],
+    manifest: ArchiveManifest,
+    records: Mapping[int, ArchiveRecord],
+) -> bool:
+    """Return whether a planned archive was already written by a previous run.
+
+    An archive is complete when the manifest records it with the same files,
+    sizes and modification times and the archive file is unchanged. An archive
+    left without a record (e.g. interrupted before the manifest was updated) is
+    verified and recorded if complete.
+
+    Args:
+        index (int): Number of the archive.
+        path (Path): Path of the archive.
+        expected (Mapping[str, FileEntry]): Planned members of the archive.
+        manifest (ArchiveManifest): Manifest of the archives.
+        records (Mapping[int, ArchiveRecord]): Archives recorded in the manifest.
+    """
+    record = records.get(index)
+    if record is not None and record.matches(path, expected):
+        logger.debug(f"Skipping completed archive {path}")
+        return True
+    if record is None and path.exists() and verify_archive(path, expected):
+        logger.info(f"Verified existing archive {path}")
+        manifest.append(record_archive(path, index, expected))
+        return True
+    return False
+
+
+def write_archives(
+    archives: Iterable[tuple[int, Path, list[tuple[Path, str]], int]],
+    jobs: int = 1,
+    threads: int = 1,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    compression: CompressionMode = "auto",
+    on_created: Callable[[int, Path, dict[str, int]], None] | None = None,
+    hash_algorithm: HashAlgorithm | None = None,
+    archive_format: ArchiveFormat = "zip",
+) -> None:
+    """Write numbered archives, in a process pool when jobs > 1.
+
+    Args:
+        archives (Iterable[tuple[int, Path, list[tuple[Path, str]], int]]):
+            Archive numbers, paths, members and total size in bytes.
+        jobs (int): Number of worker processes (0: CPU count).
+        threads (int): Number of compression threads per archive.
+        memory_budget (int): Memory budget of each archive in bytes.
+        compression (CompressionMode): Compression method selection.
+        on_created (Callable[[int, Path, dict[str, int]], None] | None): Called
+            with the number, path and member CRC32s of each completed archive.
+        hash_algorithm (HashAlgorithm | None): Write a checksum file per archive.
+        archive_format (ArchiveFormat): Format of the archives.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1:
+        indices: dict[Path, int] = {}
+
+        def submitted() -> Iterator[tuple[Path, list[tuple[Path, str]], int]]:
+            for index, path, members, size in archives:
+                indices[path] = index
+                yield path, members, size
+
+        write_archives_parallel(
+            submitted(),
+            jobs,
+            threads,
+            memory_budget,
+            compression,
+            on_created=None
+            if on_created is None
+            else lambda path, crcs: on_created(indices[path], path, crcs),
+            hash_algorithm=hash_algorithm,
+            archive_format=archive_format,
+        )
+        return
+
+    for index, path, members, size in archives:
+        with tqdm(
+            total=size, unit="B", unit_scale=True, desc=f"Adding files to {path}"
+        ) as bar:
+            _, crcs = write_archive(
+                path,
+                members,
+                bar.update,
+                threads,
+                memory_budget,
+                compression,
+                hash_algorithm,
+                archive_format,
+            )
+        logger.info(f"Created {path}")
+        if on_created is not None:
+            on_created(index, path, crcs)
+
+
+def pack_streaming(
+    units: Iterable[PackUnit],
+    size_chunk: int,
+    strategy: PackingStrategy = "next-fit",
+    group_by_date: bool = False,
+) -> Iterable[Bin]:
+    """Pack units into archives, yielding them while units are still arriving
+    when the strategy allows it.
+
+    Next-fit closes an archive as soon as a unit does not fit, so archives are
+    yielded during the walk. Other strategies and grouping by capture date need
+    every unit first.
+
+    Args:
+        units (Iterable[PackUnit]): Units to pack, in order.
+        size_chunk (int): Maximum size of each archive in bytes.
+        strategy (PackingStrategy): Packing strategy.
+        group_by_date (bool): Do not mix capture dates in one archive.
+    """
+    if strategy == "next-fit" and not group_by_date:
+        return iter_next_fit(units, size_chunk)
+    units = list(units)
+    if group_by_date:
+        assign_capture_dates(units)
+    return pack(units, size_chunk, strategy, group_by_key=group_by_date)
+
+
+def plan_archives(
+    bins: Iterable[Bin],
+    base: Path,
+    catalog: SourceCatalog,
+    manifest: ArchiveManifest,
+    records: Mapping[int, ArchiveRecord],
+    first_index: int = 1,
+    archive_format: ArchiveFormat = "zip",
+) -> Iterator[tuple[int, Path, list[tuple[Path, str]], int]]:
+    """Number the packed archives and yield those not completed by a previous run.
+
+    Args:
+        bins (Iterable[Bin]): Packed units of each archive.
+        base (Path): Archives are named after this path (see archive_path).
+        catalog (SourceCatalog): Member names and stat results of the files.
+        manifest (ArchiveManifest): Manifest of the archives.
+        records (Mapping[int, ArchiveRecord]): Archives recorded in the manifest.
+        first_index (int): Number of the first archive.
+        archive_format (ArchiveFormat): Format of the archives.
+    """
+    skipped = 0
+    for index, packed in enumerate(bins, start=first_index):
+        path = archive_path(base, index, archive_format)
+        files = packed.files
+        if is_completed(index, path, catalog.expected(files), manifest, records):
+            skipped += 1
+            continue
+        yield index, path, catalog.members(files), packed.size
+    if skipped:
+        logger.info(f"Resuming: {skipped} archives already done")
+
+
+def write_to_sink(
+    bins: Iterable[Bin],
+    base: Path,
+    catalog: SourceCatalog,
+    sink: str,
+    threads: int = 1,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    compression: CompressionMode = "auto",
+    archive_format: ArchiveFormat = "zip",
+) -> None:
+    """Stream archives one after another to stdout, a pipe or files without seeking.
+
+    Zip members are written with data descriptors, so every archive can be read
+    on its own even when several are written back to back into one stream.
+
+    Args:
+        bins (Iterable[Bin]): Packed units of each archive.
+        base (Path): Archives are named after this path (see archive_path).
+        catalog (SourceCatalog): Member names of the files.
+        sink (str): "-" writes every archive to stdout, a path containing
+            "{name}" opens one file per archive (e.g. "/mnt/tape/{name}") and any
+            other path (e.g. a named pipe) receives every archive in turn.
+        threads (int): Number of threads compressing each zip archive.
+        memory_budget (int): Memory budget in bytes when threads > 1.
+        compression (CompressionMode): Compression method selection.
+        archive_format (ArchiveFormat): Format of the archives.
+    """
+    policy = CompressionPolicy(compression)
+    with ExitStack() as stack:
+        shared = None
+        if sink == "-":
+            shared = sys.stdout.buffer
+        elif "{name}" not in sink:
+            shared = stack.enter_context(Path(sink).open("wb"))
+        for index, packed in enumerate(bins, start=1):
+            name = archive_path(base, index, archive_format).name
+            target = sink.replace("{name}", name)
+            with (
+                ExitStack() as archive_stack,
+                tqdm(
+                    total=packed.size,
+                    unit="B",
+                    unit_scale=True,
+                    desc=f"Streaming {name}",
+                ) as bar,
+            ):
+                f = shared or archive_stack.enter_context(Path(target).open("wb"))
+                with open_writer(
+                    archive_format, StreamSink(f), None, policy, threads, memory_budget
+                ) as writer:
+                    with stage("archive", items=1):
+                        writer.write(catalog.members(packed.files), bar.update)
+                f.flush()
+            logger.info(f"Streamed {name} to {target}")
+
+
+def check_options(
+    size_mode: SizeMode,
+    hash_algorithm: HashAlgorithm | None,
+    archive_format: ArchiveFormat,
+    sink: str | None,
+) -> str | None:
+    """Return an error message when the options cannot be combined."""
+    if size_mode == "written" and archive_format != "zip":
+        return "--size-mode written is only supported with --format zip"
+    if sink is not None and size_mode == "written":
+        return "--size-mode written cannot be used with --sink"
+    if sink is not None and hash_algorithm is not None:
+        return "--hash cannot be used with --sink (no checksum file is written)"
+    return None
+
+
+def open_catalog(directories: list[Path], recursive: bool) -> SourceCatalog | None:
+    """Return the catalog of the source directories, or None after logging why
+    they cannot be archived."""
+    for directory in directories:
+        if not directory.is_dir():
+            logger.error(f"{directory} is not a valid directory")
+            return None
+    try:
+        return SourceCatalog(directories, recursive=recursive)
+    except ValueError as e:
+        logger.error(str(e))
+        return None
+
+
+def zip_chunker(
+    directories: list[Path],
+    size_chunk: int,
+    verbose: bool,
+    jobs: int = 1,
+    threads: int = 1,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    compression: CompressionMode = "auto",
+    strategy: PackingStrategy = "next-fit",
+    group_by_date: bool = False,
+    size_mode: SizeMode = "uncompressed",
+    incremental: bool = False,
+    hash_algorithm: HashAlgorithm | None = None,
+    recursive: bool = False,
+    output: Path | None = None,
+    archive_format: ArchiveFormat = "zip",
+    sink: str | None = None,
+) -> None:
     configure_loguru(verbose=verbose)
 
-    if not directory.is_dir():
-        logger.error(f"{directory} is not a valid directory")
+    if error := check_options(size_mode, hash_algorithm, archive_format, sink):
+        logger.error(error)
         return
 
-    files = [f for f in directory.iterdir() if f.is_file()]
-    files.sort()
-    if not files:
-        logger.error(f"No files found in {directory}")
+    catalog = open_catalog(directories, recursive)
+    if catalog is None:
+        return
+    # Archives and the manifest are named <output>_1.zip etc. (default: first directory)
+    base = output or directories[0]
+    threads = threads or os.cpu_count() or 1
+    # Streaming and splitting by written size create the archives sequentially
+    if jobs != 1 and (sink is not None or size_mode == "written"):
+        logger.warning("--jobs is ignored with --sink and --size-mode written")
+    if sink is not None:
+        # The output cannot be read back, so resuming from the manifest is not possible
+        units = timed("walk", catalog.units())
+        bins = pack_streaming(units, size_chunk, strategy, group_by_date)
+        write_to_sink(
+            bins,
+            base,
+            catalog,
+            sink,
+            threads,
+            memory_budget,
+            compression,
+            archive_format,
+        )
+        if not catalog.entries:
+            logger.error(f"No files found in {', '.join(map(str, directories))}")
         return
+    manifest = ArchiveManifest(manifest_path(base))
+    records = manifest.load()
 
-    groups: list[list[Path]] = group_files(files, size_chunk)
+    def on_created(index: int, path: Path, crcs: dict[str, int] | None = None) -> None:
+        with stage("manifest", items=1):
+            manifest.append(record_archive(path, index, catalog.entries, crcs))
 
-    for i, group in enumerate(groups, start=1):
-        archive_path = directory.parent / f"{directory.name}_{i}.zip"
-        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for file_path in tqdm(group, desc=f"Adding files to {archive_path}"):
-                arcname = str(file_path.relative_to(directory))
-                zf.write(str(file_path), arcname=arcname)
-        logger.info(f"Created {archive_path}")
+    # Keep images and their sidecars in the same archive (grouped while scanning)
+    units: Iterable[PackUnit] = timed("walk", catalog.units())
+    first_index = 1
+    # Split points by written size cannot be reproduced, so only append new files
+    if records and (incremental or size_mode == "written"):
+        units = select_changed(units, records, catalog)
+        first_index = max(records) + 1
+    bins = pack_streaming(units, size_chunk, strategy, group_by_date)
+
+    if size_mode == "written":
+        write_archives_rolling(
+            (unit for packed in bins for unit in packed.units),
+            base,
+            catalog,
+            size_chunk,
+            threads,
+            memory_budget,
+            compression,
+            group_by_date,
+            first_index,
+            on_created,
+            hash_algorithm,
+        )
+    else:
+        write_archives(
+            plan_archives(
+                bins, base, catalog, manifest, records, first_index, archive_format
+            ),
+            jobs,
+            threads,
+            memory_budget,
+            compression,
+            on_created,
+            hash_algorithm,
+            archive_format,
+        )
+    if not catalog.entries:
+        logger.error(f"No files found in {', '.join(map(str, directories))}")
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from loguru import logger
+
+from lrutility.archive.checksums import find_checksums, verify_archives
+from lrutility.options import DEFAULT_VERIFY_WORKERS
+from lrutility.utils.logger import configure_loguru
+
+
+def find_archives(paths: list[Path]) -> list[Path]:
+    """指定されたアーカイブと、ディレクトリ内のチェックサムファイルを持つアーカイブを返す。"""
+    archives = []
+    for path in paths:
+        if path.is_dir():
+            archives.extend(
+                archive
+                for archive in sorted(path.glob("*.zip"))
+                if find_checksums(archive) is not None
+            )
+        else:
+            archives.append(path)
+    return archives
+
+
+def zip_verify(paths: list[Path], workers: int, verbose: bool) -> bool:
+    configure_loguru(verbose=verbose)
+
+    archives = find_archives(paths)
+    if not archives:
+        logger.error("No archives with checksum files found")
+        return False
+    try:
+        results = verify_archives(archives, workers or DEFAULT_VERIFY_WORKERS)
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        return False
+
+    for result in results:
+        for name, reason in result.mismatched.items():
+            logger.error(f"{result.archive}: {name} failed ({reason})")
+        for name in result.missing:
+            logger.error(f"{result.archive}: {name} is missing from the archive")
+        for name in result.unlisted:
+            logger.error(f"{result.archive}: {name} is not in the checksum file")
+        if result.ok:
+            logger.debug(f"{result.archive}: {result.verified} files OK")
+    failed = [result for result in results if not result.ok]
+    logger.info(
+        f"Verified {len(results)} archives: {len(results) - len(failed)} OK, "
+        f"{len(failed)} failed"
+    )
+    return not failed
@@ -0,0 +1,266 @@
+import os
+import time
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+
+from loguru import logger
+
+from lrutility.deletion.DeletionJournal import (
+    TRASH_DIR_NAME,
+    DeletionJournal,
+    DeletionMode,
+    JournalState,
+    new_run_id,
+)
+from lrutility.index.MetadataIndex import INDEX_DIR_NAME
+from lrutility.utils.instrument import stage
+from lrutility.utils.logger import log_outcome
+
+# 削除を並列に行うスレッド数の既定値（ネットワークストレージの待ち時間を隠すため）
+DEFAULT_WORKERS = 8
+
+# 1つのタスクでまとめて削除するグループ数
+BATCH_SIZE = 64
+
+# サマリーに表示する失敗の件数
+MAX_REPORTED_FAILURES = 10
+
+
+def trash_dir(root: Path, run_id: str) -> Path:
+    """実行IDに対応するゴミ箱ディレクトリを返す。"""
+    return root / INDEX_DIR_NAME / TRASH_DIR_NAME / run_id
+
+
+@dataclass
+class DeletionSummary:
+    """削除処理の結果。"""
+
+    files: int = 0  # 削除（または移動）したファイル数
+    bytes: int = 0  # 削除したファイルの合計サイズ（submitでサイズを渡したもの）
+    failed: list[tuple[Path, Exception]] = field(default_factory=list)
+    completed: list[Sequence[Path]] = field(default_factory=list)  # 完了したグループ
+    elapsed: float = 0.0  # 経過時間（秒）
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed > 0 else 0.0
+
+    def log(self, dry_run: bool = False) -> None:
+        """結果をログに出力する。"""
+        action = "Would delete" if dry_run else "Deleted"
+        logger.info(
+            f"{action} {self.files} files ({self.bytes / 1024**2:.1f} MiB) "
+            f"in {self.elapsed:.2f}s ({self.files_per_second:.1f} files/s), "
+            f"{len(self.failed)} failed"
+        )
+        for path, error in self.failed[:MAX_REPORTED_FAILURES]:
+            logger.error(f"Failed to delete: {path} ({error})")
+        if len(self.failed) > MAX_REPORTED_FAILURES:
+            logger.error(f"... and {len(self.failed) - MAX_REPORTED_FAILURES} more")
+
+
+class Deleter:
+    """ファイルのグループをスレッドプールでまとめて削除する。
+
+    submitで渡されたグループはBATCH_SIZE件ごとにスレッドプールで処理され、
+    グループ内のファイルは先頭から順に削除されます（XMPファイルを最後に置くことで、
+    途中で失敗したグループも再実行の対象となります）。
+    mode="trash"の場合は削除せずに`<root>/.lrutility/trash/<run_id>`に
+    renameで移動し、journalを指定した場合は予定と結果を記録します。
+
+    Examples:
+        >>> journal = DeletionJournal(root, new_run_id())
+        >>> with Deleter(root, mode="trash", journal=journal) as deleter:
+        ...     deleter.submit([raw_path, xmp_path], [raw_size, xmp_size])
+        >>> deleter.summary.log()
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        mode: DeletionMode = "unlink",
+        journal: DeletionJournal | None = None,
+        workers: int = DEFAULT_WORKERS,
+        dry_run: bool = False,
+    ) -> None:
+        """
+        Args:
+            root: ライブラリのルートディレクトリ（削除対象はこの配下のファイル）
+            mode: "unlink"は削除、"trash"はゴミ箱ディレクトリへの移動
+            journal: 予定と結果を記録するジャーナル。Noneの場合は記録しない。
+            workers: 削除を行うスレッド数
+            dry_run: Trueの場合、削除せずに対象のみを集計する
+        """
+        self.root = root
+        self.mode = mode
+        self.journal = journal
+        self.workers = max(1, workers)
+        self.dry_run = dry_run
+        run_id = journal.run_id if journal is not None else new_run_id()
+        self.trash_dir = trash_dir(root, run_id)
+        self.summary = DeletionSummary()
+        self._batch: list[tuple[Sequence[Path], Sequence[int]]] = []
+        self._pending: deque[Future] = deque()
+        self._pool: ThreadPoolExecutor | None = None
+        self._started = 0.0
+        self._journal_open = False
+
+    def __enter__(self) -> "Deleter":
+        self._started = time.perf_counter()
+        if not self.dry_run:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        try:
+            self._dispatch()
+            while self._pending:
+                self._collect(self._pending.popleft())
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            if self.journal is not None:
+                self.journal.close()
+            self.summary.elapsed = time.perf_counter() - self._started
+
+    def submit(self, group: Sequence[Path], sizes: Sequence[int] | None = None) -> None:
+        """ファイルのグループを削除の対象に加える。
+
+        Args:
+            group: 削除するファイルのパス（先頭から順に削除する）
+            sizes: 各ファイルのサイズ（groupの順。走査時のFileEntry等）。
+                合計の集計にのみ使用し、Noneの場合は集計しない。削除時に
+                statしないため、ネットワークストレージでも往復が増えない。
+        """
+        sizes = sizes if sizes is not None else [0] * len(group)
+        if self.dry_run:
+            for path, size in zip(group, sizes, strict=True):
+                log_outcome("deleted", "DEBUG", "[DRY RUN]: Deleted: {}", path)
+                self.summary.files += 1
+                self.summary.bytes += size
+            self.summary.completed.append(group)
+            return
+        if self.journal is not None:
+            if not self._journal_open:
+                # 削除対象がない場合はジャーナルファイルを作成しない
+                self.journal.open(self.mode)
+                self._journal_open = True
+            self.journal.planned(group)
+        self._batch.append((group, sizes))
+        if len(self._batch) >= BATCH_SIZE:
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        if not self._batch or self._pool is None:
+            return
+        if self.journal is not None:
+            # 予定をファイルに反映してから削除を開始する
+            self.journal.flush()
+        self._pending.append(self._pool.submit(self._delete_batch, self._batch))
+        self._batch = []
+        # 未完了のバッチ数を制限し、結果を順次回収する
+        while len(self._pending) > 2 * self.workers:
+            self._collect(self._pending.popleft())
+
+    def _collect(self, future: Future) -> None:
+        files, size, failed, completed = future.result()
+        self.summary.files += files
+        self.summary.bytes += size
+        self.summary.failed.extend(failed)
+        self.summary.completed.extend(completed)
+
+    def _delete_batch(
+        self, batch: list[tuple[Sequence[Path], Sequence[int]]]
+    ) -> tuple[int, int, list[tuple[Path, Exception]], list[Sequence[Path]]]:
+        files = total = 0
+        failed: list[tuple[Path, Exception]] = []
+        completed: list[Sequence[Path]] = []
+        for group, sizes in batch:
+            for path, size in zip(group, sizes, strict=True):
+                try:
+                    if self._delete(path, size):
+                        total += size
+                except OSError as e:
+                    failed.append((path, e))
+                    if self.journal is not None:
+                        self.journal.failed(path, e)
+                    break
+                files += 1
+            else:
+                completed.append(group)
+        if self.journal is not None:
+            self.journal.flush()
+        return files, total, failed, completed
+
+    def _delete(self, path: Path, size: int) -> bool:
+        """ファイルを削除またはゴミ箱に移動する。
+
+        Returns:
+            削除した場合True、既に削除済みの場合False
+        """
+        trash = None
+        deleted = True
+        if self.mode == "trash":
+            trash = self.trash_dir / path.relative_to(self.root)
+        try:
+            with stage("unlink", items=1, nbytes=size):
+                if trash is not None:
+                    trash.parent.mkdir(parents=True, exist_ok=True)
+                    os.rename(path, trash)
+                else:
+                    path.unlink()
+        except FileNotFoundError:
+            # 再開時など、既に削除済みのファイルは完了として扱う
+            deleted = False
+            if trash is not None and not trash.exists():
+                trash = None
+        log_outcome("deleted", "DEBUG", "Deleted: {}", path)
+        if self.journal is not None:
+            self.journal.done(path, trash)
+        return deleted
+
+
+def restore(
+    root: Path, state: JournalState, journal: DeletionJournal
+) -> DeletionSummary:
+    """ゴミ箱に移動したファイルを新しい順に元の場所に戻す。
+
+    Args:
+        root: ライブラリのルートディレクトリ
+        state: ジャーナルを読み込んだ結果
+        journal: 元に戻したファイルを記録するジャーナル
+
+    Returns:
+        元に戻したファイル数と失敗を記録したDeletionSummary
+    """
+    summary = DeletionSummary()
+    started = time.perf_counter()
+    journal.open(state.mode)
+    try:
+        for relative, trash_relative in state.trashed():
+            path, trash = root / relative, root / trash_relative
+            try:
+                if path.exists():
+                    raise FileExistsError(f"File already exists: {path}")
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.rename(trash, path)
+            except OSError as e:
+                summary.failed.append((path, e))
+                continue
+            journal.restored(path)
+            summary.files += 1
+            summary.completed.append([path])
+    finally:
+        journal.close()
+    summary.elapsed = time.perf_counter() - started
+    return summary
@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Literal
+
+from lrutility.index.MetadataIndex import INDEX_DIR_NAME
+
+JOURNAL_DIR_NAME = "journal"
+TRASH_DIR_NAME = "trash"
+
+DeletionMode = Literal["unlink", "trash"]
+
+
+def journal_dir(root: Path) -> Path:
+    """ライブラリの削除ジャーナルを保存するディレクトリを返す。"""
+    return root / INDEX_DIR_NAME / JOURNAL_DIR_NAME
+
+
+def new_run_id() -> str:
+    """削除の実行を識別するIDを返す（例: "20250810-180000-1234"）。"""
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+
+
+@dataclass
+class JournalState:
+    """ジャーナルを読み込んだ結果。
+
+    Attributes:
+        run_id: 実行ID
+        mode: 削除方法（"unlink"は削除、"trash"はゴミ箱ディレクトリへの移動）
+        planned: 削除を予定したファイルのグループ（ルートからの相対パス）
+        done: 削除済みのファイルと移動先（unlinkの場合はNone）。完了順。
+        failed: 削除に失敗したファイルとエラーメッセージ
+        restored: ロールバックで元に戻したファイル
+    """
+
+    run_id: str
+    mode: DeletionMode
+    planned: list[list[str]] = field(default_factory=list)
+    done: dict[str, str | None] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+    restored: set[str] = field(default_factory=set)
+
+    def apply(self, record: dict[str, Any]) -> None:
+        """ジャーナルの1レコードを反映する。"""
+        if record["type"] == "planned":
+            self.planned.append(record["group"])
+        elif record["type"] == "done":
+            self.done[record["path"]] = record["trash"]
+            self.failed.pop(record["path"], None)
+        elif record["type"] == "failed":
+            self.failed[record["path"]] = record["error"]
+        elif record["type"] == "restored":
+            self.restored.add(record["path"])
+
+    def pending(self) -> list[list[str]]:
+        """まだ削除されていないファイルのグループを返す。"""
+        groups = []
+        for group in self.planned:
+            remaining = [path for path in group if path not in self.done]
+            if remaining:
+                groups.append(remaining)
+        return groups
+
+    def trashed(self) -> list[tuple[str, str]]:
+        """ゴミ箱に移動され、まだ元に戻していないファイルを新しい順に返す。"""
+        return [
+            (path, trash)
+            for path, trash in reversed(self.done.items())
+            if trash is not None and path not in self.restored
+        ]
+
+
+class DeletionJournal:
+    """削除の予定と結果を追記していくジャーナルファイル。
+
+    `<root>/.lrutility/journal/<run_id>.jsonl`に1行1レコードのJSONで記録します。
+    削除前にグループ単位で予定（planned）を書き込み、各ファイルの完了（done）・
+    失敗（failed）を追記するため、中断した実行の再開やロールバックに使用できます。
+    パスはルートからの相対パスで記録します。
+    """
+
+    def __init__(self, root: Path, run_id: str) -> None:
+        """
+        Args:
+            root: ライブラリのルートディレクトリ
+            run_id: 実行ID
+        """
+        self.root = root
+        self.run_id = run_id
+        self.path = journal_dir(root) / f"{run_id}.jsonl"
+        self._file: Any = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "DeletionJournal":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def open(self, mode: DeletionMode) -> None:
+        """ジャーナルファイルを追記モードで開く（新規の場合は実行情報を書き込む）。"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        exists = self.path.exists()
+        self._file = self.path.open("a", encoding="utf-8")
+        if not exists:
+            self._write({"type": "run", "id": self.run_id, "mode": mode})
+            self.flush()
+
+    def close(self) -> None:
+        """ジャーナルファイルを閉じる。"""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def flush(self) -> None:
+        """書き込んだレコードをファイルに反映する。"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def relative(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def planned(self, group: Sequence[Path]) -> None:
+        """削除を予定したファイルのグループを記録する。"""
+        self._write({"type": "planned", "group": [self.relative(p) for p in group]})
+
+    def done(self, path: Path, trash: Path | None) -> None:
+        """ファイルの削除（またはゴミ箱への移動）の完了を記録する。"""
+        record = {"type": "done", "path": self.relative(path)}
+        record["trash"] = None if trash is None else self.relative(trash)
+        self._write(record)
+
+    def failed(self, path: Path, error: Exception) -> None:
+        """ファイルの削除の失敗を記録する。"""
+        self._write(
+            {"type": "failed", "path": self.relative(path), "error": str(error)}
+        )
+
+    def restored(self, path: Path) -> None:
+        """ゴミ箱から元に戻したファイルを記録する。"""
+        self._write({"type": "restored", "path": self.relative(path)})
+
+    def _write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def load(self) -> JournalState:
+        """ジャーナルファイルを読み込む。
+
+        Raises:
+            FileNotFoundError: ジャーナルファイルが存在しない場合
+            ValueError: ジャーナルファイルの形式が不正な場合
+        """
+        if not self.path.exists():
+            raise FileNotFoundError(f"Journal not found: {self.path}")
+        state: JournalState | None = None
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 中断時に書きかけとなった最終行は無視する
+                    continue
+                if record["type"] == "run":
+                    state = JournalState(run_id=record["id"], mode=record["mode"])
+                elif state is None:
+                    raise ValueError(f"Invalid journal: {self.path}")
+                else:
+                    state.apply(record)
+        if state is None:
+            raise ValueError(f"Invalid journal: {self.path}")
+        return state
+
+
+def list_journals(root: Path) -> list[Path]:
+    """ライブラリのジャーナルファイルを古い順に返す。"""
+    directory = journal_dir(root)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob("*.jsonl"))
@@ -0,0 +1,364 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+
+from loguru import logger
+
+from lrutility.index.MetadataIndex import MetadataIndex, RefreshStats
+from lrutility.index.SidecarIndex import SIDECAR_SUFFIX
+from lrutility.options import WatchMode
+from lrutility.utils.inotify import (
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_DELETE,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+    Inotify,
+)
+from lrutility.utils.walker import EXCLUDED_DIRS, walk_directories, walk_files
+from lrutility.xmp.XMPParser import XMPParser
+
+# 最後の変更から、この秒数だけ変更がなければインデックスを更新する
+DEFAULT_DEBOUNCE = 2.0
+
+# 変更が続く場合も、最初の変更からこの秒数が経過したらインデックスを更新する
+DEFAULT_MAX_DELAY = 30.0
+
+# ポーリングでライブラリを走査する間隔（秒）
+DEFAULT_POLL_INTERVAL = 5.0
+
+# 変更を待つ1回の最大の秒数（停止の確認の間隔）
+WAIT_INTERVAL = 1.0
+
+# 監視するイベント（書き込みの完了・移動・作成・削除）
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+)
+
+
+def _is_sidecar(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() == SIDECAR_SUFFIX
+
+
+@dataclass
+class Changes:
+    """検出したXMPファイルの変更。"""
+
+    paths: set[Path] = field(default_factory=set)  # 作成・変更・削除されたファイル
+    rescan: bool = False  # 個々のファイルを特定できず、全体の再走査が必要
+
+    def __bool__(self) -> bool:
+        return bool(self.paths) or self.rescan
+
+
+class WatchSource(ABC):
+    """XMPファイルの変更の検出方法の基底クラス。"""
+
+    def __enter__(self) -> "WatchSource":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @abstractmethod
+    def read(self, timeout: float) -> Changes:
+        """最大timeout秒待ち、その間に検出した変更を返す。"""
+
+    def close(self) -> None:
+        pass
+
+
+class InotifySource(WatchSource):
+    """inotifyでルート配下の全ディレクトリを監視する（Linuxのみ）。"""
+
+    def __init__(self, root: Path) -> None:
+        """
+        Raises:
+            OSError: inotifyを使用できない、またはルートの監視を追加できない場合
+        """
+        self.root = root
+        self.inotify = Inotify()
+        self.directories: dict[int, Path] = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.inotify.close()
+            raise
+
+    def _watch_tree(self, directory: Path) -> set[Path]:
+        """directory以下の全ディレクトリに監視を追加し、既存のXMPファイルを返す。
+
+        ルート以外のディレクトリの監視を追加できない場合（作成直後の削除等）は
+        そのディレクトリを監視せずに続ける。
+        """
+        paths: set[Path] = set()
+        for subdir, entries in walk_directories(directory, [SIDECAR_SUFFIX], workers=1):
+            try:
+                self.directories[self.inotify.add_watch(subdir, WATCH_MASK)] = subdir
+            except OSError as e:
+                if subdir == self.root:
+                    raise
+                logger.warning(f"Failed to watch directory: {subdir} ({e})")
+            paths.update(entry.path for entry in entries)
+        return paths
+
+    def _unwatch_tree(self, directory: Path) -> None:
+        """移動したdirectory以下の監視を解除する。"""
+        for wd, path in list(self.directories.items()):
+            if path == directory or directory in path.parents:
+                self.inotify.rm_watch(wd)
+                del self.directories[wd]
+
+    def read(self, timeout: float) -> Changes:
+        changes = Changes()
+        for event in self.inotify.read(timeout):
+            if event.mask & IN_Q_OVERFLOW:
+                logger.warning("inotify event queue overflowed, rescanning")
+                changes.rescan = True
+                continue
+            if event.mask & IN_IGNORED:
+                self.directories.pop(event.wd, None)
+                continue
+            directory = self.directories.get(event.wd)
+            if directory is None or not event.name:
+                continue
+            path = directory / event.name
+            if not event.mask & IN_ISDIR:
+                if _is_sidecar(event.name):
+                    changes.paths.add(path)
+                continue
+            if event.name in EXCLUDED_DIRS:
+                continue
+            if event.mask & (IN_CREATE | IN_MOVED_TO):
+                # 作成・移動されたディレクトリ内のファイルにはイベントが届かない
+                changes.paths.update(self._watch_tree(path))
+            elif event.mask & IN_MOVED_FROM:
+                # 移動前のファイルは列挙できないため、再走査してインデックスから除く
+                self._unwatch_tree(path)
+                changes.rescan = True
+        return changes
+
+    def close(self) -> None:
+        self.inotify.close()
+
+
+class PollingSource(WatchSource):
+    """ルート配下を一定間隔で走査し、(st_mtime_ns, st_size)の変化を検出する。
+
+    inotifyを使用できない環境（macOS・Windows・ネットワークストレージ等）向け。
+    """
+
+    def __init__(self, root: Path, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._scan()
+        self.next_scan = time.monotonic() + interval
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        return {
+            entry.path: (entry.mtime_ns, entry.size)
+            for entry in walk_files(self.root, suffixes=[SIDECAR_SUFFIX])
+        }
+
+    def read(self, timeout: float) -> Changes:
+        remaining = self.next_scan - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            return Changes()
+        time.sleep(max(remaining, 0.0))
+        snapshot = self._scan()
+        self.next_scan = time.monotonic() + self.interval
+        changed = {
+            path for path, state in snapshot.items() if self.snapshot.get(path) != state
+        }
+        changed.update(self.snapshot.keys() - snapshot.keys())
+        self.snapshot = snapshot
+        return Changes(changed)
+
+
+def open_source(
+    root: Path, mode: WatchMode = "auto", interval: float = DEFAULT_POLL_INTERVAL
+) -> WatchSource:
+    """変更の検出方法に対応するWatchSourceを返す。
+
+    Args:
+        root: ライブラリのルートディレクトリ
+        mode: "inotify"はinotify、"poll"はポーリング、"auto"はinotifyを使用できない
+            場合（Linux以外、監視数の上限等）にポーリングを使用する
+        interval: ポーリングの間隔（秒）
+
+    Raises:
+        OSError: modeが"inotify"で、inotifyを使用できない場合
+    """
+    if mode == "poll":
+        return PollingSource(root, interval)
+    try:
+        return InotifySource(root)
+    except OSError as e:
+        if mode == "inotify":
+            raise
+        logger.warning(f"inotify is not available ({e}), polling every {interval}s")
+        return PollingSource(root, interval)
+
+
+class Debouncer:
+    """短時間に続く変更をまとめ、変更が落ち着いてから返す。
+
+    Lightroomは1回の操作で同じXMPファイルを続けて書き換えるため、変更のたびに
+    パースせず、最後の変更からquiet秒経過した時点でまとめて返します。変更が
+    続く場合も、最初の変更からmax_delay秒経過した時点で返します。
+    """
+
+    def __init__(
+        self, quiet: float = DEFAULT_DEBOUNCE, max_delay: float = DEFAULT_MAX_DELAY
+    ) -> None:
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.pending = Changes()
+        self.first = 0.0
+        self.last = 0.0
+
+    def add(self, changes: Changes, now: float) -> None:
+        if not changes:
+            return
+        if not self.pending:
+            self.first = now
+        self.last = now
+        self.pending.paths |= changes.paths
+        self.pending.rescan |= changes.rescan
+
+    def timeout(self, now: float) -> float | None:
+        """まとめた変更を返せるまでの秒数（変更がない場合はNone）。"""
+        if not self.pending:
+            return None
+        due = min(self.last + self.quiet, self.first + self.max_delay)
+        return max(due - now, 0.0)
+
+    def take(self, now: float) -> Changes | None:
+        """返せる状態であれば、まとめた変更を返して空にする。"""
+        timeout = self.timeout(now)
+        if timeout is None or timeout > 0:
+            return None
+        return self.flush()
+
+    def flush(self) -> Changes:
+        """まとめた変更を待たずに返して空にする。"""
+        changes, self.pending = self.pending, Changes()
+        return changes
+
+
+class IndexWatcher:
+    """XMPファイルの変更を監視し、メタデータインデックスを最新の状態に保つ。
+
+    変更されたXMPファイルのみをパースしてインデックスを更新するため、
+    `lru cull --index`等はライブラリ全体をパースせずに実行できます。
+
+    Examples:
+        >>> with MetadataIndex(root) as index, open_source(root) as source:
+        ...     watcher = IndexWatcher(index, source, XMPParser())
+        ...     watcher.sync()
+        ...     watcher.run()
+    """
+
+    def __init__(
+        self,
+        index: MetadataIndex,
+        source: WatchSource,
+        parser: XMPParser,
+        workers: int = 1,
+        debounce: float = DEFAULT_DEBOUNCE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        """
+        Args:
+            index: 更新するメタデータインデックス
+            source: 変更の検出方法
+            parser: 変更されたファイルのパースに使用するパーサー
+            workers: parse_manyのワーカー数
+            debounce: 最後の変更からインデックスを更新するまでの秒数
+            max_delay: 変更が続く場合に、最初の変更から更新するまでの最大の秒数
+        """
+        self.index = index
+        self.source = source
+        self.parser = parser
+        self.workers = workers
+        self.debouncer = Debouncer(debounce, max_delay)
+
+    def sync(self) -> RefreshStats:
+        """ライブラリ全体を走査し、変更・削除されたファイルをインデックスに反映する。"""
+        entries = walk_files(self.index.root, suffixes=[SIDECAR_SUFFIX])
+        for path, result in self.index.refresh(entries, self.parser, self.workers):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to parse xmp: {path} ({result})")
+        return self.index.last_refresh
+
+    def apply(self, changes: Changes) -> RefreshStats:
+        """検出した変更をインデックスに反映する。"""
+        if changes.rescan:
+            return self.sync()
+        existing = sorted(path for path in changes.paths if path.is_file())
+        removed = changes.paths.difference(existing)
+        for path, result in self.index.refresh(
+            existing, self.parser, self.workers, prune=False
+        ):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to parse xmp: {path} ({result})")
+        stats = self.index.last_refresh
+        if removed:
+            self.index.remove(removed)
+            stats.pruned = len(removed)
+        return stats
+
+    def step(self, timeout: float = WAIT_INTERVAL) -> RefreshStats | None:
+        """最大timeout秒変更を待ち、更新できる状態であればインデックスを更新する。
+
+        Returns:
+            インデックスを更新した場合はその処理件数、それ以外はNone
+        """
+        due = self.debouncer.timeout(time.monotonic())
+        self.debouncer.add(
+            self.source.read(timeout if due is None else min(timeout, due)),
+            time.monotonic(),
+        )
+        changes = self.debouncer.take(time.monotonic())
+        if changes is None:
+            return None
+        return self._apply_and_log(changes)
+
+    def flush(self) -> RefreshStats | None:
+        """まとめている変更を待たずにインデックスに反映する。"""
+        changes = self.debouncer.flush()
+        return self._apply_and_log(changes) if changes else None
+
+    def _apply_and_log(self, changes: Changes) -> RefreshStats:
+        stats = self.apply(changes)
+        logger.info(
+            f"Updated index: {stats.parsed} parsed, {stats.pruned} removed, "
+            f"{stats.failed} failed"
+        )
+        return stats
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """stopが設定されるまで（Noneの場合は中断されるまで）監視を続ける。
+
+        中断（KeyboardInterrupt）された場合も、まとめている変更を反映してから終了する。
+        """
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                self.step()
+        finally:
+            self.flush()
@@ -0,0 +1,322 @@
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from loguru import logger
+
+from lrutility.utils.walker import FileEntry
+from lrutility.xmp.XMPDataclass import XMPMetadata
+from lrutility.xmp.XMPParser import XMPParser
+
+INDEX_DIR_NAME = ".lrutility"
+INDEX_FILE_NAME = "index.sqlite"
+
+# インデックスのスキーマバージョン（テーブル定義を変更した場合に更新する）
+SCHEMA_VERSION = 2
+
+# 変更をまとめてコミットする件数
+COMMIT_INTERVAL = 1000
+
+# JSONで日時を表すオブジェクトのキー
+_DATETIME_KEY = "$datetime"
+
+
+def metadata_layout() -> str:
+    """XMPMetadataのフィールド構成を表す文字列を返す。
+
+    インデックスにはXMPMetadata.to_tupleの形式で保存するため、
+    フィールド構成が変わった場合は保存済みのデータを破棄する必要がある。
+    """
+    return ",".join(
+        f"{section.name}:{'|'.join(f.name for f in fields(section.type))}"
+        for section in fields(XMPMetadata)
+    )
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_KEY: value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_object_hook(value: dict[str, Any]) -> Any:
+    if len(value) == 1 and _DATETIME_KEY in value:
+        return datetime.fromisoformat(value[_DATETIME_KEY])
+    return value
+
+
+def encode_metadata(metadata: XMPMetadata) -> str:
+    """XMPMetadataをインデックスに保存するJSON文字列に変換する。
+
+    インデックスはライブラリ内のファイルで第三者が書き換えられるため、読み込み時に
+    任意のコードを実行できるpickleではなく、値のみを表すJSONで保存する。
+    """
+    return json.dumps(
+        metadata.to_tuple(),
+        default=_json_default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def decode_metadata(data: str) -> XMPMetadata:
+    """encode_metadataで変換したJSON文字列からXMPMetadataを復元する。"""
+    return XMPMetadata.from_tuple(json.loads(data, object_hook=_json_object_hook))
+
+
+@dataclass
+class RefreshStats:
+    """MetadataIndex.refreshの処理件数。"""
+
+    hits: int = 0  # インデックスから取得した件数
+    parsed: int = 0  # 新規・変更のためパースした件数
+    failed: int = 0  # パースに失敗した件数
+    pruned: int = 0  # 削除済みのためインデックスから除いた件数
+
+
+@dataclass
+class IndexStats:
+    """インデックスの統計情報。"""
+
+    path: Path  # インデックスファイルのパス
+    entries: int  # 登録件数
+    file_size: int  # インデックスファイルのサイズ（バイト）
+
+
+class MetadataIndex:
+    """ライブラリルートごとにパース済みのXMPメタデータを保存するインデックス。
+
+    XMPファイルのルートからの相対パスをキーに、(st_mtime_ns, st_size)と
+    XMPMetadata.to_tupleの値（JSON）を`<root>/.lrutility/index.sqlite`に保存します。
+    refreshは変更のないファイルをインデックスから返し、新規・変更された
+    ファイルのみをパースします。
+
+    Examples:
+        >>> with MetadataIndex(Path("/path/to/photos")) as index:
+        ...     for path, metadata in index.refresh(paths, XMPParser()):
+        ...         print(path, metadata.xmp_info.rating)
+    """
+
+    def __init__(self, root: Path, index_path: Path | None = None) -> None:
+        """
+        Args:
+            root: ライブラリのルートディレクトリ
+            index_path: インデックスファイルのパス。
+                Noneの場合は`<root>/.lrutility/index.sqlite`。
+        """
+        self.root = root
+        self.index_path = index_path or root / INDEX_DIR_NAME / INDEX_FILE_NAME
+        self.last_refresh = RefreshStats()
+        self._connection: sqlite3.Connection | None = None
+
+    def __enter__(self) -> "MetadataIndex":
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise RuntimeError("MetadataIndex is not open")
+        return self._connection
+
+    def open(self) -> None:
+        """インデックスファイルを開く（存在しない場合は作成する）。
+
+        スキーマやXMPMetadataのフィールド構成が保存時と異なる場合は、
+        保存済みのデータを破棄する。
+        """
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.index_path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection = connection
+
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        layout = None
+        if version == SCHEMA_VERSION:
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = 'layout'"
+            ).fetchone()
+            layout = row[0] if row else None
+        if layout != metadata_layout():
+            if version:
+                logger.info(f"Index layout changed, rebuilding: {self.index_path}")
+            self._create_schema()
+
+    def close(self) -> None:
+        """インデックスファイルを閉じる。"""
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+    def _create_schema(self) -> None:
+        connection = self.connection
+        connection.executescript(
+            """
+            DROP TABLE IF EXISTS entries;
+            DROP TABLE IF EXISTS meta;
+            CREATE TABLE entries (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                data TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+        connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('layout', ?)", (metadata_layout(),)
+        )
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.commit()
+
+    def _key(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def lookup(self, path: Path, mtime_ns: int, size: int) -> XMPMetadata | None:
+        """ファイルが変更されていなければ、保存済みのメタデータを返す。
+
+        Args:
+            path: XMPファイルのパス
+            mtime_ns: ファイルのst_mtime_ns
+            size: ファイルのst_size
+
+        Returns:
+            XMPMetadataオブジェクト。未登録または変更されている場合はNone。
+        """
+        row = self.connection.execute(
+            "SELECT mtime_ns, size, data FROM entries WHERE path = ?",
+            (self._key(path),),
+        ).fetchone()
+        if row is None or (row[0], row[1]) != (mtime_ns, size):
+            return None
+        return decode_metadata(row[2])
+
+    def store(
+        self, path: Path, mtime_ns: int, size: int, metadata: XMPMetadata
+    ) -> None:
+        """メタデータをインデックスに保存する（コミットは呼び出し側で行う）。"""
+        data = encode_metadata(metadata)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries (path, mtime_ns, size, data) "
+            "VALUES (?, ?, ?, ?)",
+            (self._key(path), mtime_ns, size, data),
+        )
+
+    def remove(self, paths: Iterable[Path]) -> None:
+        """指定されたファイルをインデックスから削除する。"""
+        self.connection.executemany(
+            "DELETE FROM entries WHERE path = ?",
+            ((self._key(path),) for path in paths),
+        )
+        self.connection.commit()
+
+    def refresh(
+        self,
+        paths: Iterable[Path | FileEntry],
+        parser: XMPParser,
+        workers: int = 1,
+        prune: bool = True,
+    ) -> Iterator[tuple[Path, XMPMetadata | Exception]]:
+        """XMPファイルのメタデータを、必要なファイルのみパースして返す。
+
+        (st_mtime_ns, st_size)がインデックスと一致するファイルは保存済みの
+        メタデータを返し、それ以外はparser.parse_manyでパースして
+        インデックスを更新する。処理件数はlast_refreshに記録される。
+
+        Args:
+            paths: ルート配下のXMPファイルのパス。walk_filesのFileEntryを
+                渡した場合は、そのstat情報を使用しstatを再発行しない。
+            parser: 新規・変更されたファイルのパースに使用するパーサー
+            workers: parse_manyのワーカー数
+            prune: Trueの場合、pathsに含まれない登録済みのファイルを
+                削除済みとしてインデックスから除く。pathsがルート配下の
+                全XMPファイルである場合にのみ指定する。
+
+        Yields:
+            (パス, XMPMetadata)のタプル。パースに失敗したファイルは
+            (パス, 例外)のタプルとして返される。
+        """
+        stats = self.last_refresh = RefreshStats()
+        connection = self.connection
+        known = {
+            key: (mtime_ns, size)
+            for key, mtime_ns, size in connection.execute(
+                "SELECT path, mtime_ns, size FROM entries"
+            )
+        }
+
+        seen: set[str] = set()
+        changed: dict[Path, tuple[int, int]] = {}
+        for item in paths:
+            if isinstance(item, FileEntry):
+                path, mtime_ns, size = item.path, item.mtime_ns, item.size
+            else:
+                path = item
+                try:
+                    stat = path.stat()
+                except OSError as e:
+                    stats.failed += 1
+                    yield path, e
+                    continue
+                mtime_ns, size = stat.st_mtime_ns, stat.st_size
+            key = self._key(path)
+            seen.add(key)
+            if known.get(key) == (mtime_ns, size):
+                metadata = self.lookup(path, mtime_ns, size)
+                if metadata is not None:
+                    stats.hits += 1
+                    yield path, metadata
+                    continue
+            changed[path] = (mtime_ns, size)
+
+        for path, result in parser.parse_many(changed, workers=workers):
+            if isinstance(result, Exception):
+                stats.failed += 1
+            else:
+                self.store(path, *changed[path], result)
+                stats.parsed += 1
+                if stats.parsed % COMMIT_INTERVAL == 0:
+                    connection.commit()
+            yield path, result
+
+        if prune:
+            removed = known.keys() - seen
+            connection.executemany(
+                "DELETE FROM entries WHERE path = ?", ((key,) for key in removed)
+            )
+            stats.pruned = len(removed)
+        connection.commit()
+
+    def clear(self) -> None:
+        """インデックスの全登録を削除する。"""
+        self.connection.execute("DELETE FROM entries")
+        self.connection.commit()
+
+    def stats(self) -> IndexStats:
+        """インデックスの統計情報を返す。"""
+        (entries,) = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return IndexStats(
+            path=self.index_path,
+            entries=entries,
+            file_size=self.index_path.stat().st_size,
+        )
+
+    def vacuum(self) -> None:
+        """インデックスファイルを最適化し、未使用領域を解放する。"""
+        self.connection.commit()
+        self.connection.execute("VACUUM")
@@ -0,0 +1,211 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from lrutility.utils.walker import DEFAULT_WORKERS, FileEntry, walk_files
+
+SIDECAR_SUFFIX = ".xmp"
+
+# RAWファイルの拡張子（XMPの対応先として画像ファイルより優先する）
+RAW_SUFFIXES = frozenset(
+    {
+        ".arw",
+        ".cr2",
+        ".cr3",
+        ".crw",
+        ".dng",
+        ".nef",
+        ".nrw",
+        ".orf",
+        ".pef",
+        ".raf",
+        ".rw2",
+        ".srw",
+        ".x3f",
+    }
+)
+
+# RAW以外の画像ファイルの拡張子
+IMAGE_SUFFIXES = frozenset(
+    {".jpg", ".jpeg", ".heic", ".heif", ".hif", ".tif", ".tiff", ".png", ".psd"}
+)
+
+_ALL_IMAGE_SUFFIXES = RAW_SUFFIXES | IMAGE_SUFFIXES
+
+# 他の現像ソフトのサイドカーの拡張子（画像を含まず、画像と共に削除してよいファイル）
+# DxO PhotoLab・RawTherapee・ON1 Photo RAW・Adobe Camera Raw
+COMPANION_SIDECAR_SUFFIXES = frozenset({".dop", ".pp3", ".on1", ".acr"})
+
+
+@dataclass(frozen=True, slots=True)
+class Orphans:
+    """対応するファイルが見つからないXMPファイルと画像ファイル。"""
+
+    sidecars: list[Path]  # 画像ファイルのないXMPファイル
+    images: list[Path]  # XMPファイルのないRAWファイル
+
+
+def _suffix(name: str) -> str:
+    dot = name.rfind(".")
+    return name[dot:].lower() if dot > 0 else ""
+
+
+def _stem(name: str) -> str:
+    dot = name.rfind(".")
+    return (name[:dot] if dot > 0 else name).lower()
+
+
+def _base(name: str) -> str:
+    """ファイルをまとめるための、拡張子を除いた小文字のファイル名を返す。
+
+    "IMG_0001.ARW.xmp"や"IMG_0001.ARW.dop"のような、画像ファイル名に
+    拡張子を付けたサイドカーは"img_0001"とする。
+    """
+    stem = _stem(name)
+    if _suffix(name) not in _ALL_IMAGE_SUFFIXES and _suffix(stem) in (
+        _ALL_IMAGE_SUFFIXES
+    ):
+        return _stem(stem)
+    return stem
+
+
+class SidecarIndex:
+    """ライブラリ内のファイルを、ディレクトリと拡張子を除いたファイル名で引く索引。
+
+    1回のディレクトリ走査で全ファイルを登録し、XMPファイルに対応する画像ファイルや、
+    同じファイル名を持つ付随ファイル（RAW+JPEGのJPEG、.dop等）の検索、
+    対応の取れないファイルの列挙をファイルシステムへの問い合わせなしに行います。
+    ファイル名の比較は大文字小文字を区別しません。
+
+    Examples:
+        >>> sidecars = SidecarIndex.build(Path("/path/to/photos"))
+        >>> for entry in sidecars.sidecars:
+        ...     print(entry.path, sidecars.resolve(entry.path))
+    """
+
+    def __init__(self, entries: Iterable[FileEntry]) -> None:
+        """
+        Args:
+            entries: ライブラリ内のファイル
+        """
+        self._by_name: dict[tuple[Path, str], FileEntry] = {}
+        self._by_stem: defaultdict[tuple[Path, str], list[FileEntry]] = defaultdict(
+            list
+        )
+        sidecars = []
+        for entry in entries:
+            parent, name = entry.path.parent, entry.path.name
+            self._by_name[parent, name.lower()] = entry
+            self._by_stem[parent, _base(name)].append(entry)
+            if _suffix(name) == SIDECAR_SUFFIX:
+                sidecars.append(entry)
+        for group in self._by_stem.values():
+            group.sort(key=lambda entry: entry.path.name)
+        sidecars.sort(key=lambda entry: entry.path)
+        self.sidecars: list[FileEntry] = sidecars
+
+    @classmethod
+    def build(cls, root: Path, workers: int = DEFAULT_WORKERS) -> "SidecarIndex":
+        """ルート配下の全ファイルを走査して索引を構築する。
+
+        Args:
+            root: ライブラリのルートディレクトリ
+            workers: 並列に走査するスレッド数
+
+        Returns:
+            SidecarIndexオブジェクト
+        """
+        return cls(walk_files(root, workers=workers))
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def get(self, path: Path) -> FileEntry | None:
+        """パスに対応するFileEntryを返す（登録されていない場合はNone）。"""
+        return self._by_name.get((path.parent, path.name.lower()))
+
+    def sizes(self, paths: Iterable[Path]) -> list[int]:
+        """走査時に記録したファイルのサイズのリストを返す（登録されていない場合は0）。"""
+        return [entry.size if (entry := self.get(path)) else 0 for path in paths]
+
+    def resolve(self, sidecar: Path, raw_file_name: str | None = None) -> Path | None:
+        """XMPファイルに対応する画像ファイルのパスを返す。
+
+        以下の順に検索する。
+
+        1. XMPのcrs:RawFileNameと同じ名前の、XMPと同じディレクトリのファイル
+        2. "IMG_0001.ARW.xmp"形式のXMPファイル名から拡張子を除いた名前のファイル
+        3. XMPと同じファイル名を持つ画像ファイル（RAWを優先）
+
+        Args:
+            sidecar: XMPファイルのパス
+            raw_file_name: XMPに記録されたRAWファイル名
+
+        Returns:
+            画像ファイルのパス。見つからない場合はNone。
+        """
+        parent = sidecar.parent
+        for name in (raw_file_name, sidecar.name[: -len(SIDECAR_SUFFIX)]):
+            if name:
+                entry = self._by_name.get((parent, name.lower()))
+                if entry is not None and _suffix(name) != SIDECAR_SUFFIX:
+                    return entry.path
+        images = self._images(parent, _base(sidecar.name))
+        return images[0].path if images else None
+
+    def companions(self, path: Path, sidecars_only: bool = False) -> list[Path]:
+        """指定されたファイルと同じディレクトリ・ファイル名を持つ他のファイルを返す。
+
+        XMPファイルまたは画像ファイルのパスを指定し、RAW+JPEGのJPEGや
+        現像ソフトのサイドカー（.dop、.pp3等）を取得する。
+        "IMG_0001.ARW.xmp"のような画像ファイル名に拡張子を付けた形式も含める。
+
+        Args:
+            path: XMPファイルまたは画像ファイルのパス
+            sidecars_only: Trueの場合、他の現像ソフトのサイドカー
+                （COMPANION_SIDECAR_SUFFIXES）のみを返す。同じファイル名の
+                JPEG・DNG・書き出した画像・動画等は含めない。
+
+        Returns:
+            ファイル名順のパスのリスト（pathを含まない）
+        """
+        group = self._by_stem.get((path.parent, _base(path.name)), [])
+        return [
+            entry.path
+            for entry in group
+            if entry.path != path
+            and (
+                not sidecars_only
+                or _suffix(entry.path.name) in COMPANION_SIDECAR_SUFFIXES
+            )
+        ]
+
+    def groups(self) -> list[list[FileEntry]]:
+        """同じディレクトリ・ファイル名を持つファイルの組を返す（組内はファイル名順）。"""
+        return list(self._by_stem.values())
+
+    def orphans(self) -> Orphans:
+        """対応するファイルが見つからないXMPファイルとRAWファイルを返す。"""
+        sidecars = [
+            entry.path for entry in self.sidecars if self.resolve(entry.path) is None
+        ]
+        images = []
+        for group in self._by_stem.values():
+            if any(_suffix(entry.path.name) == SIDECAR_SUFFIX for entry in group):
+                continue
+            images.extend(
+                entry.path
+                for entry in group
+                if _suffix(entry.path.name) in RAW_SUFFIXES
+            )
+        return Orphans(sidecars=sidecars, images=sorted(images))
+
+    def _images(self, parent: Path, stem: str) -> list[FileEntry]:
+        images = [
+            entry
+            for entry in self._by_stem.get((parent, stem), [])
+            if _suffix(entry.path.name) in _ALL_IMAGE_SUFFIXES
+        ]
+        images.sort(key=lambda entry: _suffix(entry.path.name) not in RAW_SUFFIXES)
+        return images
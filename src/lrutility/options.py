@@ -0,0 +1,34 @@
+"""コマンドラインで選択できる値の型と既定値。
+
+cli.pyはコマンドの引数の定義にこれらを使用するため、起動時間に影響しないよう
+このモジュールは標準ライブラリのtyping以外をimportしない。
+"""
+
+from typing import Literal
+
+# ZIPアーカイブのメンバーの圧縮方式の選択（CompressionPolicy）
+CompressionMode = Literal["auto", "deflate", "store"]
+
+# アーカイブへのファイルの割り当て方（packing.pack）
+PackingStrategy = Literal["next-fit", "ffd"]
+
+# アーカイブを分割するサイズの基準（RollingZipWriter）
+SizeMode = Literal["uncompressed", "written"]
+
+# アーカイブの形式（ArchiveWriter）
+ArchiveFormat = Literal["zip", "tar", "tar.gz", "tar.xz"]
+
+# チェックサムのハッシュアルゴリズム（checksums）
+HashAlgorithm = Literal["sha256", "blake2b"]
+
+# プロファイラの種類（instrument）
+ProfileMode = Literal["cprofile", "sample"]
+
+# ファイルの変更の検出方法（IndexWatcher）
+WatchMode = Literal["auto", "inotify", "poll"]
+
+# 読み込み済み・圧縮中のデータに使用するメモリの上限の既定値
+DEFAULT_MEMORY_BUDGET = 256 * 1024**2
+
+# アーカイブの検証でメンバーを並列に展開するスレッド数の既定値
+DEFAULT_VERIFY_WORKERS = 8
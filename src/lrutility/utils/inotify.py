@@ -0,0 +1,171 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+# inotify_add_watchに指定するイベント（<sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_ONLYDIR = 0x01000000
+
+# 読み込んだイベントにのみ設定されるフラグ
+IN_Q_OVERFLOW = 0x00004000  # カーネルのイベントキューが溢れた
+IN_IGNORED = 0x00008000  # 監視が解除された（ディレクトリの削除等）
+IN_ISDIR = 0x40000000  # 対象がディレクトリ
+
+# inotify_init1のフラグ（O_NONBLOCK・O_CLOEXECと同じ値）
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+# struct inotify_eventの固定長部分（wd, mask, cookie, len）
+_EVENT = struct.Struct("iIII")
+
+# 1回の読み込みの大きさ（イベントの名前は最大NAME_MAX + 1バイト）
+_READ_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class InotifyEvent:
+    """inotifyから読み込んだ1つのイベント。"""
+
+    wd: int  # 監視のディスクリプタ
+    mask: int  # イベントの種類（IN_*の組み合わせ）
+    cookie: int  # IN_MOVED_FROMとIN_MOVED_TOを対応付ける値
+    name: str  # 監視しているディレクトリ内の名前（ディレクトリ自身の場合は空）
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+_libc = _load_libc()
+
+
+def is_available() -> bool:
+    """inotifyを使用できるか（Linuxで、libcがinotifyに対応しているか）を返す。"""
+    return _libc is not None
+
+
+def parse_events(data: bytes) -> list[InotifyEvent]:
+    """inotifyのファイルディスクリプタから読み込んだデータをイベントに分ける。"""
+    events = []
+    offset = 0
+    while offset + _EVENT.size <= len(data):
+        wd, mask, cookie, length = _EVENT.unpack_from(data, offset)
+        offset += _EVENT.size
+        # 名前はNUL終端され、アラインメントのためにNULで埋められている
+        name = data[offset : offset + length].split(b"\0", 1)[0]
+        offset += length
+        events.append(InotifyEvent(wd, mask, cookie, os.fsdecode(name)))
+    return events
+
+
+class Inotify:
+    """Linuxのinotify APIをctypesで呼び出すラッパー。
+
+    追加の依存なしにディレクトリ内のファイルの作成・変更・削除を検出します。
+    inotifyは監視を追加したディレクトリ直下のみが対象のため、サブディレクトリを
+    監視する場合はそれぞれに監視を追加する必要があります。
+
+    Examples:
+        >>> with Inotify() as inotify:
+        ...     inotify.add_watch(Path("/path/to/photos"), IN_CLOSE_WRITE | IN_DELETE)
+        ...     for event in inotify.read(timeout=1.0):
+        ...         print(event.name, event.mask)
+    """
+
+    def __init__(self) -> None:
+        """
+        Raises:
+            OSError: inotifyを使用できない場合
+        """
+        if _libc is None:
+            raise OSError("inotify is not available on this platform")
+        self._libc = _libc
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.fd = fd
+        self._poll = select.poll()
+        self._poll.register(fd, select.POLLIN)
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        """pathの監視を追加し、監視のディスクリプタを返す。
+
+        同じpathに再び追加した場合は、同じディスクリプタが返されます。
+
+        Raises:
+            OSError: 監視を追加できない場合（監視数の上限を超えた場合はENOSPC）
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), str(path))
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """監視を解除する（既に解除されている場合は何もしない）。"""
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout: float | None = None) -> list[InotifyEvent]:
+        """イベントを読み込む。
+
+        Args:
+            timeout: イベントを待つ最大の秒数。Noneの場合はイベントが届くまで待つ。
+
+        Returns:
+            InotifyEventのリスト（timeoutまでにイベントがない場合は空）
+        """
+        if not self._poll.poll(None if timeout is None else timeout * 1000):
+            return []
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            events.extend(parse_events(data))
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
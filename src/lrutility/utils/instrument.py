@@ -0,0 +1,299 @@
+import cProfile
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TypeVar
+
+from loguru import logger
+
+from lrutility.options import ProfileMode
+
+T = TypeVar("T")
+
+# サンプリングプロファイラの取得間隔（秒）
+SAMPLE_INTERVAL = 0.005
+
+# 無効時にstageが返すコンテキストマネージャー（呼び出しごとに生成しない）
+_NULL: AbstractContextManager[None] = nullcontext()
+
+
+@dataclass(slots=True)
+class StageStats:
+    """段階ごとの計測結果。
+
+    時間は入れ子になった段階の時間を除いた値で、スレッドごとの時間の合計。
+    """
+
+    wall: float = 0.0  # 経過時間（秒）
+    cpu: float = 0.0  # CPU時間（秒、time.thread_time）
+    calls: int = 0  # 計測した回数
+    items: int = 0  # 処理した件数
+    bytes: int = 0  # 処理したバイト数
+
+
+@dataclass(slots=True)
+class _Frame:
+    """実行中の段階と、時間を最後に加算した時点。"""
+
+    name: str
+    wall: float
+    cpu: float
+
+
+class Recorder:
+    """段階ごとの経過時間・CPU時間・件数・バイト数を記録する。
+
+    stageを入れ子にした場合、内側の段階の時間は外側の段階から除かれるため、
+    各段階の時間の合計が全体の時間となり、ボトルネックを特定できます。
+    スレッドごとに入れ子の状態を持つため、複数のスレッドから記録できます。
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageStats] = {}
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list[_Frame]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _charge(
+        self,
+        frame: _Frame,
+        now: float,
+        cpu: float,
+        calls: int = 0,
+        items: int = 0,
+        nbytes: int = 0,
+    ) -> None:
+        with self._lock:
+            stats = self.stages.get(frame.name)
+            if stats is None:
+                stats = self.stages[frame.name] = StageStats()
+            stats.wall += now - frame.wall
+            stats.cpu += cpu - frame.cpu
+            stats.calls += calls
+            stats.items += items
+            stats.bytes += nbytes
+        frame.wall = now
+        frame.cpu = cpu
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0, nbytes: int = 0) -> Iterator[None]:
+        """ブロックの実行を段階nameとして計測する。"""
+        stack = self._stack()
+        now, cpu = time.perf_counter(), time.thread_time()
+        if stack:
+            # 外側の段階をここまでで区切り、内側の実行中は加算しない
+            self._charge(stack[-1], now, cpu)
+        frame = _Frame(name, now, cpu)
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            now, cpu = time.perf_counter(), time.thread_time()
+            stack.pop()
+            self._charge(frame, now, cpu, 1, items, nbytes)
+            if stack:
+                # 外側の段階の計測を再開する
+                stack[-1].wall = now
+                stack[-1].cpu = cpu
+
+    def add(self, name: str, items: int = 0, nbytes: int = 0) -> None:
+        """時間を計測せずに段階nameの件数とバイト数を加算する。"""
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.items += items
+            stats.bytes += nbytes
+
+    def summary(self) -> dict:
+        """全体と段階ごとの計測結果を経過時間の長い順に返す。"""
+        stages = {}
+        for name, stats in sorted(
+            self.stages.items(), key=lambda item: item[1].wall, reverse=True
+        ):
+            result = asdict(stats)
+            result["wall"] = round(stats.wall, 6)
+            result["cpu"] = round(stats.cpu, 6)
+            if stats.bytes and stats.wall > 0:
+                result["mb_per_second"] = round(stats.bytes / stats.wall / 1024**2, 1)
+            stages[name] = result
+        return {
+            "wall": round(time.perf_counter() - self.started, 6),
+            "cpu": round(time.process_time() - self.cpu_started, 6),
+            "stages": stages,
+        }
+
+
+_recorder: Recorder | None = None
+
+
+def enable() -> Recorder:
+    """計測を有効にし、記録先を返す。"""
+    global _recorder
+    _recorder = Recorder()
+    return _recorder
+
+
+def disable() -> None:
+    """計測を無効にする。"""
+    global _recorder
+    _recorder = None
+
+
+def stage(name: str, items: int = 0, nbytes: int = 0) -> AbstractContextManager[None]:
+    """ブロックの実行を段階nameとして計測する（無効時は何もしない）。
+
+    Examples:
+        >>> with stage("unlink", items=1, nbytes=size):
+        ...     path.unlink()
+    """
+    if _recorder is None:
+        return _NULL
+    return _recorder.stage(name, items, nbytes)
+
+
+def count(name: str, items: int = 0, nbytes: int = 0) -> None:
+    """段階nameの件数とバイト数を加算する（無効時は何もしない）。"""
+    if _recorder is not None:
+        _recorder.add(name, items, nbytes)
+
+
+def timed(name: str, iterable: Iterable[T]) -> Iterable[T]:
+    """要素の取得にかかる時間を段階nameとして計測する。
+
+    無効時はiterableをそのまま返すため、要素ごとのコストは発生しない。
+    要素を受け取った側の処理の時間は含まない。
+    """
+    if _recorder is None:
+        return iterable
+    return _timed(_recorder, name, iterable)
+
+
+def _timed(recorder: Recorder, name: str, iterable: Iterable[T]) -> Iterator[T]:
+    iterator = iter(iterable)
+    while True:
+        with recorder.stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        recorder.add(name, items=1)
+        yield item
+
+
+class Sampler:
+    """全スレッドのスタックを一定間隔で取得するサンプリングプロファイラ。
+
+    関数の呼び出しごとのコストがないため、cProfileより実行速度への影響が
+    小さくなります。結果はflamegraph.pl・speedscope等で読み込める
+    collapsed stack形式（`スレッド;関数;...;関数 回数`）で書き込みます。
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write(self, path: Path) -> None:
+        with path.open("w", encoding="utf-8") as f:
+            for stack, samples in self.samples.most_common():
+                f.write(f"{stack} {samples}\n")
+
+
+@contextmanager
+def instrumented(
+    stats: bool = False,
+    stats_file: Path | None = None,
+    profile: Path | None = None,
+    profile_mode: ProfileMode = "cprofile",
+) -> Iterator[None]:
+    """ブロックの実行を計測し、終了時に結果を出力する。
+
+    計測はメインプロセスのみが対象で、--jobs等で起動した子プロセス内の処理は
+    それを待つ段階の時間として計上されます。
+
+    Args:
+        stats: Trueの場合、段階ごとの計測結果をログに出力する
+        stats_file: 指定した場合、計測結果をJSONで書き込む
+        profile: 指定した場合、プロファイルの結果を書き込む
+        profile_mode: "cprofile"はcProfileの結果（pstats形式、snakeviz等で表示）、
+            "sample"はサンプリングプロファイラの結果（collapsed stack形式）
+    """
+    recorder = enable() if stats or stats_file is not None else None
+    profiler: cProfile.Profile | Sampler | None = None
+    if profile is not None:
+        profiler = cProfile.Profile() if profile_mode == "cprofile" else Sampler()
+        if isinstance(profiler, Sampler):
+            profiler.start()
+        else:
+            profiler.enable()
+    try:
+        yield
+    finally:
+        if isinstance(profiler, Sampler):
+            profiler.stop()
+            profiler.write(profile)  # type: ignore[arg-type]
+        elif profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile)  # type: ignore[arg-type]
+        if profile is not None:
+            logger.info(f"Profile: {profile}")
+        if recorder is not None:
+            disable()
+            report(recorder.summary(), stats, stats_file)
+
+
+def report(summary: dict, stats: bool, stats_file: Path | None) -> None:
+    """計測結果をログに出力、またはJSONで書き込む。"""
+    if stats:
+        logger.info(f"Total: {summary['wall']:.3f}s wall, {summary['cpu']:.3f}s CPU")
+        for name, result in summary["stages"].items():
+            throughput = (
+                f", {result['mb_per_second']} MB/s" if "mb_per_second" in result else ""
+            )
+            logger.info(
+                f"  {name}: {result['wall']:.3f}s wall, {result['cpu']:.3f}s CPU, "
+                f"{result['calls']} calls, {result['items']} items, "
+                f"{result['bytes'] / 1024**2:.1f} MiB{throughput}"
+            )
+    if stats_file is not None:
+        stats_file.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        logger.info(f"Stats: {stats_file}")
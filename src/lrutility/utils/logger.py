@@ -1,9 +1,53 @@
-import inspect
 import logging
 import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
+if TYPE_CHECKING:
+    from loguru import Record
+
+# ログレベルの名前から重大度への対応（ファイルごとのログの判定に使う）
+_LEVEL_NOS: dict[str, int] = {
+    "TRACE": 5,
+    "DEBUG": 10,
+    "INFO": 20,
+    "SUCCESS": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+# 標準loggingの重大度からloguruのレベル名への対応
+_STD_LEVELS: dict[int, str] = {
+    logging.DEBUG: "DEBUG",
+    logging.INFO: "INFO",
+    logging.WARNING: "WARNING",
+    logging.ERROR: "ERROR",
+    logging.CRITICAL: "CRITICAL",
+}
+
+# 出力されるログの最低の重大度（configure_loguruで更新する）
+_min_level = _LEVEL_NOS["INFO"]
+
+# 集計モードの結果ごとの件数（集計モードでない場合はNone）
+_outcomes: Counter[str] | None = None
+_outcomes_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class LogOptions:
+    """ログの出力先と出力方法の設定。"""
+
+    file: Path | None = None  # 端末に加えてログを書き込むファイル
+    enqueue: bool = False  # Trueの場合、書き込みをバックグラウンドのスレッドで行う
+    summary: bool = False  # Trueの場合、ファイルごとのログの代わりに件数を集計する
+
 
 class InterceptHandler(logging.Handler):
     """標準のloggingモジュールのログをloguruにリダイレクトするハンドラー。
@@ -24,40 +68,34 @@ class InterceptHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:
         """ログレコードをloguruに転送する。
 
-        標準のloggingモジュールから受け取ったログレコードを解析し、
-        適切な呼び出し元の情報を保持しながらloguruのloggerに転送します。
+        標準のloggingモジュールから受け取ったログレコードを、呼び出し元の
+        情報を保持したままloguruのloggerに転送します。
 
         Args:
             record: 標準のloggingモジュールからのログレコード。
                     レベル、メッセージ、例外情報などを含む。
 
         Note:
-            このメソッドは、ログの呼び出し元を正確に特定するため、
-            スタックフレームを遡って適切な深さを計算します。
+            呼び出し元はスタックフレームを遡らず、LogRecordが既に持つ
+            ロガー名・関数名・行番号をloguruのレコードに設定します。
+            出力されないレベルのレコードは、メッセージを組み立てずに破棄します。
         """
-        # Get corresponding Loguru level if it exists.
-        try:
-            level: str | int = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
-
-        # Find caller from where originated the logged message.
-        frame, depth = inspect.currentframe(), 0
-        while frame:
-            filename: str = frame.f_code.co_filename
-            is_logging: bool = filename == logging.__file__
-            is_frozen: bool = "importlib" in filename and "_bootstrap" in filename
-            if depth > 0 and not (is_logging or is_frozen):
-                break
-            frame = frame.f_back
-            depth += 1
-
-        logger.opt(depth=depth, exception=record.exc_info).log(
-            level, record.getMessage()
-        )
+        if record.levelno < _min_level:
+            return
+        level: str | int = _STD_LEVELS.get(record.levelno, record.levelno)
+        logger.patch(partial(_from_std_record, record)).opt(
+            exception=record.exc_info
+        ).log(level, record.getMessage())
 
 
-def configure_loguru(verbose: bool) -> None:
+def _from_std_record(std_record: logging.LogRecord, record: "Record") -> None:
+    """loguruのレコードの呼び出し元を標準loggingのレコードの値に置き換える。"""
+    record["name"] = std_record.name
+    record["function"] = std_record.funcName
+    record["line"] = std_record.lineno
+
+
+def configure_loguru(verbose: bool, options: LogOptions | None = None) -> None:
     """loguruのロガーを設定し、標準loggingとの統合を行う。
 
     この関数は、loguruのデフォルトハンドラーを削除し、新しい設定で再構成します。
@@ -67,6 +105,7 @@ def configure_loguru(verbose: bool) -> None:
     Args:
         verbose: Trueの場合、ログレベルをDEBUGに設定。
                 Falseの場合、ログレベルをINFOに設定。
+        options: ログの出力先と出力方法。Noneの場合は端末に同期的に出力する。
 
     Examples:
         >>> configure_loguru(verbose=True)  # DEBUGレベルでログを出力
@@ -76,13 +115,80 @@ def configure_loguru(verbose: bool) -> None:
         >>> logger.debug("This debug message will NOT be shown")
         >>> logger.info("This info message will be shown")
 
+        >>> configure_loguru(False, LogOptions(file=Path("run.log"), enqueue=True))
+
     Note:
         この関数は、アプリケーションの初期化時に一度だけ呼び出すことを推奨します。
         複数回呼び出すと、既存のハンドラーが削除され、新しいハンドラーで置き換えられます。
+        enqueueを指定した場合、ログはキューを経由して書き込まれるため、
+        端末やファイルへの書き込みを処理中のスレッドが待ちません
+        （未出力のログはプロセスの終了時に書き込まれます）。
     """
+    global _min_level, _outcomes
+    options = options or LogOptions()
     logger.remove()
     logging.basicConfig(handlers=[InterceptHandler()], level=logging.INFO, force=True)
-    level_per_module: dict[str, str] = {"": "INFO"}
-    if verbose:
-        level_per_module = {"": "DEBUG"}
-    logger.add(sys.stderr, diagnose=False, filter=level_per_module)  # type: ignore[arg-type]
+    level = "DEBUG" if verbose else "INFO"
+    _min_level = _LEVEL_NOS[level]
+    _outcomes = Counter() if options.summary else None
+    level_per_module: dict[str, str] = {"": level}
+    # levelを指定すると、出力されないレベルのログはレコードを作成せずに破棄される
+    logger.add(
+        sys.stderr,
+        level=level,
+        diagnose=False,
+        filter=level_per_module,  # type: ignore[arg-type]
+        enqueue=options.enqueue,
+    )
+    if options.file is not None:
+        logger.add(
+            options.file,
+            level=level,
+            diagnose=False,
+            filter=level_per_module,  # type: ignore[arg-type]
+            enqueue=options.enqueue,
+            encoding="utf-8",
+        )
+
+
+def is_enabled(level: str) -> bool:
+    """levelのログが出力されるかを返す（ログを組み立てる前の判定に使う）。"""
+    return _LEVEL_NOS[level] >= _min_level
+
+
+def log_outcome(outcome: str, level: str, message: str, *args: Any) -> None:
+    """ファイルごとの処理の結果をログに出力する。
+
+    messageはargsで遅延して組み立てるため（`"Deleted: {}"`の形式）、
+    levelのログが出力されない場合は文字列の組み立てとloguruの呼び出しを
+    行いません。集計モード（LogOptions.summary）では、ERROR未満のログを
+    出力せずにoutcomeごとの件数のみを数えます。複数のスレッドから呼び出せます。
+
+    Args:
+        outcome: 結果の種類（"deleted"等、集計の単位）
+        level: ログレベルの名前
+        message: loguruの書式のメッセージ
+        *args: messageに埋め込む値
+
+    Examples:
+        >>> log_outcome("not_matched", "DEBUG", "Not matched: {}", path)
+    """
+    level_no = _LEVEL_NOS[level]
+    if _outcomes is not None:
+        with _outcomes_lock:
+            _outcomes[outcome] += 1
+        if level_no < _LEVEL_NOS["ERROR"]:
+            return
+    if level_no >= _min_level:
+        logger.opt(depth=1).log(level, message, *args)
+
+
+def log_outcome_summary() -> None:
+    """集計モードの場合、結果ごとの件数をログに出力する。"""
+    if _outcomes is None:
+        return
+    with _outcomes_lock:
+        counts = ", ".join(
+            f"{outcome}={count}" for outcome, count in sorted(_outcomes.items())
+        )
+    logger.info(f"Outcomes: {counts or 'none'}")
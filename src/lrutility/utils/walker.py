@@ -0,0 +1,185 @@
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+# 走査しないディレクトリ名（インデックス等の作業用ディレクトリ）
+EXCLUDED_DIRS = frozenset({".lrutility"})
+
+# 並列に走査するディレクトリ数の既定値（ネットワークストレージの待ち時間を隠すため）
+DEFAULT_WORKERS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class FileEntry:
+    """走査で見つかったファイルとそのstat情報。"""
+
+    path: Path  # ファイルのパス
+    size: int  # st_size
+    mtime_ns: int  # st_mtime_ns
+
+
+def scan_directory(
+    directory: Path,
+    suffixes: frozenset[str] | None,
+    sort: bool,
+) -> tuple[list[FileEntry], list[Path]]:
+    """1つのディレクトリを走査し、条件に合うファイルとサブディレクトリを返す。
+
+    拡張子の判定はstatの前に行い、対象外のファイルにはstatを発行しない。
+    statはos.DirEntryのキャッシュを利用する。
+
+    Args:
+        directory: 走査するディレクトリ
+        suffixes: 対象とする拡張子（小文字、例: {".xmp"}）。Noneの場合は全ファイル。
+        sort: Trueの場合、ファイルとサブディレクトリを名前順に並べる
+
+    Returns:
+        (ファイルのリスト, サブディレクトリのリスト)
+    """
+    files: list[FileEntry] = []
+    subdirs: list[Path] = []
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name) if sort else list(it)
+    except OSError as e:
+        logger.warning(f"Failed to scan directory: {directory} ({e})")
+        return files, subdirs
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIRS:
+                    subdirs.append(Path(entry.path))
+                continue
+            if not entry.is_file():
+                continue
+            if suffixes is not None and os.path.splitext(entry.name)[1].lower() not in (
+                suffixes
+            ):
+                continue
+            stat = entry.stat()
+        except OSError as e:
+            logger.warning(f"Failed to stat: {entry.path} ({e})")
+            continue
+        files.append(FileEntry(Path(entry.path), stat.st_size, stat.st_mtime_ns))
+    return files, subdirs
+
+
+def walk_directories(
+    root: Path,
+    suffixes: Iterable[str] | None = None,
+    recursive: bool = True,
+    sort: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    ordered: bool = False,
+) -> Iterator[tuple[Path, list[FileEntry]]]:
+    """ディレクトリごとに、走査が終わり次第そのファイルを逐次返す。
+
+    1つのディレクトリのファイルはまとめて返すため、受け取った時点で
+    そのディレクトリのファイルが揃っていることを前提に処理できます。
+
+    Args:
+        root: 走査するルートディレクトリ
+        suffixes: 対象とする拡張子（例: [".xmp"]、大文字小文字は区別しない）。
+            Noneの場合は全ファイル。
+        recursive: Trueの場合、サブディレクトリも走査する
+        sort: Trueの場合、各ディレクトリ内のファイルとサブディレクトリを名前順に並べる
+        workers: 並列に走査するスレッド数。1の場合は並列化しない。
+        ordered: Trueの場合、並列に走査しながらもworkers=1と同じ深さ優先の順
+            （各ディレクトリを先に、サブディレクトリを順に）で返す。
+            Falseの場合は走査の完了順。
+
+    Yields:
+        (ディレクトリのパス, FileEntryのリスト)
+    """
+    suffix_set = None if suffixes is None else frozenset(s.lower() for s in suffixes)
+
+    if workers <= 1 or not recursive:
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            files, subdirs = scan_directory(directory, suffix_set, sort)
+            yield directory, files
+            if recursive:
+                stack.extend(reversed(subdirs))
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if ordered:
+            yield from _walk_ordered(pool, root, suffix_set, sort)
+            return
+        pending: dict[Future, Path] = {
+            pool.submit(scan_directory, root, suffix_set, sort): root
+        }
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory = pending.pop(future)
+                    files, subdirs = future.result()
+                    for subdir in subdirs:
+                        submitted = pool.submit(
+                            scan_directory, subdir, suffix_set, sort
+                        )
+                        pending[submitted] = subdir
+                    yield directory, files
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _walk_ordered(
+    pool: ThreadPoolExecutor,
+    root: Path,
+    suffix_set: frozenset[str] | None,
+    sort: bool,
+) -> Iterator[tuple[Path, list[FileEntry]]]:
+    # 深さ優先の順に結果を待ちつつ、見つかったサブディレクトリは先行して走査する
+    stack = [(root, pool.submit(scan_directory, root, suffix_set, sort))]
+    try:
+        while stack:
+            directory, future = stack.pop()
+            files, subdirs = future.result()
+            stack.extend(
+                (subdir, pool.submit(scan_directory, subdir, suffix_set, sort))
+                for subdir in reversed(subdirs)
+            )
+            yield directory, files
+    finally:
+        for _, future in stack:
+            future.cancel()
+
+
+def walk_files(
+    root: Path,
+    suffixes: Iterable[str] | None = None,
+    recursive: bool = True,
+    sort: bool = False,
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[FileEntry]:
+    """ディレクトリ配下のファイルを、見つかった順に逐次返す。
+
+    サブディレクトリはスレッドプールで並列に走査され、各ディレクトリの
+    走査が終わり次第そのファイルを返すため、走査全体の完了を待たずに
+    後続の処理を開始できます。
+
+    Args:
+        root: 走査するルートディレクトリ
+        suffixes: 対象とする拡張子（例: [".xmp"]、大文字小文字は区別しない）。
+            Noneの場合は全ファイル。
+        recursive: Trueの場合、サブディレクトリも走査する
+        sort: Trueの場合、各ディレクトリ内ではファイルを名前順に返す
+            （ディレクトリ間の順序は走査の完了順）。workers=1の場合は
+            各ディレクトリのファイルを先に、サブディレクトリを名前順に
+            深さ優先で返すため、順序は常に同じとなる。
+        workers: 並列に走査するスレッド数。1の場合は並列化しない。
+
+    Yields:
+        FileEntryオブジェクト
+    """
+    for _, files in walk_directories(root, suffixes, recursive, sort, workers):
+        yield from files
@@ -1,8 +1,9 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class XmpBasicInfo:
     """XMP基本情報を格納するデータクラス。"""
 
@@ -14,7 +15,7 @@ class XmpBasicInfo:
     label: str | None = None  # ラベル
 
 
-@dataclass
+@dataclass(slots=True)
 class XmpDocumentInfo:
     """XMPドキュメント管理情報を格納するデータクラス。"""
 
@@ -27,7 +28,7 @@ class XmpDocumentInfo:
     )  # 編集履歴 # type: ignore[assignment]
 
 
-@dataclass
+@dataclass(slots=True)
 class TiffInfo:
     """TIFF関連情報を格納するデータクラス。"""
 
@@ -41,7 +42,7 @@ class TiffInfo:
     resolution_unit: int | None = None  # 解像度単位
 
 
-@dataclass
+@dataclass(slots=True)
 class ExifInfo:
     """EXIF撮影情報を格納するデータクラス。"""
 
@@ -95,7 +96,7 @@ class ExifInfo:
     date_time_digitized: datetime | None = None  # デジタル化日時
 
 
-@dataclass
+@dataclass(slots=True)
 class FlashInfo:
     """フラッシュ情報を格納するデータクラス。"""
 
@@ -106,7 +107,7 @@ class FlashInfo:
     red_eye_mode: bool = False  # 赤目軽減モード
 
 
-@dataclass
+@dataclass(slots=True)
 class LensInfo:
     """レンズ情報を格納するデータクラス。"""
 
@@ -117,7 +118,7 @@ class LensInfo:
     lens_serial_number: str | None = None  # レンズシリアル番号
 
 
-@dataclass
+@dataclass(slots=True)
 class PhotoshopInfo:
     """Photoshop/Adobe関連情報を格納するデータクラス。"""
 
@@ -128,7 +129,7 @@ class PhotoshopInfo:
     icc_profile: str | None = None  # ICCプロファイル
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraRawSettings:
     """Camera Raw（Lightroom）設定を格納するデータクラス。"""
 
@@ -164,7 +165,7 @@ class CameraRawSettings:
     saturation: int | None = None  # 彩度
 
 
-@dataclass
+@dataclass(slots=True)
 class DublinCoreInfo:
     """Dublin Coreメタデータを格納するデータクラス。"""
 
@@ -176,7 +177,7 @@ class DublinCoreInfo:
     rights: str | None = None  # 著作権
 
 
-@dataclass
+@dataclass(slots=True)
 class DynamicMediaInfo:
     """Dynamic Media（xmpDM）情報を格納するデータクラス。"""
 
@@ -185,7 +186,7 @@ class DynamicMediaInfo:
     scene: str | None = None  # シーン名
 
 
-@dataclass
+@dataclass(slots=True)
 class XMPMetadata:
     """XMPメタデータ全体を格納する統合データクラス。
 
@@ -216,6 +217,33 @@ class XMPMetadata:
     dublin_core_info: DublinCoreInfo = field(default_factory=DublinCoreInfo)
     dynamic_media_info: DynamicMediaInfo = field(default_factory=DynamicMediaInfo)
 
+    def to_tuple(self) -> tuple[tuple[Any, ...], ...]:
+        """セクションごとの値をタプルに変換する。
+
+        プロセス間の受け渡しや保存の際に、クラス情報や属性名を含まない
+        コンパクトな表現として使用します。
+
+        Returns:
+            XMPMetadataのセクション順に並んだ、各セクションの値のタプル
+        """
+        sections = (getattr(self, f.name) for f in fields(self))
+        return tuple(
+            tuple(getattr(section, f.name) for f in fields(section))
+            for section in sections
+        )
+
+    @classmethod
+    def from_tuple(cls, data: tuple[tuple[Any, ...], ...]) -> "XMPMetadata":
+        """to_tupleで変換したタプルからXMPMetadataを復元する。
+
+        Args:
+            data: to_tupleの戻り値
+
+        Returns:
+            XMPMetadataオブジェクト
+        """
+        return cls(*(f.type(*values) for f, values in zip(fields(cls), data)))
+
     def __repr__(self) -> str:
         return f"""
         XMPMetadata(
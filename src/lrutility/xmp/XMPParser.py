@@ -1,6 +1,21 @@
+import os
 import xml.etree.ElementTree as ET
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, replace
 from datetime import datetime
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from typing import Any, BinaryIO, Literal
 
 from loguru import logger
 
@@ -18,26 +33,207 @@ from lrutility.xmp.XMPDataclass import (
     XMPMetadata,
 )
 
+NAMESPACES = {
+    "x": "adobe:ns:meta/",
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "xmp": "http://ns.adobe.com/xap/1.0/",
+    "xmpMM": "http://ns.adobe.com/xap/1.0/mm/",
+    "stEvt": "http://ns.adobe.com/xap/1.0/sType/ResourceEvent#",
+    "tiff": "http://ns.adobe.com/tiff/1.0/",
+    "exif": "http://ns.adobe.com/exif/1.0/",
+    "aux": "http://ns.adobe.com/exif/1.0/aux/",
+    "exifEX": "http://cipa.jp/exif/1.0/",
+    "photoshop": "http://ns.adobe.com/photoshop/1.0/",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "crd": "http://ns.adobe.com/camera-raw-defaults/1.0/",
+    "xmpDM": "http://ns.adobe.com/xmp/1.0/DynamicMedia/",
+    "crs": "http://ns.adobe.com/camera-raw-settings/1.0/",
+}
+
+# XMPMetadataの各セクション名と対応するデータクラス
+SECTION_TYPES: dict[str, type] = {
+    "xmp_info": XmpBasicInfo,
+    "document_info": XmpDocumentInfo,
+    "tiff_info": TiffInfo,
+    "exif_info": ExifInfo,
+    "flash_info": FlashInfo,
+    "lens_info": LensInfo,
+    "photoshop_info": PhotoshopInfo,
+    "camera_raw_settings": CameraRawSettings,
+    "dublin_core_info": DublinCoreInfo,
+    "dynamic_media_info": DynamicMediaInfo,
+}
+
+
+def qname(prefix: str, local: str) -> str:
+    """名前空間プレフィックス付きの名前をElementTreeのClark表記に変換。
+
+    Args:
+        prefix: 名前空間プレフィックス（例: "xmp"）
+        local: ローカル名（例: "Rating"）
+
+    Returns:
+        Clark表記の名前（例: "{http://ns.adobe.com/xap/1.0/}Rating"）
+    """
+    return f"{{{NAMESPACES[prefix]}}}{local}"
+
+
+RDF_DESCRIPTION = qname("rdf", "Description")
+RDF_LI = qname("rdf", "li")
+
+# 逐次パース時に一度に読み込むバイト数
+STREAM_CHUNK_SIZE = 16 * 1024
+
+Backend = Literal["auto", "stream", "etree"]
+
+ExecutorKind = Literal["process", "thread"]
+
+# parse_manyで個別のファイルの失敗として扱う例外
+PARSE_ERRORS = (OSError, ET.ParseError, ValueError)
+
+# rdf:Descriptionの属性と、子要素名ごとの要素
+_Description = tuple[Mapping[str, str], dict[str, ET.Element]]
+
+
+@dataclass(frozen=True)
+class XMPField:
+    """XMPMetadataの1属性と、XMP上の格納位置・変換関数の対応。
+
+    Attributes:
+        section: XMPMetadataのセクション名（例: "xmp_info"）
+        name: セクション内の属性名（例: "rating"）
+        convert: XMP上の文字列（またはrdf:liのテキスト列）を値に変換する関数
+        key: 値を持つXML属性名（Clark表記）
+        element: 値を持つrdf:Description直下の子要素名（Clark表記）。
+            Noneの場合はrdf:Description自身の属性から値を取得する。
+        container: 子要素内のrdf:Seq/rdf:Bag名（Clark表記）。
+            指定された場合はrdf:liのテキスト列を値として扱う。
+        interned: 値の種類が少ない文字列（メーカー名、レンズ名等）の場合True。
+            パーサーのStringPoolで同じ内容の文字列を共有する。
+    """
+
+    section: str
+    name: str
+    convert: Callable[[Any], Any]
+    key: str | None = None
+    element: str | None = None
+    container: str | None = None
+    interned: bool = False
+
+    @property
+    def path(self) -> str:
+        """`section.name`形式のフィールド名。"""
+        return f"{self.section}.{self.name}"
+
+
+@dataclass(frozen=True)
+class ParsePlan:
+    """指定されたフィールドを取得するためのパース計画。
+
+    Attributes:
+        sections: 生成するセクション名
+        attributes: rdf:Descriptionの属性から取得するフィールド
+        elements: 子要素名ごとの、その子要素から取得するフィールド
+    """
+
+    sections: tuple[str, ...]
+    attributes: tuple[XMPField, ...]
+    elements: dict[str, tuple[XMPField, ...]]
+
+
+class StringPool:
+    """同じ内容の文字列を1つのオブジェクトで共有するためのプール。
+
+    多数のXMPファイルで繰り返し現れる文字列（tiff:Make、aux:Lens、
+    crd:CameraProfile等）を共有し、パース結果を大量に保持する際の
+    メモリ使用量を削減します。
+    """
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: str | None) -> str | None:
+        """プール内の同じ内容の文字列を返す（未登録の場合は登録する）。"""
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+
+def _as_str(value: str | None) -> str | None:
+    return value
+
+
+def _as_int(default: str) -> Callable[[str | None], int]:
+    return lambda value: int(value if value is not None else default)
+
+
+def _as_float(default: str) -> Callable[[str | None], float]:
+    return lambda value: float(value if value is not None else default)
+
+
+def _as_bool(value: str | None) -> bool:
+    return (value if value is not None else "False").lower() == "true"
+
+
+def _as_optional_int(value: str | None) -> int | None:
+    return int(value) if value else None
+
+
+def _as_optional_bool(value: str | None) -> bool | None:
+    return value.lower() == "true" if value else None
+
+
+def _first_int(texts: list[str | None]) -> list[int] | None:
+    return [int(texts[0])] if texts[0] else None
+
+
+def _first_text(texts: list[str | None]) -> list[str] | None:
+    return [texts[0]] if texts[0] else None
+
+
+def _all_texts(texts: list[str | None]) -> list[str]:
+    return [text for text in texts if text]
+
+
+def _iter_events(fp: BinaryIO) -> Iterator[tuple[str, ET.Element]]:
+    """ファイルをチャンク単位で読み込み、start/endイベントを順に返す。
+
+    呼び出し側がイテレーションを打ち切った時点で以降の読み込みは行わない。
+    """
+    pull_parser = ET.XMLPullParser(events=("start", "end"))
+    while chunk := fp.read(STREAM_CHUNK_SIZE):
+        pull_parser.feed(chunk)
+        yield from pull_parser.read_events()
+    pull_parser.close()
+    yield from pull_parser.read_events()
+
 
 class XMPParser:
     """XMPファイルをパースしてメタデータを抽出するクラス。"""
 
-    NAMESPACES = {
-        "x": "adobe:ns:meta/",
-        "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
-        "xmp": "http://ns.adobe.com/xap/1.0/",
-        "xmpMM": "http://ns.adobe.com/xap/1.0/mm/",
-        "stEvt": "http://ns.adobe.com/xap/1.0/sType/ResourceEvent#",
-        "tiff": "http://ns.adobe.com/tiff/1.0/",
-        "exif": "http://ns.adobe.com/exif/1.0/",
-        "aux": "http://ns.adobe.com/exif/1.0/aux/",
-        "exifEX": "http://cipa.jp/exif/1.0/",
-        "photoshop": "http://ns.adobe.com/photoshop/1.0/",
-        "dc": "http://purl.org/dc/elements/1.1/",
-        "crd": "http://ns.adobe.com/camera-raw-defaults/1.0/",
-        "xmpDM": "http://ns.adobe.com/xmp/1.0/DynamicMedia/",
-        "crs": "http://ns.adobe.com/camera-raw-settings/1.0/",
-    }
+    NAMESPACES = NAMESPACES
+
+    def __init__(self, backend: Backend = "auto", intern_strings: bool = True) -> None:
+        """XMPパーサーを初期化する。
+
+        Args:
+            backend: XMLの読み込み方式。
+                "stream"は逐次パースで必要な要素を読み終えた時点で打ち切る。
+                "etree"はファイル全体のツリーを構築してから値を取得する。
+                "auto"はrdf:Descriptionの属性のみで完結する場合は"stream"、
+                子要素が必要な場合は"etree"を使用する（子要素は大きなサブツリーの
+                後ろに置かれることが多く、その場合はツリー構築の方が速いため）。
+            intern_strings: Trueの場合、パース結果の文字列（メーカー名・レンズ名等）を
+                StringPoolで共有し、多数の結果を保持する際のメモリ使用量を削減する。
+        """
+        if backend not in ("auto", "stream", "etree"):
+            raise ValueError(f"Unknown XMP parser backend: {backend}")
+        self.backend = backend
+        self.pool = StringPool() if intern_strings else None
+        self._plans: dict[frozenset[str] | None, ParsePlan] = {}
 
     @staticmethod
     def parse_datetime(date_str: str | None) -> datetime | None:
@@ -79,11 +275,91 @@ class XMPParser:
         except (ValueError, ZeroDivisionError):
             return None
 
-    def parse(self, file_path: str | Path) -> XMPMetadata:
+    @staticmethod
+    def resolve_fields(fields: Iterable[str]) -> tuple[XMPField, ...]:
+        """フィールド名の集合をXMPFieldの列に解決する。
+
+        Args:
+            fields: `section.name`形式のフィールド名、またはセクション名
+                （セクション内の全フィールドを意味する）の集合
+
+        Returns:
+            XMP_FIELDS内の定義順に並んだXMPFieldのタプル
+
+        Raises:
+            ValueError: 未知のフィールド名が含まれる場合
+        """
+        requested = set(fields)
+        unknown = requested - FIELD_NAMES - SECTION_TYPES.keys()
+        if unknown:
+            raise ValueError(f"Unknown XMP field: {', '.join(sorted(unknown))}")
+        return tuple(
+            spec
+            for spec in XMP_FIELDS
+            if spec.path in requested or spec.section in requested
+        )
+
+    def plan(self, fields: Iterable[str] | None = None) -> ParsePlan:
+        """フィールド指定からパース計画を生成する（計画はキャッシュされる）。
+
+        Args:
+            fields: 取得するフィールド名の集合。Noneの場合は全フィールド。
+
+        Returns:
+            ParsePlanオブジェクト
+        """
+        cache_key = None if fields is None else frozenset(fields)
+        plan = self._plans.get(cache_key)
+        if plan is not None:
+            return plan
+
+        specs = XMP_FIELDS if cache_key is None else self.resolve_fields(cache_key)
+        if self.pool is not None:
+            specs = tuple(self._pooled(spec) for spec in specs)
+        elements: dict[str, list[XMPField]] = {}
+        for spec in specs:
+            if spec.element is not None:
+                elements.setdefault(spec.element, []).append(spec)
+        plan = ParsePlan(
+            sections=tuple(dict.fromkeys(spec.section for spec in specs)),
+            attributes=tuple(spec for spec in specs if spec.element is None),
+            elements={element: tuple(group) for element, group in elements.items()},
+        )
+        self._plans[cache_key] = plan
+        return plan
+
+    def _pooled(self, spec: XMPField) -> XMPField:
+        """interned指定のフィールドの変換結果をStringPoolで共有するようにする。"""
+        if not spec.interned or self.pool is None:
+            return spec
+        intern, convert = self.pool.intern, spec.convert
+        return replace(spec, convert=lambda value: intern(convert(value)))
+
+    def intern(self, metadata: XMPMetadata) -> XMPMetadata:
+        """XMPMetadataのinterned指定の文字列をStringPoolの文字列に置き換える。
+
+        他のプロセスから受け取ったXMPMetadata等、このパーサーで
+        パースしていないXMPMetadataの文字列を共有する場合に使用します。
+        """
+        if self.pool is None:
+            return metadata
+        for spec in INTERNED_FIELDS:
+            section = getattr(metadata, spec.section)
+            setattr(section, spec.name, self.pool.intern(getattr(section, spec.name)))
+        return metadata
+
+    def parse(
+        self, file_path: str | Path, fields: Iterable[str] | None = None
+    ) -> XMPMetadata:
         """XMPファイルをパースしてXMPMetadataオブジェクトを生成。
 
         Args:
             file_path: XMPファイルのパス
+            fields: 取得するフィールド名の集合
+                （例: {"xmp_info.rating", "camera_raw_settings.raw_file_name"}）。
+                セクション名を指定した場合はそのセクションの全フィールドを取得する。
+                指定されなかったフィールドはデータクラスのデフォルト値のままとなる。
+                Noneの場合は全フィールドを取得する。
 
         Returns:
             XMPMetadataオブジェクト
@@ -91,356 +367,511 @@ class XMPParser:
         Raises:
             FileNotFoundError: ファイルが存在しない場合
             ET.ParseError: XMLのパースに失敗した場合
+            ValueError: 未知のフィールド名が指定された場合
         """
+        plan = self.plan(fields)
+
         file_path = Path(file_path)
-        if not file_path.exists():
+        try:
+            with open(file_path, "rb") as fp:
+                if self.backend == "stream" or (
+                    self.backend == "auto" and not plan.elements
+                ):
+                    found = self._read_stream(fp, plan)
+                else:
+                    found = self._read_tree(fp, plan)
+        except FileNotFoundError:
             logger.error(f"XMP file not found: {file_path}")
-            raise FileNotFoundError(f"XMP file not found: {file_path}")
-
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+            raise FileNotFoundError(f"XMP file not found: {file_path}") from None
 
-        description = root.find(".//rdf:Description", self.NAMESPACES)
-        if description is None:
+        if found is None:
             logger.warning(f"XMP file is empty: {file_path}")
             return XMPMetadata()
 
-        metadata = XMPMetadata()
-        metadata.xmp_info = XmpBasicInfo(
-            creator_tool=description.get(f"{{{self.NAMESPACES['xmp']}}}CreatorTool"),
-            modify_date=self.parse_datetime(
-                description.get(f"{{{self.NAMESPACES['xmp']}}}ModifyDate")
-            ),
-            create_date=self.parse_datetime(
-                description.get(f"{{{self.NAMESPACES['xmp']}}}CreateDate")
-            ),
-            metadata_date=self.parse_datetime(
-                description.get(f"{{{self.NAMESPACES['xmp']}}}MetadataDate")
-            ),
-            # Rating要素を追加（1-5の範囲、または None）
-            rating=int(description.get(f"{{{self.NAMESPACES['xmp']}}}Rating", "0"))
-            if description.get(f"{{{self.NAMESPACES['xmp']}}}Rating")
-            else None,
-            # Label要素を追加
-            label=description.get(f"{{{self.NAMESPACES['xmp']}}}Label"),
-        )
+        attrib, children = found
+        values: dict[str, dict[str, Any]] = {section: {} for section in plan.sections}
+        for spec in plan.attributes:
+            values[spec.section][spec.name] = spec.convert(attrib.get(spec.key))
+
+        for element, specs in plan.elements.items():
+            child = children.get(element)
+            if child is None:
+                continue
+            for spec in specs:
+                if spec.container is None:
+                    values[spec.section][spec.name] = spec.convert(child.get(spec.key))
+                    continue
+                texts = [li.text for li in child.findall(f"{spec.container}/{RDF_LI}")]
+                if texts:
+                    values[spec.section][spec.name] = spec.convert(texts)
+
+        return self.build(values)
 
-        metadata.document_info = XmpDocumentInfo(
-            document_id=description.get(f"{{{self.NAMESPACES['xmpMM']}}}DocumentID"),
-            instance_id=description.get(f"{{{self.NAMESPACES['xmpMM']}}}InstanceID"),
-            preserved_file_name=description.get(
-                f"{{{self.NAMESPACES['xmpMM']}}}PreservedFileName"
-            ),
-            original_document_id=description.get(
-                f"{{{self.NAMESPACES['xmpMM']}}}OriginalDocumentID"
-            ),
-        )
+    @staticmethod
+    def _read_tree(fp: BinaryIO, plan: ParsePlan) -> _Description | None:
+        """ファイル全体のツリーを構築し、rdf:Descriptionと必要な子要素を取り出す。"""
+        root = ET.parse(fp).getroot()
+        description = root.find(f".//{RDF_DESCRIPTION}")
+        if description is None:
+            return None
 
-        metadata.tiff_info = TiffInfo(
-            make=description.get(f"{{{self.NAMESPACES['tiff']}}}Make"),
-            model=description.get(f"{{{self.NAMESPACES['tiff']}}}Model"),
-            orientation=int(
-                description.get(f"{{{self.NAMESPACES['tiff']}}}Orientation", "1")
-            ),
-            image_width=int(
-                description.get(f"{{{self.NAMESPACES['tiff']}}}ImageWidth", "0")
-            ),
-            image_length=int(
-                description.get(f"{{{self.NAMESPACES['tiff']}}}ImageLength", "0")
-            ),
-            # 解像度情報を追加
-            x_resolution=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['tiff']}}}XResolution")
-            ),
-            y_resolution=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['tiff']}}}YResolution")
-            ),
-            resolution_unit=int(
-                description.get(f"{{{self.NAMESPACES['tiff']}}}ResolutionUnit", "0")
-            )
-            if description.get(f"{{{self.NAMESPACES['tiff']}}}ResolutionUnit")
-            else None,
-        )
+        children = {}
+        for element in plan.elements:
+            child = description.find(f".//{element}")
+            if child is not None:
+                children[element] = child
+        return description.attrib, children
 
-        metadata.exif_info = ExifInfo(
-            exposure_time=description.get(f"{{{self.NAMESPACES['exif']}}}ExposureTime"),
-            shutter_speed_value=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}ShutterSpeedValue")
-            ),
-            f_number=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}FNumber")
-            ),
-            aperture_value=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}ApertureValue")
-            ),
-            exposure_program=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}ExposureProgram", "0")
-            ),
-            exposure_mode=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}ExposureMode", "0")
-            ),
-            exposure_bias_value=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}ExposureBiasValue")
-            ),
-            recommended_exposure_index=int(
-                description.get(
-                    f"{{{self.NAMESPACES['exif']}}}RecommendedExposureIndex", "0"
-                )
-            ),
-            sensitivity_type=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}SensitivityType", "0")
-            ),
-            metering_mode=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}MeteringMode", "0")
-            ),
-            light_source=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}LightSource", "0")
-            ),
-            white_balance=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}WhiteBalance", "0")
-            ),
-            brightness_value=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}BrightnessValue")
-            ),
-            focal_length=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}FocalLength")
-            ),
-            focal_length_in_35mm_film=int(
-                description.get(
-                    f"{{{self.NAMESPACES['exif']}}}FocalLengthIn35mmFilm", "0"
-                )
-            ),
-            max_aperture_value=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}MaxApertureValue")
-            ),
-            digital_zoom_ratio=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}DigitalZoomRatio")
-            ),
-            pixel_x_dimension=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}PixelXDimension", "0")
-            ),
-            pixel_y_dimension=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}PixelYDimension", "0")
-            ),
-            focal_plane_x_resolution=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}FocalPlaneXResolution")
-            ),
-            focal_plane_y_resolution=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['exif']}}}FocalPlaneYResolution")
-            ),
-            focal_plane_resolution_unit=int(
-                description.get(
-                    f"{{{self.NAMESPACES['exif']}}}FocalPlaneResolutionUnit", "0"
-                )
-            ),
-            custom_rendered=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}CustomRendered", "0")
-            ),
-            scene_capture_type=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}SceneCaptureType", "0")
-            ),
-            contrast=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}Contrast", "0")
-            ),
-            saturation=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}Saturation", "0")
-            ),
-            sharpness=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}Sharpness", "0")
-            ),
-            file_source=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}FileSource", "0")
-            ),
-            scene_type=int(
-                description.get(f"{{{self.NAMESPACES['exif']}}}SceneType", "0")
-            ),
-            exif_version=description.get(f"{{{self.NAMESPACES['exif']}}}ExifVersion"),
-            date_time_original=self.parse_datetime(
-                description.get(f"{{{self.NAMESPACES['exif']}}}DateTimeOriginal")
-            ),
-            # ExifInfoの追加フィールド
-            date_time_digitized=self.parse_datetime(
-                description.get(f"{{{self.NAMESPACES['exif']}}}DateTimeDigitized")
-            ),
-        )
+    @staticmethod
+    def _read_stream(fp: BinaryIO, plan: ParsePlan) -> _Description | None:
+        """ファイルを逐次パースし、必要な要素が揃った時点で読み込みを打ち切る。
 
-        iso_elem = description.find(
-            ".//exif:ISOSpeedRatings/rdf:Seq/rdf:li", self.NAMESPACES
-        )
-        if iso_elem is not None and iso_elem.text:
-            metadata.exif_info.iso_speed_ratings = [int(iso_elem.text)]
-
-        flash_elem = description.find(".//exif:Flash", self.NAMESPACES)
-        if flash_elem is not None:
-            metadata.flash_info = FlashInfo(
-                fired=flash_elem.get(
-                    f"{{{self.NAMESPACES['exif']}}}Fired", "False"
-                ).lower()
-                == "true",
-                return_mode=int(
-                    flash_elem.get(f"{{{self.NAMESPACES['exif']}}}Return", "0")
-                ),
-                mode=int(flash_elem.get(f"{{{self.NAMESPACES['exif']}}}Mode", "0")),
-                function=flash_elem.get(
-                    f"{{{self.NAMESPACES['exif']}}}Function", "False"
-                ).lower()
-                == "true",
-                red_eye_mode=flash_elem.get(
-                    f"{{{self.NAMESPACES['exif']}}}RedEyeMode", "False"
-                ).lower()
-                == "true",
-            )
-
-        metadata.lens_info = LensInfo(
-            lens_info=description.get(f"{{{self.NAMESPACES['aux']}}}LensInfo"),
-            lens=description.get(f"{{{self.NAMESPACES['aux']}}}Lens"),
-            lens_model=description.get(f"{{{self.NAMESPACES['exifEX']}}}LensModel"),
-            lens_distort_info=description.get(
-                f"{{{self.NAMESPACES['aux']}}}LensDistortInfo"
-            ),
-            # LensInfoの追加フィールド
-            lens_serial_number=description.get(
-                f"{{{self.NAMESPACES['aux']}}}LensSerialNumber"
-            ),
+        rdf:Descriptionの開始タグの属性を取得した後は、計画に含まれる子要素のみを
+        保持し、それ以外の子要素（xmpMM:Historyやcrs:のマスク等）は読み終えた
+        時点で破棄する。必要な子要素がすべて揃うか、rdf:Descriptionが閉じた時点で
+        以降のファイル読み込みを行わない。
+        """
+        events = _iter_events(fp)
+        description = next(
+            (
+                elem
+                for event, elem in events
+                if event == "start" and elem.tag == RDF_DESCRIPTION
+            ),
+            None,
         )
+        if description is None:
+            return None
 
-        metadata.photoshop_info = PhotoshopInfo(
-            date_created=self.parse_datetime(
-                description.get(f"{{{self.NAMESPACES['photoshop']}}}DateCreated")
-            ),
-            sidecar_for_extension=description.get(
-                f"{{{self.NAMESPACES['photoshop']}}}SidecarForExtension"
-            ),
-            embedded_xmp_digest=description.get(
-                f"{{{self.NAMESPACES['photoshop']}}}EmbeddedXMPDigest"
-            ),
-            # 追加フィールド
-            color_mode=int(
-                description.get(f"{{{self.NAMESPACES['photoshop']}}}ColorMode", "0")
-            )
-            if description.get(f"{{{self.NAMESPACES['photoshop']}}}ColorMode")
-            else None,
-            icc_profile=description.get(
-                f"{{{self.NAMESPACES['photoshop']}}}ICCProfile"
-            ),
-        )
+        pending = set(plan.elements)
+        children: dict[str, ET.Element] = {}
+        if not pending:
+            return description.attrib, children
+
+        for event, elem in events:
+            if event != "end":
+                continue
+            if elem is description:
+                break
+            if elem.tag in pending:
+                pending.discard(elem.tag)
+                children[elem.tag] = elem
+                if not pending:
+                    break
+            elif len(description) and description[-1] is elem:
+                # 不要な直下の子要素はサブツリーごと破棄してメモリを解放する
+                description.remove(elem)
+        return description.attrib, children
+
+    def parse_many(
+        self,
+        paths: Iterable[str | Path],
+        fields: Iterable[str] | None = None,
+        workers: int | None = None,
+        executor: ExecutorKind = "process",
+        ordered: bool = True,
+        chunk_size: int = 64,
+    ) -> Iterator[tuple[Path, XMPMetadata | Exception]]:
+        """複数のXMPファイルを並列にパースし、結果を逐次返す。
+
+        パスはchunk_size件ずつのチャンクに分けてワーカーに渡され、
+        実行中のチャンク数はワーカー数の2倍までに制限されます。
+        プロセスプールの場合、結果はXMPMetadata.to_tupleの形式で転送され、
+        呼び出し側のプロセスで復元されます。
 
-        metadata.camera_raw_settings = CameraRawSettings(
-            crop_top=float(
-                description.get(f"{{{self.NAMESPACES['crs']}}}CropTop", "0")
-            ),
-            crop_left=float(
-                description.get(f"{{{self.NAMESPACES['crs']}}}CropLeft", "0")
-            ),
-            crop_bottom=float(
-                description.get(f"{{{self.NAMESPACES['crs']}}}CropBottom", "1")
-            ),
-            crop_right=float(
-                description.get(f"{{{self.NAMESPACES['crs']}}}CropRight", "1")
-            ),
-            crop_angle=float(
-                description.get(f"{{{self.NAMESPACES['crs']}}}CropAngle", "0")
-            ),
-            crop_constrain_to_warp=int(
-                description.get(f"{{{self.NAMESPACES['crs']}}}CropConstrainToWarp", "0")
-            ),
-            crop_constrain_to_unit_square=int(
-                description.get(
-                    f"{{{self.NAMESPACES['crs']}}}CropConstrainToUnitSquare", "1"
-                )
-            ),
-            has_crop=description.get(
-                f"{{{self.NAMESPACES['crs']}}}HasCrop", "False"
-            ).lower()
-            == "true",
-            already_applied=description.get(
-                f"{{{self.NAMESPACES['crs']}}}AlreadyApplied", "False"
-            ).lower()
-            == "true",
-            raw_file_name=description.get(f"{{{self.NAMESPACES['crs']}}}RawFileName"),
-            camera_profile=description.get(
-                f"{{{self.NAMESPACES['crd']}}}CameraProfile"
-            ),
-            look_name=description.get(f"{{{self.NAMESPACES['crd']}}}LookName"),
-            # Camera Rawバージョン情報を追加
-            version=description.get(f"{{{self.NAMESPACES['crs']}}}Version"),
-            process_version=description.get(
-                f"{{{self.NAMESPACES['crs']}}}ProcessVersion"
-            ),
-            # 調整パラメータを追加
-            exposure=self.parse_fraction(
-                description.get(f"{{{self.NAMESPACES['crs']}}}Exposure2012")
-            ),
-            contrast=int(
-                description.get(f"{{{self.NAMESPACES['crs']}}}Contrast2012", "0")
-            )
-            if description.get(f"{{{self.NAMESPACES['crs']}}}Contrast2012")
-            else None,
-            highlights=int(
-                description.get(f"{{{self.NAMESPACES['crs']}}}Highlights2012", "0")
-            )
-            if description.get(f"{{{self.NAMESPACES['crs']}}}Highlights2012")
-            else None,
-            shadows=int(
-                description.get(f"{{{self.NAMESPACES['crs']}}}Shadows2012", "0")
-            )
-            if description.get(f"{{{self.NAMESPACES['crs']}}}Shadows2012")
-            else None,
-            whites=int(description.get(f"{{{self.NAMESPACES['crs']}}}Whites2012", "0"))
-            if description.get(f"{{{self.NAMESPACES['crs']}}}Whites2012")
-            else None,
-            blacks=int(description.get(f"{{{self.NAMESPACES['crs']}}}Blacks2012", "0"))
-            if description.get(f"{{{self.NAMESPACES['crs']}}}Blacks2012")
-            else None,
-            clarity=int(
-                description.get(f"{{{self.NAMESPACES['crs']}}}Clarity2012", "0")
-            )
-            if description.get(f"{{{self.NAMESPACES['crs']}}}Clarity2012")
-            else None,
-            vibrance=int(description.get(f"{{{self.NAMESPACES['crs']}}}Vibrance", "0"))
-            if description.get(f"{{{self.NAMESPACES['crs']}}}Vibrance")
-            else None,
-            saturation=int(
-                description.get(f"{{{self.NAMESPACES['crs']}}}Saturation", "0")
-            )
-            if description.get(f"{{{self.NAMESPACES['crs']}}}Saturation")
-            else None,
-        )
+        Args:
+            paths: XMPファイルのパス（ジェネレータも可）
+            fields: 取得するフィールド名の集合（parseと同じ）
+            workers: ワーカー数。Noneの場合はCPU数。1の場合は並列化しない。
+            executor: "process"（プロセスプール）または"thread"（スレッドプール）
+            ordered: Trueの場合は入力順に結果を返す。
+                Falseの場合は完了したチャンクから順に返す。
+            chunk_size: 1回のタスクでパースするファイル数
+
+        Yields:
+            (パス, XMPMetadata)のタプル。パースに失敗したファイルは
+            (パス, 例外)のタプルとして返され、処理は継続される。
 
-        # Dublin Core情報の拡張
-        metadata.dublin_core_info = DublinCoreInfo(
-            format=description.get(f"{{{self.NAMESPACES['dc']}}}format"),
-            title=description.get(f"{{{self.NAMESPACES['dc']}}}title"),
-            description=description.get(f"{{{self.NAMESPACES['dc']}}}description"),
-            rights=description.get(f"{{{self.NAMESPACES['dc']}}}rights"),
-        )
+        Raises:
+            ValueError: 未知のフィールド名や引数が指定された場合
+        """
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown executor: {executor}")
+        fields = None if fields is None else frozenset(fields)
+        self.plan(fields)  # フィールド名をワーカーに渡す前に検証する
+
+        workers = workers or os.cpu_count() or 1
+        chunks = _chunked((Path(path) for path in paths), chunk_size)
+        if workers == 1:
+            for chunk in chunks:
+                yield from _parse_chunk(self, fields, chunk)
+            return
+
+        pool: Executor
+        if executor == "process":
+            pool = ProcessPoolExecutor(max_workers=workers)
+            task = partial(_parse_chunk_compact, self.backend, fields)
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+            task = partial(_parse_chunk, self, fields)
+
+        for path, result in _imap_chunks(pool, task, chunks, workers * 2, ordered):
+            if isinstance(result, tuple):
+                result = self.intern(XMPMetadata.from_tuple(result))
+            yield path, result
 
-        # Dublin Core のリスト要素の処理
-        creator_elem = description.find(".//dc:creator/rdf:Bag/rdf:li", self.NAMESPACES)
-        if creator_elem is not None and creator_elem.text:
-            metadata.dublin_core_info.creator = [creator_elem.text]
+    @staticmethod
+    def build(values: dict[str, dict[str, Any]]) -> XMPMetadata:
+        """セクションごとの属性値からXMPMetadataを組み立てる。
 
-        subject_elems = description.findall(
-            ".//dc:subject/rdf:Bag/rdf:li", self.NAMESPACES
-        )
-        if subject_elems:
-            metadata.dublin_core_info.subject = [
-                elem.text for elem in subject_elems if elem.text
-            ]
-
-        metadata.dynamic_media_info = DynamicMediaInfo(
-            pick=int(description.get(f"{{{self.NAMESPACES['xmpDM']}}}pick", "0")),
-            # 追加フィールド
-            good=description.get(f"{{{self.NAMESPACES['xmpDM']}}}good", "False").lower()
-            == "true"
-            if description.get(f"{{{self.NAMESPACES['xmpDM']}}}good")
-            else None,
-            scene=description.get(f"{{{self.NAMESPACES['xmpDM']}}}scene"),
-        )
+        Args:
+            values: セクション名をキー、属性名と値の辞書を値とする辞書
 
+        Returns:
+            XMPMetadataオブジェクト
+        """
+        metadata = XMPMetadata()
+        for section, kwargs in values.items():
+            setattr(metadata, section, SECTION_TYPES[section](**kwargs))
         return metadata
 
 
+def _chunked(items: Iterable[Path], size: int) -> Iterator[list[Path]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _imap_chunks(
+    pool: Executor,
+    task: Callable[[list[Path]], list[tuple[Path, Any]]],
+    chunks: Iterator[list[Path]],
+    max_in_flight: int,
+    ordered: bool,
+) -> Iterator[tuple[Path, Any]]:
+    """チャンクをプールで処理し、実行中のタスク数を制限しながら結果を返す。"""
+
+    def submit() -> None:
+        chunk = next(chunks, None)
+        if chunk is not None:
+            in_flight.append(pool.submit(task, chunk))
+
+    in_flight: deque[Future] = deque()
+    try:
+        for _ in range(max_in_flight):
+            submit()
+        while in_flight:
+            if ordered:
+                future = in_flight.popleft()
+            else:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                in_flight.remove(future)
+            yield from future.result()
+            submit()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _parse_chunk(
+    parser: XMPParser, fields: frozenset[str] | None, paths: list[Path]
+) -> list[tuple[Path, XMPMetadata | Exception]]:
+    results: list[tuple[Path, XMPMetadata | Exception]] = []
+    for path in paths:
+        try:
+            results.append((path, parser.parse(path, fields)))
+        except PARSE_ERRORS as e:
+            results.append((path, e))
+    return results
+
+
+# ワーカープロセス内で再利用するパーサー（パース計画のキャッシュを保持するため）
+_worker_parsers: dict[str, XMPParser] = {}
+
+
+def _parse_chunk_compact(
+    backend: Backend, fields: frozenset[str] | None, paths: list[Path]
+) -> list[tuple[Path, tuple | Exception]]:
+    parser = _worker_parsers.get(backend)
+    if parser is None:
+        parser = _worker_parsers[backend] = XMPParser(backend)
+    return [
+        (path, result.to_tuple() if isinstance(result, XMPMetadata) else result)
+        for path, result in _parse_chunk(parser, fields, paths)
+    ]
+
+
+def _attr(
+    section: str,
+    name: str,
+    prefix: str,
+    local: str,
+    convert: Callable[[Any], Any],
+    interned: bool = False,
+) -> XMPField:
+    return XMPField(section, name, convert, key=qname(prefix, local), interned=interned)
+
+
+_datetime = XMPParser.parse_datetime
+_fraction = XMPParser.parse_fraction
+_int0 = _as_int("0")
+_float0 = _as_float("0")
+_float1 = _as_float("1")
+
+# XMPMetadataの全フィールドとXMP上の格納位置の対応表
+XMP_FIELDS: tuple[XMPField, ...] = (
+    # XMP基本情報
+    _attr("xmp_info", "creator_tool", "xmp", "CreatorTool", _as_str, interned=True),
+    _attr("xmp_info", "modify_date", "xmp", "ModifyDate", _datetime),
+    _attr("xmp_info", "create_date", "xmp", "CreateDate", _datetime),
+    _attr("xmp_info", "metadata_date", "xmp", "MetadataDate", _datetime),
+    _attr("xmp_info", "rating", "xmp", "Rating", _as_optional_int),
+    _attr("xmp_info", "label", "xmp", "Label", _as_str, interned=True),
+    # ドキュメント管理情報
+    _attr("document_info", "document_id", "xmpMM", "DocumentID", _as_str),
+    _attr("document_info", "instance_id", "xmpMM", "InstanceID", _as_str),
+    _attr(
+        "document_info", "preserved_file_name", "xmpMM", "PreservedFileName", _as_str
+    ),
+    _attr(
+        "document_info", "original_document_id", "xmpMM", "OriginalDocumentID", _as_str
+    ),
+    # TIFF関連情報
+    _attr("tiff_info", "make", "tiff", "Make", _as_str, interned=True),
+    _attr("tiff_info", "model", "tiff", "Model", _as_str, interned=True),
+    _attr("tiff_info", "orientation", "tiff", "Orientation", _as_int("1")),
+    _attr("tiff_info", "image_width", "tiff", "ImageWidth", _int0),
+    _attr("tiff_info", "image_length", "tiff", "ImageLength", _int0),
+    _attr("tiff_info", "x_resolution", "tiff", "XResolution", _fraction),
+    _attr("tiff_info", "y_resolution", "tiff", "YResolution", _fraction),
+    _attr("tiff_info", "resolution_unit", "tiff", "ResolutionUnit", _as_optional_int),
+    # EXIF撮影情報
+    _attr("exif_info", "exposure_time", "exif", "ExposureTime", _as_str, interned=True),
+    _attr("exif_info", "shutter_speed_value", "exif", "ShutterSpeedValue", _fraction),
+    _attr("exif_info", "f_number", "exif", "FNumber", _fraction),
+    _attr("exif_info", "aperture_value", "exif", "ApertureValue", _fraction),
+    _attr("exif_info", "exposure_program", "exif", "ExposureProgram", _int0),
+    _attr("exif_info", "exposure_mode", "exif", "ExposureMode", _int0),
+    _attr("exif_info", "exposure_bias_value", "exif", "ExposureBiasValue", _fraction),
+    _attr(
+        "exif_info",
+        "recommended_exposure_index",
+        "exif",
+        "RecommendedExposureIndex",
+        _int0,
+    ),
+    _attr("exif_info", "sensitivity_type", "exif", "SensitivityType", _int0),
+    _attr("exif_info", "metering_mode", "exif", "MeteringMode", _int0),
+    _attr("exif_info", "light_source", "exif", "LightSource", _int0),
+    _attr("exif_info", "white_balance", "exif", "WhiteBalance", _int0),
+    _attr("exif_info", "brightness_value", "exif", "BrightnessValue", _fraction),
+    _attr("exif_info", "focal_length", "exif", "FocalLength", _fraction),
+    _attr(
+        "exif_info", "focal_length_in_35mm_film", "exif", "FocalLengthIn35mmFilm", _int0
+    ),
+    _attr("exif_info", "max_aperture_value", "exif", "MaxApertureValue", _fraction),
+    _attr("exif_info", "digital_zoom_ratio", "exif", "DigitalZoomRatio", _fraction),
+    _attr("exif_info", "pixel_x_dimension", "exif", "PixelXDimension", _int0),
+    _attr("exif_info", "pixel_y_dimension", "exif", "PixelYDimension", _int0),
+    _attr(
+        "exif_info",
+        "focal_plane_x_resolution",
+        "exif",
+        "FocalPlaneXResolution",
+        _fraction,
+    ),
+    _attr(
+        "exif_info",
+        "focal_plane_y_resolution",
+        "exif",
+        "FocalPlaneYResolution",
+        _fraction,
+    ),
+    _attr(
+        "exif_info",
+        "focal_plane_resolution_unit",
+        "exif",
+        "FocalPlaneResolutionUnit",
+        _int0,
+    ),
+    _attr("exif_info", "custom_rendered", "exif", "CustomRendered", _int0),
+    _attr("exif_info", "scene_capture_type", "exif", "SceneCaptureType", _int0),
+    _attr("exif_info", "contrast", "exif", "Contrast", _int0),
+    _attr("exif_info", "saturation", "exif", "Saturation", _int0),
+    _attr("exif_info", "sharpness", "exif", "Sharpness", _int0),
+    _attr("exif_info", "file_source", "exif", "FileSource", _int0),
+    _attr("exif_info", "scene_type", "exif", "SceneType", _int0),
+    _attr("exif_info", "exif_version", "exif", "ExifVersion", _as_str, interned=True),
+    _attr("exif_info", "date_time_original", "exif", "DateTimeOriginal", _datetime),
+    _attr("exif_info", "date_time_digitized", "exif", "DateTimeDigitized", _datetime),
+    XMPField(
+        "exif_info",
+        "iso_speed_ratings",
+        _first_int,
+        element=qname("exif", "ISOSpeedRatings"),
+        container=qname("rdf", "Seq"),
+    ),
+    # フラッシュ情報（exif:Flash要素の属性）
+    XMPField(
+        "flash_info",
+        "fired",
+        _as_bool,
+        key=qname("exif", "Fired"),
+        element=qname("exif", "Flash"),
+    ),
+    XMPField(
+        "flash_info",
+        "return_mode",
+        _int0,
+        key=qname("exif", "Return"),
+        element=qname("exif", "Flash"),
+    ),
+    XMPField(
+        "flash_info",
+        "mode",
+        _int0,
+        key=qname("exif", "Mode"),
+        element=qname("exif", "Flash"),
+    ),
+    XMPField(
+        "flash_info",
+        "function",
+        _as_bool,
+        key=qname("exif", "Function"),
+        element=qname("exif", "Flash"),
+    ),
+    XMPField(
+        "flash_info",
+        "red_eye_mode",
+        _as_bool,
+        key=qname("exif", "RedEyeMode"),
+        element=qname("exif", "Flash"),
+    ),
+    # レンズ情報
+    _attr("lens_info", "lens_info", "aux", "LensInfo", _as_str, interned=True),
+    _attr("lens_info", "lens", "aux", "Lens", _as_str, interned=True),
+    _attr("lens_info", "lens_model", "exifEX", "LensModel", _as_str, interned=True),
+    _attr(
+        "lens_info",
+        "lens_distort_info",
+        "aux",
+        "LensDistortInfo",
+        _as_str,
+        interned=True,
+    ),
+    _attr("lens_info", "lens_serial_number", "aux", "LensSerialNumber", _as_str),
+    # Photoshop/Adobe関連情報
+    _attr("photoshop_info", "date_created", "photoshop", "DateCreated", _datetime),
+    _attr(
+        "photoshop_info",
+        "sidecar_for_extension",
+        "photoshop",
+        "SidecarForExtension",
+        _as_str,
+        interned=True,
+    ),
+    _attr(
+        "photoshop_info",
+        "embedded_xmp_digest",
+        "photoshop",
+        "EmbeddedXMPDigest",
+        _as_str,
+    ),
+    _attr("photoshop_info", "color_mode", "photoshop", "ColorMode", _as_optional_int),
+    _attr(
+        "photoshop_info",
+        "icc_profile",
+        "photoshop",
+        "ICCProfile",
+        _as_str,
+        interned=True,
+    ),
+    # Camera Raw（Lightroom）設定
+    _attr("camera_raw_settings", "crop_top", "crs", "CropTop", _float0),
+    _attr("camera_raw_settings", "crop_left", "crs", "CropLeft", _float0),
+    _attr("camera_raw_settings", "crop_bottom", "crs", "CropBottom", _float1),
+    _attr("camera_raw_settings", "crop_right", "crs", "CropRight", _float1),
+    _attr("camera_raw_settings", "crop_angle", "crs", "CropAngle", _float0),
+    _attr(
+        "camera_raw_settings",
+        "crop_constrain_to_warp",
+        "crs",
+        "CropConstrainToWarp",
+        _int0,
+    ),
+    _attr(
+        "camera_raw_settings",
+        "crop_constrain_to_unit_square",
+        "crs",
+        "CropConstrainToUnitSquare",
+        _as_int("1"),
+    ),
+    _attr("camera_raw_settings", "has_crop", "crs", "HasCrop", _as_bool),
+    _attr("camera_raw_settings", "already_applied", "crs", "AlreadyApplied", _as_bool),
+    _attr("camera_raw_settings", "raw_file_name", "crs", "RawFileName", _as_str),
+    _attr(
+        "camera_raw_settings",
+        "camera_profile",
+        "crd",
+        "CameraProfile",
+        _as_str,
+        interned=True,
+    ),
+    _attr(
+        "camera_raw_settings", "look_name", "crd", "LookName", _as_str, interned=True
+    ),
+    _attr("camera_raw_settings", "version", "crs", "Version", _as_str, interned=True),
+    _attr(
+        "camera_raw_settings",
+        "process_version",
+        "crs",
+        "ProcessVersion",
+        _as_str,
+        interned=True,
+    ),
+    _attr("camera_raw_settings", "exposure", "crs", "Exposure2012", _fraction),
+    _attr("camera_raw_settings", "contrast", "crs", "Contrast2012", _as_optional_int),
+    _attr(
+        "camera_raw_settings", "highlights", "crs", "Highlights2012", _as_optional_int
+    ),
+    _attr("camera_raw_settings", "shadows", "crs", "Shadows2012", _as_optional_int),
+    _attr("camera_raw_settings", "whites", "crs", "Whites2012", _as_optional_int),
+    _attr("camera_raw_settings", "blacks", "crs", "Blacks2012", _as_optional_int),
+    _attr("camera_raw_settings", "clarity", "crs", "Clarity2012", _as_optional_int),
+    _attr("camera_raw_settings", "vibrance", "crs", "Vibrance", _as_optional_int),
+    _attr("camera_raw_settings", "saturation", "crs", "Saturation", _as_optional_int),
+    # Dublin Coreメタデータ
+    _attr("dublin_core_info", "format", "dc", "format", _as_str, interned=True),
+    _attr("dublin_core_info", "title", "dc", "title", _as_str),
+    _attr("dublin_core_info", "description", "dc", "description", _as_str),
+    _attr("dublin_core_info", "rights", "dc", "rights", _as_str),
+    XMPField(
+        "dublin_core_info",
+        "creator",
+        _first_text,
+        element=qname("dc", "creator"),
+        container=qname("rdf", "Bag"),
+    ),
+    XMPField(
+        "dublin_core_info",
+        "subject",
+        _all_texts,
+        element=qname("dc", "subject"),
+        container=qname("rdf", "Bag"),
+    ),
+    # Dynamic Media情報
+    _attr("dynamic_media_info", "pick", "xmpDM", "pick", _int0),
+    _attr("dynamic_media_info", "good", "xmpDM", "good", _as_optional_bool),
+    _attr("dynamic_media_info", "scene", "xmpDM", "scene", _as_str),
+)
+
+FIELD_NAMES: frozenset[str] = frozenset(spec.path for spec in XMP_FIELDS)
+
+INTERNED_FIELDS: tuple[XMPField, ...] = tuple(
+    spec for spec in XMP_FIELDS if spec.interned
+)
+
+
 if __name__ == "__main__":
     from lrutility.utils.logger import configure_loguru
 
@@ -461,3 +892,7 @@ if __name__ == "__main__":
     metadata = parser.parse(not_rating_xmp_file)
     logger.info(f"RawImageName: {metadata.camera_raw_settings.raw_file_name}")
     logger.info(f"Rating: {metadata.xmp_info.rating}")
+
+    # 必要なフィールドのみを取得する例
+    metadata = parser.parse(rating_xmp_file, fields={"xmp_info.rating"})
+    logger.info(f"Rating (projected): {metadata.xmp_info.rating}")
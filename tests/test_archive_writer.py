@@ -0,0 +1,78 @@
+import io
+import os
+import tarfile
+import zipfile
+import zlib
+from pathlib import Path
+
+import pytest
+
+from lrutility.archive.ArchiveWriter import ArchiveWriter, StreamSink, open_writer
+from lrutility.archive.checksums import new_hasher
+
+
+class TestArchiveWriter:
+    """アーカイブの形式ごとの書き込みのテストクラス。"""
+
+    def _make_members(self, root: Path) -> list[tuple[Path, str]]:
+        members = []
+        for name, data in (
+            ("IMG_0001.ARW", os.urandom(20000)),
+            ("IMG_0001.xmp", b"<x:xmpmeta/>" * 100),
+            ("empty.txt", b""),
+        ):
+            path = root / name
+            path.write_bytes(data)
+            members.append((path, f"sub/{name}"))
+        return members
+
+    @pytest.mark.parametrize("archive_format", ["tar", "tar.gz", "tar.xz"])
+    def test_tar_roundtrip(self, tmp_path: Path, archive_format: str) -> None:
+        """tar形式で書き込んだ内容と、書き込み時のCRC32・ハッシュ値を確認。"""
+        members = self._make_members(tmp_path)
+        stream = io.BytesIO()
+        progress: list[int] = []
+        with open_writer(archive_format, StreamSink(stream), "sha256") as writer:  # type: ignore[arg-type]
+            writer.write(members, progress.append)
+
+        stream.seek(0)
+        with tarfile.open(fileobj=stream, mode="r:*") as tar:
+            assert tar.getnames() == [arcname for _, arcname in members]
+            for path, arcname in members:
+                data = path.read_bytes()
+                assert tar.extractfile(arcname).read() == data  # type: ignore[union-attr]
+                assert writer.crcs[arcname] == zlib.crc32(data)
+                hasher = new_hasher("sha256")
+                hasher.update(data)
+                assert writer.digests[arcname] == hasher.hexdigest()
+        assert sum(progress) == sum(path.stat().st_size for path, _ in members)
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_zip_unseekable(self, tmp_path: Path, threads: int) -> None:
+        """シークできない書き込み先に連結したZIPをそれぞれ読み込めることを確認。"""
+        members = self._make_members(tmp_path)
+        stream = io.BytesIO()
+        sizes = []
+        for _ in range(2):
+            with open_writer(
+                "zip", StreamSink(stream), threads=threads, memory_budget=4096
+            ) as writer:
+                writer.write(members)
+            sizes.append(stream.tell())
+
+        first = io.BytesIO(stream.getvalue()[: sizes[0]])
+        second = io.BytesIO(stream.getvalue()[sizes[0] :])
+        for archive in (first, second):
+            with zipfile.ZipFile(archive) as zf:
+                assert zf.testzip() is None
+                for path, arcname in members:
+                    assert zf.read(arcname) == path.read_bytes()
+                    assert zf.getinfo(arcname).flag_bits & 0x08
+        assert writer.crcs == {
+            arcname: zlib.crc32(path.read_bytes()) for path, arcname in members
+        }
+
+    def test_base_is_abstract(self) -> None:
+        """基底クラスはwrite・closeを実装しない限りインスタンス化できないことを確認。"""
+        with pytest.raises(TypeError):
+            ArchiveWriter(io.BytesIO())  # type: ignore[abstract]
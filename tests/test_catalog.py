@@ -0,0 +1,64 @@
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from lrutility.catalog.Catalog import CATALOG_FIELDS, Catalog
+from lrutility.xmp.XMPParser import XMPParser
+
+
+class TestCatalog:
+    """カタログのテストクラス。"""
+
+    def setup_method(self) -> None:
+        """各テストメソッドの前に実行される。"""
+        parser = XMPParser()
+        rating = parser.parse(Path("tests/assets/rating_1.xmp"), CATALOG_FIELDS)
+        not_rating = parser.parse(Path("tests/assets/not_rating.xmp"), CATALOG_FIELDS)
+        rejected = parser.parse(Path("tests/assets/not_rating.xmp"), CATALOG_FIELDS)
+        rejected.dynamic_media_info.pick = -1
+        rejected.xmp_info.label = "Red"
+        self.catalog = Catalog.from_records(
+            [
+                (Path("rating_1.xmp"), rating),
+                (Path("not_rating.xmp"), not_rating),
+                (Path("rejected.xmp"), rejected),
+            ]
+        )
+
+    def test_columns(self) -> None:
+        """各列が期待する型と値で構築されることを確認。"""
+        catalog = self.catalog
+        assert len(catalog) == 3
+        assert catalog["rating"][0] == 1
+        assert np.isnan(catalog["rating"][1])
+        assert catalog["pick"].tolist() == [0, 0, -1]
+        assert catalog["iso"].tolist() == [1250, 1600, 1600]
+        assert catalog["f_number"][0] == pytest.approx(2.8)
+        assert catalog["exposure_time"][0] == pytest.approx(0.01)
+        assert catalog["date_time_original"][0] == np.datetime64(
+            datetime(2025, 8, 10, 19, 8, 27, 397000)
+        )
+        assert catalog.decode("make", 0) == "SONY"
+        assert catalog.decode("label", 0) is None
+        assert catalog.decode("label", 2) == "Red"
+
+    def test_mask(self) -> None:
+        """ベクトル演算による絞り込みの結果を確認。"""
+        catalog = self.catalog
+        mask = (catalog["rating"] <= 1) | (catalog["pick"] == -1)
+        assert catalog.select(mask) == [Path("rating_1.xmp"), Path("rejected.xmp")]
+
+        lens = catalog.equals("lens", "FE 70-200mm F2.8 GM OSS II")
+        assert lens.all()
+        assert not catalog.equals("lens", "unknown").any()
+        assert catalog.select(catalog.isin("label", ["Red", "Blue"])) == [
+            Path("rejected.xmp")
+        ]
+        assert catalog.equals("label", None).tolist() == [True, True, False]
+
+    def test_unknown_column(self) -> None:
+        """未知の列名に対してKeyErrorが発生することを確認。"""
+        with pytest.raises(KeyError, match="Unknown catalog column"):
+            self.catalog["unknown"]
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from lrutility.archive.checksums import (
+    checksum_path,
+    read_checksums,
+    verify_archives,
+    write_checksums,
+)
+from lrutility.cli.zip_chunker import write_archive
+
+
+class TestChecksums:
+    """アーカイブのチェックサムの作成と検証のテストクラス。"""
+
+    def _make_files(self, root: Path) -> list[Path]:
+        directory = root / "shoot"
+        directory.mkdir()
+        paths = []
+        for i, data in enumerate([os.urandom(5000), b"<x:xmpmeta/>" * 500, b""]):
+            path = directory / f"IMG_{i}.dat"
+            path.write_bytes(data)
+            paths.append(path)
+        return paths
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    @pytest.mark.parametrize("algorithm", ["sha256", "blake2b"])
+    def test_write_archive_hashes(
+        self, tmp_path: Path, threads: int, algorithm: str
+    ) -> None:
+        """書き込みと同時に計算したハッシュ値が元ファイルのハッシュ値と一致することを確認。"""
+        paths = self._make_files(tmp_path)
+        archive = tmp_path / "shoot_1.zip"
+        members = [(path, path.name) for path in paths]
+        write_archive(archive, members, threads=threads, hash_algorithm=algorithm)
+
+        digests = read_checksums(checksum_path(archive, algorithm))
+        assert digests == {
+            path.name: hashlib.new(algorithm, path.read_bytes()).hexdigest()
+            for path in paths
+        }
+        [result] = verify_archives([archive])
+        assert result.ok
+        assert result.verified == len(paths)
+
+    def test_verify_detects_problems(self, tmp_path: Path) -> None:
+        """内容の不一致・欠落・未記載のメンバーを検出することを確認。"""
+        archive = tmp_path / "out.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("a.txt", b"a")
+            zf.writestr("b.txt", b"b")
+            zf.writestr("extra.txt", b"extra")
+        write_checksums(
+            archive,
+            "sha256",
+            {
+                "a.txt": hashlib.sha256(b"a").hexdigest(),
+                "b.txt": hashlib.sha256(b"changed").hexdigest(),
+                "gone.txt": hashlib.sha256(b"gone").hexdigest(),
+            },
+        )
+
+        [result] = verify_archives([archive], workers=2)
+        assert not result.ok
+        assert result.verified == 1
+        assert list(result.mismatched) == ["b.txt"]
+        assert result.missing == ["gone.txt"]
+        assert result.unlisted == ["extra.txt"]
+
+    def test_opens_one_archive_at_a_time(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """多数のアーカイブを検証する場合も、同時に開くアーカイブは1つであることを確認。"""
+        archives = []
+        for i in range(5):
+            archive = tmp_path / f"out_{i}.zip"
+            with zipfile.ZipFile(archive, "w") as zf:
+                zf.writestr("a.txt", b"a")
+            write_checksums(
+                archive, "sha256", {"a.txt": hashlib.sha256(b"a").hexdigest()}
+            )
+            archives.append(archive)
+
+        opened = []
+        peak = []
+
+        class CountingZipFile(zipfile.ZipFile):
+            def __init__(self, *args: object, **kwargs: object) -> None:
+                super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+                opened.append(self)
+                peak.append(sum(zf.fp is not None for zf in opened))
+
+        monkeypatch.setattr(zipfile, "ZipFile", CountingZipFile)
+        results = verify_archives(archives, workers=2)
+        assert all(result.ok for result in results)
+        assert max(peak) == 1
+
+    def test_missing_checksum_file(self, tmp_path: Path) -> None:
+        """チェックサムファイルがない場合にFileNotFoundErrorを送出することを確認。"""
+        archive = tmp_path / "out.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("a.txt", b"a")
+        with pytest.raises(FileNotFoundError):
+            verify_archives([archive])
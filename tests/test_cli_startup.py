@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# lrutility.cli.cliの読み込みにかかる時間のうち、typerを除いた分の上限（マイクロ秒）
+IMPORT_BUDGET_US = 50_000
+
+# 起動時（--helpや補完）に読み込んではならないモジュール
+HEAVY_MODULES = {
+    "loguru",
+    "numpy",
+    "sqlite3",
+    "tarfile",
+    "tqdm",
+    "xml.etree.ElementTree",
+    "zipfile",
+    "lrutility.cli.cull",
+    "lrutility.cli.zip_chunker",
+    "lrutility.xmp.XMPParser",
+}
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """python -X importtimeでstatementを実行し、モジュールごとの累積時間を返す。"""
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestCliStartup:
+    """CLIの起動時間のテストクラス。"""
+
+    def test_no_heavy_imports(self) -> None:
+        """CLIの読み込み時にコマンドの実装と重い依存を読み込まないことを確認。"""
+        times = import_times("import lrutility.cli.cli")
+        assert "lrutility.cli.cli" in times
+        assert HEAVY_MODULES.isdisjoint(times)
+
+    def test_import_budget(self) -> None:
+        """typerを除いたCLIの読み込み時間が予算内であることを確認（3回の最小値）。"""
+        elapsed = []
+        for _ in range(3):
+            times = import_times("import lrutility.cli.cli")
+            elapsed.append(times["lrutility.cli.cli"] - times.get("typer", 0))
+        assert min(elapsed) < IMPORT_BUDGET_US
+
+    def test_help_imports_no_commands(self) -> None:
+        """コマンドのヘルプの表示時にコマンドの実装を読み込まないことを確認。"""
+        times = import_times(
+            "from lrutility.cli.cli import app; "
+            "app(['zip-chunker', '--help'], standalone_mode=False)"
+        )
+        loaded = {name for name in times if name.startswith("lrutility.")}
+        assert loaded == {"lrutility.cli", "lrutility.cli.cli", "lrutility.options"}
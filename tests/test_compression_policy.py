@@ -0,0 +1,38 @@
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from lrutility.archive.CompressionPolicy import CompressionPolicy
+
+
+class TestCompressionPolicy:
+    """圧縮方式の選択のテストクラス。"""
+
+    def _write(self, path: Path, data: bytes) -> Path:
+        path.write_bytes(data)
+        return path
+
+    def test_known_suffixes(self, tmp_path: Path) -> None:
+        """拡張子による選択（大文字小文字を区別しない）を確認。"""
+        policy = CompressionPolicy()
+        assert policy.choose(tmp_path / "IMG_0001.ARW", 10**8) == zipfile.ZIP_STORED
+        assert policy.choose(tmp_path / "IMG_0001.jpg", 10**7) == zipfile.ZIP_STORED
+        assert policy.choose(tmp_path / "IMG_0001.xmp", 10**4) == zipfile.ZIP_DEFLATED
+
+    def test_trial_compression(self, tmp_path: Path) -> None:
+        """未知の形式は試験圧縮の結果で選択することを確認。"""
+        policy = CompressionPolicy()
+        noise = self._write(tmp_path / "noise.bin", os.urandom(300_000))
+        text = self._write(tmp_path / "text.bin", b"exif:FNumber 28/10\n" * 20_000)
+        assert policy.choose(noise, noise.stat().st_size) == zipfile.ZIP_STORED
+        assert policy.choose(text, text.stat().st_size) == zipfile.ZIP_DEFLATED
+
+    def test_fixed_modes(self, tmp_path: Path) -> None:
+        """deflate/storeモードは拡張子によらず同じ方式とすることを確認。"""
+        path = tmp_path / "IMG_0001.ARW"
+        assert CompressionPolicy("deflate").choose(path, 1) == zipfile.ZIP_DEFLATED
+        assert CompressionPolicy("store").choose(path, 1) == zipfile.ZIP_STORED
+        with pytest.raises(ValueError):
+            CompressionPolicy("lzma")  # type: ignore[arg-type]
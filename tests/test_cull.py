@@ -0,0 +1,55 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from lrutility.cli.cull import cull
+from lrutility.deletion.Deleter import Deleter
+
+ASSETS = Path("tests/assets")
+
+
+class TestCull:
+    """条件を指定した画像ファイル削除のテストクラス。"""
+
+    def _make_library(self, root: Path) -> Path:
+        xmp_path = root / "rating_1.xmp"
+        shutil.copy(ASSETS / "rating_1.xmp", xmp_path)
+        (root / "rating_1.ARW").write_bytes(b"raw")
+        return xmp_path
+
+    def test_deleter_error_propagates(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """削除の準備に失敗した場合、その例外がそのまま送出されることを確認。"""
+        self._make_library(tmp_path)
+
+        def fail(self: Deleter) -> Deleter:
+            raise PermissionError("trash is not writable")
+
+        monkeypatch.setattr(Deleter, "__enter__", fail)
+        with pytest.raises(PermissionError):
+            cull(tmp_path, "rating == 1", False, False, use_index=True)
+        assert (tmp_path / "rating_1.ARW").exists()
+
+    def test_keeps_image_companions(self, tmp_path: Path) -> None:
+        """既定では同じファイル名のJPEG・DNGを残し、.dop等のみ削除することを確認。"""
+        xmp_path = self._make_library(tmp_path)
+        for name in ("rating_1.JPG", "rating_1.dng", "rating_1.ARW.dop"):
+            (tmp_path / name).write_bytes(b"x")
+
+        cull(tmp_path, "rating == 1", False, False)
+
+        remaining = sorted(path.name for path in tmp_path.iterdir())
+        assert remaining == [".lrutility", "rating_1.JPG", "rating_1.dng"]
+        assert not xmp_path.exists()
+
+    def test_with_companions(self, tmp_path: Path) -> None:
+        """with_companionsを指定した場合、同じファイル名の画像も削除することを確認。"""
+        self._make_library(tmp_path)
+        for name in ("rating_1.JPG", "rating_1.dng"):
+            (tmp_path / name).write_bytes(b"x")
+
+        cull(tmp_path, "rating == 1", False, False, with_companions=True)
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [".lrutility"]
@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import pytest
+
+from lrutility.deletion.Deleter import Deleter, restore, trash_dir
+from lrutility.deletion.DeletionJournal import DeletionJournal
+
+
+class TestDeleter:
+    """削除エンジンとジャーナルのテストクラス。"""
+
+    def _make_groups(self, root: Path, count: int) -> list[list[Path]]:
+        groups = []
+        for i in range(count):
+            group = [
+                root / "sub" / f"IMG_{i:04d}.ARW",
+                root / "sub" / f"IMG_{i:04d}.xmp",
+            ]
+            for path in group:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(b"x" * 10)
+            groups.append(group)
+        return groups
+
+    def test_unlink_batches(self, tmp_path: Path) -> None:
+        """複数バッチに分かれる件数のファイルを削除し、結果を集計することを確認。"""
+        groups = self._make_groups(tmp_path, 150)
+        journal = DeletionJournal(tmp_path, "run")
+        with Deleter(tmp_path, journal=journal, workers=4) as deleter:
+            for group in groups:
+                deleter.submit(group, [10, 10])
+
+        assert deleter.summary.files == 300
+        assert deleter.summary.bytes == 3000
+        assert len(deleter.summary.completed) == 150
+        assert not any((tmp_path / "sub").iterdir())
+        state = journal.load()
+        assert len(state.planned) == 150
+        assert len(state.done) == 300
+
+    def test_sizes_without_stat(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """渡されたサイズを集計し、削除時にファイルをstatしないことを確認。"""
+        (group,) = self._make_groups(tmp_path, 1)
+
+        def fail(self: Path, **kwargs: object) -> None:
+            raise AssertionError(f"stat called: {self}")
+
+        monkeypatch.setattr(Path, "stat", fail)
+        with Deleter(tmp_path) as deleter:
+            deleter.submit(group, [7, 3])
+
+        assert deleter.summary.files == 2
+        assert deleter.summary.bytes == 10
+
+    def test_failure_stops_group(self, tmp_path: Path) -> None:
+        """削除に失敗したグループの残りのファイルを削除しないことを確認。"""
+        (tmp_path / "dir.ARW").mkdir()
+        xmp_path = tmp_path / "dir.xmp"
+        xmp_path.write_text("")
+        with Deleter(tmp_path) as deleter:
+            deleter.submit([tmp_path / "dir.ARW", xmp_path])
+
+        assert [path for path, _ in deleter.summary.failed] == [tmp_path / "dir.ARW"]
+        assert deleter.summary.completed == []
+        assert xmp_path.exists()
+
+    def test_trash_and_rollback(self, tmp_path: Path) -> None:
+        """ゴミ箱への移動と、ジャーナルからのロールバックを確認。"""
+        (group,) = self._make_groups(tmp_path, 1)
+        journal = DeletionJournal(tmp_path, "run")
+        with Deleter(tmp_path, mode="trash", journal=journal) as deleter:
+            deleter.submit(group)
+
+        assert not group[0].exists()
+        assert (trash_dir(tmp_path, "run") / "sub" / group[0].name).exists()
+
+        summary = restore(tmp_path, journal.load(), journal)
+        assert summary.files == 2
+        assert all(path.exists() for path in group)
+        assert journal.load().trashed() == []
+
+    def test_resume_pending(self, tmp_path: Path) -> None:
+        """中断した実行の未完了のファイルのみを再開で削除することを確認。"""
+        groups = self._make_groups(tmp_path, 2)
+        journal = DeletionJournal(tmp_path, "run")
+        journal.open("unlink")
+        for group in groups:
+            journal.planned(group)
+        groups[0][0].unlink()
+        journal.done(groups[0][0], None)
+        journal.close()
+
+        pending = journal.load().pending()
+        assert pending == [
+            ["sub/IMG_0000.xmp"],
+            ["sub/IMG_0001.ARW", "sub/IMG_0001.xmp"],
+        ]
+        with Deleter(tmp_path, journal=journal) as deleter:
+            for group in pending:
+                deleter.submit([tmp_path / path for path in group])
+        assert deleter.summary.files == 3
+        assert journal.load().pending() == []
@@ -0,0 +1,124 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from lrutility.index.IndexWatcher import (
+    Changes,
+    Debouncer,
+    IndexWatcher,
+    InotifySource,
+    PollingSource,
+    WatchSource,
+)
+from lrutility.index.MetadataIndex import MetadataIndex
+from lrutility.utils.inotify import is_available
+from lrutility.xmp.XMPParser import XMPParser
+
+ASSETS = Path("tests/assets")
+
+
+def _rewrite_rating(path: Path, rating: int) -> None:
+    """XMPファイルのRatingを書き換え、mtimeを確実に更新する。"""
+    content = path.read_text().replace('xmp:Rating="1"', f'xmp:Rating="{rating}"')
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+
+class TestIndexWatcher:
+    """XMPファイルの変更の監視とインデックスの更新のテストクラス。"""
+
+    def test_debouncer(self) -> None:
+        """変更が落ち着くまで、または最大の待ち時間まで変更をまとめることを確認。"""
+        debouncer = Debouncer(quiet=2.0, max_delay=5.0)
+        assert debouncer.timeout(0.0) is None
+
+        debouncer.add(Changes({Path("a.xmp")}), 0.0)
+        debouncer.add(Changes({Path("a.xmp"), Path("b.xmp")}), 1.5)
+        assert debouncer.take(3.0) is None
+        assert debouncer.timeout(3.0) == pytest.approx(0.5)
+        changes = debouncer.take(3.5)
+        assert changes is not None
+        assert changes.paths == {Path("a.xmp"), Path("b.xmp")}
+        assert debouncer.timeout(3.5) is None
+
+        # 変更が続く場合もmax_delayで返す
+        for now in range(0, 6):
+            debouncer.add(Changes({Path("c.xmp")}), 10.0 + now)
+        assert debouncer.take(15.0) is not None
+
+    def test_source_is_abstract(self) -> None:
+        """readを実装しない検出方法はインスタンス化できないことを確認。"""
+        with pytest.raises(TypeError):
+            WatchSource()  # type: ignore[abstract]
+
+    @pytest.mark.skipif(not is_available(), reason="inotify is not available")
+    def test_inotify_source(self, tmp_path: Path) -> None:
+        """作成・変更・削除と、作成されたディレクトリ内のファイルを検出することを確認。"""
+        (tmp_path / "2024").mkdir()
+        existing = tmp_path / "2024" / "a.xmp"
+        existing.write_text("a")
+        with InotifySource(tmp_path) as source:
+            existing.write_text("b")
+            (tmp_path / "2024" / "IMG_0001.ARW").write_bytes(b"raw")
+            created = tmp_path / "2025" / "c.xmp"
+            created.parent.mkdir()
+            created.write_text("c")
+            (tmp_path / ".lrutility").mkdir()
+            (tmp_path / ".lrutility" / "d.xmp").write_text("d")
+
+            changes = source.read(1.0)
+            changes.paths |= source.read(0.1).paths
+            assert changes.paths == {existing, created}
+            assert not changes.rescan
+
+            existing.unlink()
+            assert source.read(1.0).paths == {existing}
+
+            (tmp_path / "2025").rename(tmp_path / "2026")
+            changes = source.read(1.0)
+            assert changes.rescan
+            assert changes.paths == {tmp_path / "2026" / "c.xmp"}
+
+    def test_polling_source(self, tmp_path: Path) -> None:
+        """ポーリングで作成・変更・削除を検出することを確認。"""
+        changed = tmp_path / "a.xmp"
+        removed = tmp_path / "b.xmp"
+        changed.write_text("a")
+        removed.write_text("b")
+        with PollingSource(tmp_path, interval=0.0) as source:
+            changed.write_text("aa")
+            removed.unlink()
+            created = tmp_path / "sub" / "c.xmp"
+            created.parent.mkdir()
+            created.write_text("c")
+            assert source.read(0.0).paths == {changed, removed, created}
+            assert not source.read(0.0)
+
+    def test_apply_updates_index(self, tmp_path: Path) -> None:
+        """変更されたファイルのみをパースし、削除されたファイルを除くことを確認。"""
+        rating_path = tmp_path / "rating_1.xmp"
+        other_path = tmp_path / "not_rating.xmp"
+        shutil.copy(ASSETS / "rating_1.xmp", rating_path)
+        shutil.copy(ASSETS / "not_rating.xmp", other_path)
+
+        with (
+            PollingSource(tmp_path, interval=0.0) as source,
+            MetadataIndex(tmp_path) as index,
+        ):
+            watcher = IndexWatcher(index, source, XMPParser(), debounce=0.0)
+            assert watcher.sync().parsed == 2
+
+            _rewrite_rating(rating_path, 5)
+            other_path.unlink()
+            stats = watcher.step(timeout=0.0)
+            assert stats is not None
+            assert (stats.parsed, stats.pruned, stats.hits) == (1, 1, 0)
+            assert watcher.step(timeout=0.0) is None
+
+            results = dict(index.refresh([rating_path], XMPParser()))
+            assert results[rating_path].xmp_info.rating == 5
+            assert index.last_refresh.hits == 1
+            assert index.stats().entries == 1
@@ -0,0 +1,33 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from lrutility.archive.ingest import iter_blocks, iter_views
+
+
+class TestIngest:
+    """ファイルの読み込みのテストクラス。"""
+
+    @pytest.mark.parametrize("size", [0, 1000, 4096, 10000])
+    def test_iter_views(self, tmp_path: Path, size: int) -> None:
+        """バッファを使い回して読み込んだ範囲を連結すると元のデータになることを確認。"""
+        data = os.urandom(size)
+        path = tmp_path / "IMG_0001.ARW"
+        path.write_bytes(data)
+
+        chunks = [bytes(view) for view in iter_views(path, read_size=4096)]
+        assert b"".join(chunks) == data
+        assert all(len(chunk) == 4096 for chunk in chunks[:-1])
+
+    @pytest.mark.parametrize("size", [0, 1000, 4096, 10000])
+    def test_iter_blocks(self, tmp_path: Path, size: int) -> None:
+        """最後のブロックのみblock_size未満となることを確認。"""
+        data = os.urandom(size)
+        path = tmp_path / "IMG_0001.ARW"
+        path.write_bytes(data)
+
+        blocks = list(iter_blocks(path, 4096, drop_cache=False))
+        assert b"".join(blocks) == data
+        assert all(len(block) == 4096 for block in blocks[:-1])
+        assert len(blocks[-1]) < 4096
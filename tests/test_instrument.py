@@ -0,0 +1,49 @@
+import json
+import pstats
+import time
+from pathlib import Path
+
+from lrutility.utils import instrument
+from lrutility.utils.instrument import instrumented, stage, timed
+
+
+class TestInstrument:
+    """段階ごとの計測のテストクラス。"""
+
+    def test_disabled_is_noop(self) -> None:
+        """無効時はiterableをそのまま返し、stageが共有の空のコンテキストを返すことを確認。"""
+        items = [1, 2, 3]
+        assert timed("walk", items) is items
+        assert stage("unlink") is stage("stat")
+
+    def test_nested_stages_are_exclusive(self, tmp_path: Path) -> None:
+        """入れ子の段階の時間が外側から除かれ、件数・バイト数が集計されることを確認。"""
+        stats_file = tmp_path / "stats.json"
+        with instrumented(stats_file=stats_file):
+            with stage("archive", items=1):
+                for _ in timed("read", range(3)):
+                    with stage("compress", nbytes=100):
+                        time.sleep(0.01)
+
+        summary = json.loads(stats_file.read_text())
+        stages = summary["stages"]
+        assert stages["compress"]["calls"] == 3
+        assert stages["compress"]["bytes"] == 300
+        assert stages["compress"]["wall"] >= 0.03
+        assert stages["read"]["items"] == 3
+        assert stages["archive"]["items"] == 1
+        assert stages["archive"]["wall"] < 0.01
+        assert timed("walk", []) == []
+
+    def test_profile(self, tmp_path: Path) -> None:
+        """cProfileとサンプリングプロファイラの結果が書き込まれることを確認。"""
+        with instrumented(profile=tmp_path / "run.prof"):
+            sum(range(1000))
+        assert pstats.Stats(str(tmp_path / "run.prof")).total_calls > 0
+
+        with instrumented(profile=tmp_path / "run.txt", profile_mode="sample"):
+            time.sleep(0.05)
+        lines = (tmp_path / "run.txt").read_text().splitlines()
+        assert lines
+        assert any(line.startswith("MainThread;") for line in lines)
+        assert instrument._recorder is None
@@ -0,0 +1,73 @@
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from lrutility.utils.logger import (
+    LogOptions,
+    configure_loguru,
+    is_enabled,
+    log_outcome,
+    log_outcome_summary,
+)
+
+
+class _Unformattable:
+    """文字列に変換されると失敗する値（遅延した組み立ての確認用）。"""
+
+    def __str__(self) -> str:
+        raise AssertionError("formatted")
+
+
+class TestLogger:
+    """ログの設定とファイルごとのログのテストクラス。"""
+
+    @pytest.fixture(autouse=True)
+    def _restore(self) -> Iterator[None]:
+        yield
+        configure_loguru(verbose=False)
+
+    def test_lazy_outcome_skipped(self, tmp_path: Path) -> None:
+        """出力されないレベルのログはメッセージを組み立てないことを確認。"""
+        log_file = tmp_path / "run.log"
+        configure_loguru(False, LogOptions(file=log_file))
+        assert not is_enabled("DEBUG")
+        log_outcome("not_matched", "DEBUG", "Not matched: {}", _Unformattable())
+        log_outcome("deleted", "INFO", "Deleted: {}", "IMG_0001.ARW")
+
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        assert "test_lazy_outcome_skipped" in lines[0]
+        assert lines[0].endswith("Deleted: IMG_0001.ARW")
+
+    def test_summary(self, tmp_path: Path) -> None:
+        """集計モードではERROR未満のログの代わりに件数を出力することを確認。"""
+        log_file = tmp_path / "run.log"
+        configure_loguru(True, LogOptions(file=log_file, summary=True))
+        for i in range(3):
+            log_outcome("not_matched", "DEBUG", "Not matched: {}", i)
+        log_outcome("no_image", "WARNING", "No image found for xmp: {}", "a.xmp")
+        log_outcome("parse_failed", "ERROR", "Failed to parse xmp: {}", "b.xmp")
+        log_outcome_summary()
+
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert lines[0].endswith("Failed to parse xmp: b.xmp")
+        assert lines[1].endswith("Outcomes: no_image=1, not_matched=3, parse_failed=1")
+
+    def test_intercept_standard_logging(self, tmp_path: Path) -> None:
+        """標準loggingのログを呼び出し元の情報と共に転送することを確認。"""
+        log_file = tmp_path / "run.log"
+        configure_loguru(False, LogOptions(file=log_file, enqueue=True))
+        std_logger = logging.getLogger("thirdparty")
+        std_logger.debug("hidden")
+        std_logger.warning("disk %s is slow", "sda")
+        logger.complete()
+        logger.remove()  # キューに残ったログを書き込む
+
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        assert "thirdparty:test_intercept_standard_logging:" in lines[0]
+        assert lines[0].endswith("disk sda is slow")
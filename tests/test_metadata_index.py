@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+from lrutility.index.MetadataIndex import MetadataIndex
+from lrutility.xmp.XMPParser import XMPParser
+
+
+class TestMetadataIndex:
+    """メタデータインデックスのテストクラス。"""
+
+    def setup_method(self) -> None:
+        """各テストメソッドの前に実行される。"""
+        self.parser = XMPParser()
+
+    def _make_library(self, root: Path) -> list[Path]:
+        paths = []
+        for name in ("rating_1.xmp", "not_rating.xmp"):
+            path = root / name
+            shutil.copy(Path("tests/assets") / name, path)
+            paths.append(path)
+        return paths
+
+    def test_refresh_uses_index(self, tmp_path: Path) -> None:
+        """2回目以降は変更のないファイルをパースせずに返すことを確認。"""
+        paths = self._make_library(tmp_path)
+
+        with MetadataIndex(tmp_path) as index:
+            first = dict(index.refresh(paths, self.parser))
+            assert index.last_refresh.parsed == 2
+            assert index.last_refresh.hits == 0
+
+        with MetadataIndex(tmp_path) as index:
+            second = dict(index.refresh(paths, self.parser))
+            assert index.last_refresh.parsed == 0
+            assert index.last_refresh.hits == 2
+
+        assert first == second
+        assert second[paths[0]].xmp_info.rating == 1
+        assert (tmp_path / ".lrutility" / "index.sqlite").exists()
+
+    def test_refresh_changed_and_deleted(self, tmp_path: Path) -> None:
+        """変更されたファイルの再パースと、削除されたファイルの除去を確認。"""
+        rating_path, not_rating_path = self._make_library(tmp_path)
+        with MetadataIndex(tmp_path) as index:
+            list(index.refresh([rating_path, not_rating_path], self.parser))
+
+            # Ratingを書き換えてmtimeを更新する
+            content = rating_path.read_text().replace(
+                'xmp:Rating="1"', 'xmp:Rating="5"'
+            )
+            rating_path.write_text(content)
+            stat = rating_path.stat()
+            os.utime(rating_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            not_rating_path.unlink()
+
+            results = dict(index.refresh([rating_path], self.parser))
+            assert results[rating_path].xmp_info.rating == 5
+            assert index.last_refresh.parsed == 1
+            assert index.last_refresh.pruned == 1
+            assert index.stats().entries == 1
+
+    def test_refresh_parse_error(self, tmp_path: Path) -> None:
+        """パースに失敗したファイルがインデックスに登録されないことを確認。"""
+        broken_path = tmp_path / "broken.xmp"
+        broken_path.write_text("<x:xmpmeta")
+        with MetadataIndex(tmp_path) as index:
+            results = dict(index.refresh([broken_path], self.parser))
+            assert isinstance(results[broken_path], Exception)
+            assert index.last_refresh.failed == 1
+            assert index.stats().entries == 0
+
+    def test_stores_json(self, tmp_path: Path) -> None:
+        """メタデータをJSONで保存し、旧形式（pickle）のインデックスを破棄することを確認。"""
+        paths = self._make_library(tmp_path)
+        with MetadataIndex(tmp_path) as index:
+            list(index.refresh(paths, self.parser))
+            (data,) = index.connection.execute(
+                "SELECT data FROM entries WHERE path = 'rating_1.xmp'"
+            ).fetchone()
+            assert isinstance(data, str)
+            assert json.loads(data)[0][4] == 1  # xmp_info.rating
+            index.connection.execute("PRAGMA user_version = 1")
+            index.connection.commit()
+
+        with MetadataIndex(tmp_path) as index:
+            assert index.stats().entries == 0
@@ -0,0 +1,68 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from lrutility.archive.packing import (
+    PackUnit,
+    assign_capture_dates,
+    build_units,
+    pack,
+)
+from lrutility.utils.walker import walk_files
+
+
+def _unit(name: str, size: int, key: str | None = None) -> PackUnit:
+    return PackUnit(files=[Path(name)], size=size, key=key)
+
+
+class TestPacking:
+    """アーカイブへのファイルの割り当てのテストクラス。"""
+
+    def test_build_units_keeps_pairs(self, tmp_path: Path) -> None:
+        """画像ファイルとサイドカーを1つの組にまとめることを確認。"""
+        for name in ("A.ARW", "A.xmp", "A.JPG", "B.ARW", "B.ARW.dop", "notes.txt"):
+            (tmp_path / name).write_bytes(b"x" * 10)
+        units = build_units(walk_files(tmp_path, recursive=False))
+        assert [[path.name for path in unit.files] for unit in units] == [
+            ["A.ARW", "A.JPG", "A.xmp"],
+            ["B.ARW", "B.ARW.dop"],
+            ["notes.txt"],
+        ]
+        assert units[0].size == 30
+
+    def test_next_fit_keeps_order(self) -> None:
+        """next-fitは順序を保ち、容量を超える組を単独で格納することを確認。"""
+        units = [_unit("a", 6), _unit("b", 6), _unit("c", 15), _unit("d", 3)]
+        bins = pack(units, 10, "next-fit")
+        assert [[p.name for p in b.files] for b in bins] == [["a"], ["b"], ["c"], ["d"]]
+
+    def test_ffd_fewer_archives(self) -> None:
+        """first-fit-decreasingでアーカイブ数が減ることを確認。"""
+        units = [_unit(name, size) for name, size in zip("abcdef", [6, 5, 4, 5, 4, 6])]
+        assert len(pack(units, 10, "next-fit")) == 4
+        bins = pack(units, 10, "ffd")
+        assert len(bins) == 3
+        assert all(b.size == 10 for b in bins)
+        assert [p.name for p in bins[0].files] == ["a", "c"]
+
+    def test_group_by_key(self) -> None:
+        """keyの異なる組を同じアーカイブに格納しないことを確認。"""
+        units = [
+            _unit("a", 1, "2025-08-11"),
+            _unit("b", 1),
+            _unit("c", 1, "2025-08-10"),
+        ]
+        bins = pack(units, 10, "ffd", group_by_key=True)
+        assert [[p.name for p in b.files] for b in bins] == [["c"], ["a"], ["b"]]
+        with pytest.raises(ValueError):
+            pack(units, 10, "best-fit")  # type: ignore[arg-type]
+
+    def test_assign_capture_dates(self, tmp_path: Path) -> None:
+        """XMPの撮影日時から撮影日を設定することを確認。"""
+        shutil.copy("tests/assets/rating_1.xmp", tmp_path / "A.xmp")
+        (tmp_path / "A.ARW").write_bytes(b"raw")
+        (tmp_path / "B.ARW").write_bytes(b"raw")
+        units = build_units(walk_files(tmp_path, recursive=False))
+        assign_capture_dates(units)
+        assert [unit.key for unit in units] == ["2025-08-10", None]
@@ -0,0 +1,116 @@
+import json
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from lrutility.archive.CompressionPolicy import CompressionPolicy
+from lrutility.archive.ParallelZipWriter import ParallelZipWriter, write_members
+from lrutility.archive.ZipStreamWriter import ZipStreamWriter
+from lrutility.utils.instrument import instrumented
+
+
+class TestParallelZipWriter:
+    """メンバーを並列に圧縮するZIP書き込みのテストクラス。"""
+
+    def _make_files(self, root: Path) -> list[Path]:
+        block = b"IMG_0001 " * 400 + os.urandom(400)
+        contents = {
+            "empty.xmp": b"",
+            "small.xmp": b"<x:xmpmeta/>",
+            "exact.ARW": block[:4096] * 2,
+            "large.ARW": block * 20,
+        }
+        paths = []
+        for name, data in contents.items():
+            path = root / name
+            path.write_bytes(data)
+            paths.append(path)
+        return paths
+
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        """複数ブロックに分割して圧縮したメンバーを正しく展開できることを確認。"""
+        paths = self._make_files(tmp_path)
+        archive_path = tmp_path / "out.zip"
+        written = []
+        with ZipStreamWriter.open(archive_path) as zf:
+            writer = ParallelZipWriter(zf, 4, memory_budget=16384, block_size=4096)
+            writer.write([(path, path.name) for path in paths], written.append)
+
+        assert sum(written) == sum(path.stat().st_size for path in paths)
+        with zipfile.ZipFile(archive_path) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == [path.name for path in paths]
+            for path in paths:
+                info = zf.getinfo(path.name)
+                assert info.compress_type == zipfile.ZIP_DEFLATED
+                assert zf.read(path.name) == path.read_bytes()
+
+    def test_stored_members(self, tmp_path: Path) -> None:
+        """圧縮済みの形式を無圧縮で格納し、XMPはdeflateすることを確認。"""
+        paths = self._make_files(tmp_path)
+        archive_path = tmp_path / "out.zip"
+        with ZipStreamWriter.open(archive_path) as zf:
+            writer = ParallelZipWriter(
+                zf, 2, block_size=4096, policy=CompressionPolicy("auto")
+            )
+            writer.write([(path, path.name) for path in paths])
+
+        with zipfile.ZipFile(archive_path) as zf:
+            assert zf.testzip() is None
+            types = {info.filename: info.compress_type for info in zf.infolist()}
+            assert types["large.ARW"] == zipfile.ZIP_STORED
+            assert types["small.xmp"] == zipfile.ZIP_DEFLATED
+            for path in paths:
+                assert zf.read(path.name) == path.read_bytes()
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """存在しないファイルで例外となり、アーカイブは閉じられることを確認。"""
+        (path, *_) = self._make_files(tmp_path)
+        with pytest.raises(FileNotFoundError):
+            with ZipStreamWriter.open(tmp_path / "out.zip") as zf:
+                ParallelZipWriter(zf, 2).write(
+                    [(path, path.name), (tmp_path / "missing.ARW", "missing.ARW")]
+                )
+
+        with zipfile.ZipFile(tmp_path / "out.zip") as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == [path.name]
+
+    def test_serial_roundtrip(self, tmp_path: Path) -> None:
+        """1スレッドで書き込んだアーカイブをzipfileで検証・展開できることを確認。"""
+        paths = self._make_files(tmp_path)
+        archive_path = tmp_path / "out.zip"
+        with ZipStreamWriter.open(archive_path) as zf:
+            write_members(
+                zf, [(path, path.name) for path in paths], CompressionPolicy("auto")
+            )
+            expected = zf.size()
+
+        assert archive_path.stat().st_size == expected
+        with zipfile.ZipFile(archive_path) as zf:
+            assert zf.testzip() is None
+            for path in paths:
+                assert zf.read(path.name) == path.read_bytes()
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_stages(self, tmp_path: Path, threads: int) -> None:
+        """1スレッドと並列で、ハッシュ・圧縮・書き込みを別の段階として計測することを確認。"""
+        paths = self._make_files(tmp_path)
+        stats_file = tmp_path / "stats.json"
+        with instrumented(stats_file=stats_file):
+            with ZipStreamWriter.open(tmp_path / "out.zip") as zf:
+                write_members(
+                    zf,
+                    [(path, path.name) for path in paths],
+                    CompressionPolicy("deflate"),
+                    threads,
+                    hash_algorithm="sha256",
+                )
+
+        stages = json.loads(stats_file.read_text())["stages"]
+        assert {"read", "hash", "compress", "write"} <= stages.keys()
+        total = sum(path.stat().st_size for path in paths)
+        assert stages["hash"]["bytes"] == total
+        assert stages["compress"]["bytes"] == total
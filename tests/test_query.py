@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import pytest
+
+from lrutility.catalog.Catalog import CATALOG_FIELDS, Catalog
+from lrutility.catalog.Query import QueryError, compile_query
+from lrutility.xmp.XMPParser import XMPParser
+
+
+class TestQuery:
+    """クエリ式のテストクラス。"""
+
+    def setup_method(self) -> None:
+        """各テストメソッドの前に実行される。"""
+        parser = XMPParser()
+        rating = parser.parse(Path("tests/assets/rating_1.xmp"), CATALOG_FIELDS)
+        not_rating = parser.parse(Path("tests/assets/not_rating.xmp"), CATALOG_FIELDS)
+        rejected = parser.parse(Path("tests/assets/not_rating.xmp"), CATALOG_FIELDS)
+        rejected.dynamic_media_info.pick = -1
+        rejected.xmp_info.label = "Red"
+        self.records = [
+            (Path("rating_1.xmp"), rating),
+            (Path("not_rating.xmp"), not_rating),
+            (Path("rejected.xmp"), rejected),
+        ]
+        self.catalog = Catalog.from_records(self.records)
+
+    def _select(self, expression: str) -> list[str]:
+        """述語とマスクの両方で評価し、結果が一致することを確認して返す。"""
+        query = compile_query(expression)
+        by_predicate = [path.stem for path, m in self.records if query.matches(m)]
+        by_mask = [path.stem for path in self.catalog.select(query.mask(self.catalog))]
+        assert by_predicate == by_mask
+        return by_predicate
+
+    @pytest.mark.parametrize(
+        ("expression", "expected"),
+        [
+            ("rating == 1", ["rating_1"]),
+            ("rating <= 1 or pick == -1", ["rating_1", "rejected"]),
+            ("label == 'Red'", ["rejected"]),
+            ("label != 'Red'", ["rating_1", "not_rating"]),
+            ("rating == None", ["not_rating", "rejected"]),
+            ("rating != 1", ["not_rating", "rejected"]),
+            ("not rating >= 1", ["not_rating", "rejected"]),
+            ("1 >= rating", ["rating_1"]),
+            ("1300 <= iso <= 1600 and pick == 0", ["not_rating"]),
+            ("label in ['Red', 'Blue']", ["rejected"]),
+            ("label not in ('Red',)", ["rating_1", "not_rating"]),
+            ("f_number in [2.8, 4.0]", ["rating_1", "not_rating", "rejected"]),
+            ("f_number not in [2.8]", []),
+            ("make == 'SONY' and lens == 'FE 70-200mm F2.8 GM OSS II'", None),
+            ("exposure_time <= 0.01", ["rating_1", "not_rating", "rejected"]),
+            ("date_time_original < '2025-08-10T19:08:27.400'", ["rating_1"]),
+        ],
+    )
+    def test_select(self, expression: str, expected: list[str] | None) -> None:
+        """述語とマスクで同じ結果が得られることを確認。"""
+        if expected is None:
+            expected = ["rating_1", "not_rating", "rejected"]
+        assert self._select(expression) == expected
+
+    def test_fields(self) -> None:
+        """クエリの評価に必要なXMPフィールドが得られることを確認。"""
+        query = compile_query("rating <= 1 or pick == -1")
+        assert query.columns == {"rating", "pick"}
+        assert query.fields == {"xmp_info.rating", "dynamic_media_info.pick"}
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "rating ==",
+            "unknown == 1",
+            "rating == 'one'",
+            "label < 'Red'",
+            "rating is None",
+            "rating + 1 == 2",
+            "__import__('os')",
+            "date_time_original > 'yesterday'",
+        ],
+    )
+    def test_invalid(self, expression: str) -> None:
+        """不正なクエリ式に対してQueryErrorが発生することを確認。"""
+        with pytest.raises(QueryError):
+            compile_query(expression)
@@ -0,0 +1,144 @@
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from lrutility.archive.CompressionPolicy import CompressionPolicy
+from lrutility.archive.ParallelZipWriter import write_members
+from lrutility.archive.RollingZipWriter import RollingZipWriter
+from lrutility.archive.ZipStreamWriter import ZipStreamWriter
+
+
+class TestRollingZipWriter:
+    """書き込みサイズでアーカイブを切り替えるZIP書き込みのテストクラス。"""
+
+    def _make_units(self, root: Path, count: int) -> list[list[Path]]:
+        units = []
+        for i in range(count):
+            raw = root / f"IMG_{i:04d}.ARW"
+            raw.write_bytes(os.urandom(3000))
+            xmp = root / f"IMG_{i:04d}.xmp"
+            xmp.write_bytes(b"<x:xmpmeta/>" * 100)
+            units.append([raw, xmp])
+        return units
+
+    def _write(
+        self, root: Path, units: list[list[Path]], limit: int, threads: int = 1
+    ) -> tuple[list[Path], list[int]]:
+        written: list[int] = []
+        with RollingZipWriter(
+            lambda i: root / f"out_{i}.zip",
+            limit,
+            CompressionPolicy(),
+            threads=threads,
+            progress=written.append,
+        ) as writer:
+            for files in units:
+                members = [(path, path.name) for path in files]
+                sizes = [path.stat().st_size for path in files]
+                writer.add(members, sum(sizes), sizes=sizes)
+        return writer.archives, written
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_archives_under_limit(self, tmp_path: Path, threads: int) -> None:
+        """各アーカイブのファイルサイズが上限以下で、全ての組が格納されることを確認。"""
+        units = self._make_units(tmp_path, 10)
+        limit = 10_000
+        archives, written = self._write(tmp_path, units, limit, threads)
+
+        assert len(archives) > 1
+        names = []
+        for archive in archives:
+            assert archive.stat().st_size <= limit
+            with zipfile.ZipFile(archive) as zf:
+                assert zf.testzip() is None
+                names.extend(zf.namelist())
+        assert names == [path.name for files in units for path in files]
+        # 書き込み直した組の分は取り消される
+        assert sum(written) == sum(p.stat().st_size for files in units for p in files)
+
+    def test_units_kept_together(self, tmp_path: Path) -> None:
+        """画像とサイドカーが同じアーカイブに格納されることを確認。"""
+        units = self._make_units(tmp_path, 6)
+        archives, _ = self._write(tmp_path, units, 8_000)
+
+        for archive in archives:
+            with zipfile.ZipFile(archive) as zf:
+                stems = [Path(name).stem for name in zf.namelist()]
+            assert all(stems.count(stem) == 2 for stem in stems)
+
+    def test_oversized_unit_alone(self, tmp_path: Path) -> None:
+        """上限を超える組は単独で1つのアーカイブに格納されることを確認。"""
+        units = self._make_units(tmp_path, 3)
+        archives, _ = self._write(tmp_path, units, 1_000)
+
+        assert len(archives) == 3
+        for archive, files in zip(archives, units, strict=True):
+            with zipfile.ZipFile(archive) as zf:
+                assert zf.namelist() == [path.name for path in files]
+
+    def test_non_ascii_names(self, tmp_path: Path) -> None:
+        """ASCII以外の名前をUTF-8のフラグ付きで格納し、上限も守ることを確認。"""
+        units = []
+        for i in range(4):
+            raw = tmp_path / f"写真_{i}.ARW"
+            raw.write_bytes(os.urandom(3000))
+            units.append([raw])
+        archives, _ = self._write(tmp_path, units, 7_000)
+
+        assert len(archives) == 2
+        names = []
+        for archive in archives:
+            assert archive.stat().st_size <= 7_000
+            with zipfile.ZipFile(archive) as zf:
+                assert zf.testzip() is None
+                assert all(info.flag_bits & 0x800 for info in zf.infolist())
+                names.extend(zf.namelist())
+        assert names == [files[0].name for files in units]
+
+    def test_truncate_restores_checkpoint(self, tmp_path: Path) -> None:
+        """truncateでcheckpoint以降のメンバーが取り除かれることを確認。"""
+        (raw, xmp), *_ = self._make_units(tmp_path, 1)
+        archive_path = tmp_path / "out.zip"
+        with ZipStreamWriter.open(archive_path) as zf:
+            write_members(zf, [(xmp, xmp.name)], CompressionPolicy())
+            checkpoint = zf.checkpoint()
+            size = zf.size()
+            write_members(zf, [(raw, raw.name)], CompressionPolicy())
+            zf.truncate(checkpoint)
+            assert zf.size() == size
+
+        assert archive_path.stat().st_size == size
+        with zipfile.ZipFile(archive_path) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == [xmp.name]
+
+    def test_sizes_avoid_rewrite(self, tmp_path: Path) -> None:
+        """メンバーのサイズを渡すと、書き込む前に切り替えて書き込み直さないことを確認。"""
+        units = self._make_units(tmp_path, 10)
+        archives, written = self._write(tmp_path, units, 10_000)
+
+        assert len(archives) > 1
+        assert all(nbytes >= 0 for nbytes in written)
+
+    def test_key_change_rolls_over(self, tmp_path: Path) -> None:
+        """keyが変わるとアーカイブを切り替えることを確認。"""
+        units = self._make_units(tmp_path, 4)
+        with RollingZipWriter(lambda i: tmp_path / f"out_{i}.zip", 10**6) as writer:
+            for files, key in zip(units, ["a", "a", "b", "b"], strict=True):
+                writer.add([(path, path.name) for path in files], 0, key)
+
+        assert len(writer.archives) == 2
+
+    def test_archive_size_matches_file(self, tmp_path: Path) -> None:
+        """閉じる前に計算したサイズが閉じた後のファイルサイズと一致することを確認。"""
+        units = self._make_units(tmp_path, 3)
+        archive_path = tmp_path / "out.zip"
+        with ZipStreamWriter.open(archive_path) as zf:
+            for files in units:
+                members = [(path, path.name) for path in files]
+                write_members(zf, members, CompressionPolicy())
+            expected = zf.size()
+
+        assert archive_path.stat().st_size == expected
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from lrutility.index.SidecarIndex import SidecarIndex
+
+
+class TestSidecarIndex:
+    """XMPファイルと画像ファイルの対応付けのテストクラス。"""
+
+    def _make_library(self, root: Path, names: list[str]) -> SidecarIndex:
+        for name in names:
+            path = root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"")
+        return SidecarIndex.build(root)
+
+    def test_resolve_in_subfolder(self, tmp_path: Path) -> None:
+        """サブフォルダのXMPがルートではなく同じフォルダの画像に対応することを確認。"""
+        sidecars = self._make_library(
+            tmp_path, ["DSC0001.ARW", "2025/DSC0001.ARW", "2025/DSC0001.xmp"]
+        )
+        xmp = tmp_path / "2025" / "DSC0001.xmp"
+        assert sidecars.resolve(xmp, "DSC0001.ARW") == tmp_path / "2025/DSC0001.ARW"
+        assert sidecars.resolve(xmp) == tmp_path / "2025/DSC0001.ARW"
+
+    def test_resolve_prefers_raw(self, tmp_path: Path) -> None:
+        """RawFileNameがない場合に、JPEGよりRAWを優先することを確認。"""
+        sidecars = self._make_library(
+            tmp_path, ["IMG_0001.JPG", "IMG_0001.CR3", "IMG_0001.xmp"]
+        )
+        assert sidecars.resolve(tmp_path / "IMG_0001.xmp") == tmp_path / "IMG_0001.CR3"
+
+    def test_resolve_extension_style_sidecar(self, tmp_path: Path) -> None:
+        """ "IMG_0001.NEF.xmp"形式のXMPファイルの対応付けを確認。"""
+        sidecars = self._make_library(tmp_path, ["IMG_0001.NEF", "IMG_0001.NEF.xmp"])
+        xmp = tmp_path / "IMG_0001.NEF.xmp"
+        assert sidecars.resolve(xmp) == tmp_path / "IMG_0001.NEF"
+        assert sidecars.companions(xmp) == [tmp_path / "IMG_0001.NEF"]
+
+    def test_companions(self, tmp_path: Path) -> None:
+        """RAW+JPEGやDxOのサイドカーを付随ファイルとして返すことを確認。"""
+        sidecars = self._make_library(
+            tmp_path,
+            ["A.ARW", "A.JPG", "A.ARW.dop", "A.xmp", "AB.ARW", "sub/A.JPG"],
+        )
+        assert sidecars.companions(tmp_path / "A.ARW") == [
+            tmp_path / "A.ARW.dop",
+            tmp_path / "A.JPG",
+            tmp_path / "A.xmp",
+        ]
+        assert sidecars.companions(tmp_path / "A.ARW", sidecars_only=True) == [
+            tmp_path / "A.ARW.dop"
+        ]
+
+    def test_orphans(self, tmp_path: Path) -> None:
+        """画像のないXMPとXMPのないRAWを列挙することを確認。"""
+        sidecars = self._make_library(
+            tmp_path,
+            ["A.ARW", "A.xmp", "B.ARW", "C.xmp", "D.JPG", "E.ARW.xmp", "E.ARW"],
+        )
+        orphans = sidecars.orphans()
+        assert orphans.sidecars == [tmp_path / "C.xmp"]
+        assert orphans.images == [tmp_path / "B.ARW"]
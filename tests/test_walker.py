@@ -0,0 +1,71 @@
+from pathlib import Path
+
+from lrutility.utils.walker import FileEntry, walk_directories, walk_files
+
+
+class TestWalker:
+    """ディレクトリ走査のテストクラス。"""
+
+    def _make_tree(self, root: Path) -> set[Path]:
+        expected = set()
+        for relative in ("a.xmp", "sub/b.XMP", "sub/deep/c.xmp", "other/d.xmp"):
+            path = root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("<x:xmpmeta/>")
+            expected.add(path)
+        (root / "a.ARW").write_bytes(b"raw")
+        (root / ".lrutility").mkdir()
+        (root / ".lrutility" / "cache.xmp").write_text("")
+        return expected
+
+    def test_walk_recursive_suffixes(self, tmp_path: Path) -> None:
+        """拡張子を大文字小文字を区別せずに絞り込み、作業用ディレクトリを除くことを確認。"""
+        expected = self._make_tree(tmp_path)
+        for workers in (1, 4):
+            entries = list(walk_files(tmp_path, suffixes=[".xmp"], workers=workers))
+            assert {entry.path for entry in entries} == expected
+
+    def test_walk_sequential_sorted(self, tmp_path: Path) -> None:
+        """workers=1かつsort=Trueの場合に深さ優先の名前順で返すことを確認。"""
+        self._make_tree(tmp_path)
+        (tmp_path / "z.xmp").write_text("<x:xmpmeta/>")
+        paths = [
+            entry.path
+            for entry in walk_files(tmp_path, suffixes=[".xmp"], sort=True, workers=1)
+        ]
+        relative = [path.relative_to(tmp_path).as_posix() for path in paths]
+        assert relative == [
+            "a.xmp",
+            "z.xmp",
+            "other/d.xmp",
+            "sub/b.XMP",
+            "sub/deep/c.xmp",
+        ]
+
+    def test_walk_non_recursive_stat(self, tmp_path: Path) -> None:
+        """非再帰の走査と、FileEntryのstat情報を確認。"""
+        self._make_tree(tmp_path)
+        entries = {
+            entry.path.name: entry for entry in walk_files(tmp_path, recursive=False)
+        }
+        assert set(entries) == {"a.xmp", "a.ARW"}
+        stat = (tmp_path / "a.ARW").stat()
+        assert entries["a.ARW"] == FileEntry(
+            tmp_path / "a.ARW", stat.st_size, stat.st_mtime_ns
+        )
+
+    def test_walk_directories_ordered(self, tmp_path: Path) -> None:
+        """ordered=Trueの場合に並列に走査しても逐次の走査と同じ順序で返すことを確認。"""
+        self._make_tree(tmp_path)
+        sequential = list(walk_directories(tmp_path, sort=True, workers=1))
+        for _ in range(5):
+            parallel = list(
+                walk_directories(tmp_path, sort=True, workers=4, ordered=True)
+            )
+            assert parallel == sequential
+        assert [directory for directory, _ in sequential] == [
+            tmp_path,
+            tmp_path / "other",
+            tmp_path / "sub",
+            tmp_path / "sub" / "deep",
+        ]
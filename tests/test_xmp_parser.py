@@ -1,8 +1,10 @@
+import xml.etree.ElementTree as ET
 from pathlib import Path
 
 import pytest
 
-from lrutility.xmp.XMPParser import XMPParser
+from lrutility.xmp.XMPDataclass import XMPMetadata
+from lrutility.xmp.XMPParser import ExecutorKind, XMPParser
 
 
 class TestXmpParser:
@@ -79,3 +81,137 @@ class TestXmpParser:
 
         # 不正な形式の場合
         assert XMPParser.parse_fraction("invalid") is None
+
+    def test_parse_fields(self) -> None:
+        """fieldsで指定したフィールドのみが取得されることを確認。"""
+        xmp_file = Path("tests/assets/rating_1.xmp")
+        metadata = self.parser.parse(
+            xmp_file,
+            fields={"xmp_info.rating", "camera_raw_settings.raw_file_name"},
+        )
+
+        # 指定したフィールドは取得される
+        assert metadata.xmp_info.rating == 1
+        assert metadata.camera_raw_settings.raw_file_name == "rating_1.ARW"
+
+        # 指定していないフィールドはデフォルト値のまま
+        assert metadata.xmp_info.creator_tool is None
+        assert metadata.tiff_info.make is None
+        assert metadata.exif_info.iso_speed_ratings is None
+        assert metadata.camera_raw_settings.has_crop is False
+
+    def test_parse_fields_section(self) -> None:
+        """セクション名を指定した場合に子要素を含む全フィールドが取得されることを確認。"""
+        xmp_file = Path("tests/assets/rating_1.xmp")
+        full = self.parser.parse(xmp_file)
+        metadata = self.parser.parse(xmp_file, fields={"exif_info", "flash_info"})
+
+        assert metadata.exif_info == full.exif_info
+        assert metadata.exif_info.iso_speed_ratings == [1250]
+        assert metadata.flash_info == full.flash_info
+        assert metadata.flash_info.mode == 2
+        assert metadata.xmp_info.rating is None
+
+    def test_parse_unknown_field(self) -> None:
+        """未知のフィールド名に対してValueErrorが発生することを確認。"""
+        xmp_file = Path("tests/assets/rating_1.xmp")
+        with pytest.raises(ValueError, match="Unknown XMP field"):
+            self.parser.parse(xmp_file, fields={"xmp_info.unknown"})
+
+    @pytest.mark.parametrize(
+        "xmp_file",
+        [Path("tests/assets/rating_1.xmp"), Path("tests/assets/not_rating.xmp")],
+    )
+    def test_backends_equivalent(self, xmp_file: Path) -> None:
+        """streamとetreeのバックエンドで同じ結果が得られることを確認。"""
+        stream = XMPParser(backend="stream").parse(xmp_file)
+        etree = XMPParser(backend="etree").parse(xmp_file)
+        assert stream == etree
+
+    def test_stream_early_exit(self, tmp_path: Path) -> None:
+        """必要な要素を読み終えた後のファイル内容を読み込まないことを確認。"""
+        content = Path("tests/assets/rating_1.xmp").read_text()
+        # rdf:Descriptionの後ろに壊れたXMLを付加する
+        xmp_file = tmp_path / "broken_tail.xmp"
+        xmp_file.write_text(content.replace("</x:xmpmeta>", "<broken"))
+
+        metadata = XMPParser(backend="stream").parse(
+            xmp_file, fields={"xmp_info.rating", "exif_info.iso_speed_ratings"}
+        )
+        assert metadata.xmp_info.rating == 1
+        assert metadata.exif_info.iso_speed_ratings == [1250]
+
+        with pytest.raises(ET.ParseError):
+            XMPParser(backend="etree").parse(xmp_file)
+
+    def test_unknown_backend(self) -> None:
+        """未知のバックエンドに対してValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="Unknown XMP parser backend"):
+            XMPParser(backend="unknown")  # type: ignore[arg-type]
+
+    def test_to_tuple_roundtrip(self) -> None:
+        """to_tuple/from_tupleで元のXMPMetadataが復元されることを確認。"""
+        metadata = self.parser.parse(Path("tests/assets/rating_1.xmp"))
+        assert XMPMetadata.from_tuple(metadata.to_tuple()) == metadata
+
+    @pytest.mark.parametrize("executor", ["process", "thread"])
+    def test_parse_many(self, executor: ExecutorKind, tmp_path: Path) -> None:
+        """parse_manyが入力順に結果を返し、失敗したファイルで中断しないことを確認。"""
+        broken_file = tmp_path / "broken.xmp"
+        broken_file.write_text("<x:xmpmeta")
+        paths = [
+            Path("tests/assets/rating_1.xmp"),
+            tmp_path / "non_existent.xmp",
+            broken_file,
+            Path("tests/assets/not_rating.xmp"),
+        ] * 3
+
+        results = list(
+            self.parser.parse_many(
+                paths,
+                fields={"xmp_info.rating"},
+                workers=2,
+                executor=executor,
+                chunk_size=2,
+            )
+        )
+
+        assert [path for path, _ in results] == paths
+        ratings = [
+            result.xmp_info.rating if isinstance(result, XMPMetadata) else result
+            for _, result in results[:4]
+        ]
+        assert ratings[0] == 1
+        assert isinstance(ratings[1], FileNotFoundError)
+        assert isinstance(ratings[2], ET.ParseError)
+        assert ratings[3] is None
+
+    def test_parse_many_unordered(self) -> None:
+        """ordered=Falseでも全ファイルの結果が返されることを確認。"""
+        paths = [Path("tests/assets/rating_1.xmp")] * 10
+        results = list(
+            self.parser.parse_many(
+                paths, workers=2, executor="thread", ordered=False, chunk_size=3
+            )
+        )
+        assert len(results) == len(paths)
+        assert all(result.xmp_info.rating == 1 for _, result in results)
+
+    def test_slots(self) -> None:
+        """XMPMetadataの各セクションが__dict__を持たないことを確認。"""
+        metadata = self.parser.parse(Path("tests/assets/rating_1.xmp"))
+        assert not hasattr(metadata, "__dict__")
+        assert not hasattr(metadata.exif_info, "__dict__")
+
+    def test_intern_strings(self) -> None:
+        """種類の少ない文字列が複数のパース結果で共有されることを確認。"""
+        first = self.parser.parse(Path("tests/assets/rating_1.xmp"))
+        second = self.parser.parse(Path("tests/assets/not_rating.xmp"))
+        assert first.tiff_info.make is second.tiff_info.make
+        assert first.lens_info.lens is second.lens_info.lens
+
+        plain = XMPParser(intern_strings=False)
+        first = plain.parse(Path("tests/assets/rating_1.xmp"))
+        second = plain.parse(Path("tests/assets/not_rating.xmp"))
+        assert first.tiff_info.make == second.tiff_info.make
+        assert first.tiff_info.make is not second.tiff_info.make
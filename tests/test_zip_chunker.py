@@ -0,0 +1,157 @@
+import tarfile
+import zipfile
+import zlib
+from pathlib import Path
+
+from lrutility.archive.ArchiveManifest import ArchiveManifest, manifest_path
+from lrutility.cli.zip_chunker import group_files, zip_chunker
+
+
+class TestZipChunker:
+    """ZIPアーカイブ分割のテストクラス。"""
+
+    def _make_directory(self, root: Path) -> Path:
+        directory = root / "shoot"
+        directory.mkdir()
+        for i in range(5):
+            (directory / f"IMG_{i}.ARW").write_bytes(bytes([i]) * 1000)
+        return directory
+
+    def test_group_files_sizes(self, tmp_path: Path) -> None:
+        """既知のサイズを使用してグループ分けすることを確認。"""
+        files = [tmp_path / f"{i}.ARW" for i in range(4)]
+        sizes = dict.fromkeys(files, 600)
+        assert group_files(files, 1000, sizes) == [[f] for f in files]
+        assert group_files(files, 1200, sizes) == [files[:2], files[2:]]
+
+    def test_parallel_archives(self, tmp_path: Path) -> None:
+        """--jobsで並列に作成したアーカイブの内容を確認。"""
+        directory = self._make_directory(tmp_path)
+        zip_chunker([directory], 2000, verbose=False, jobs=2)
+
+        archives = sorted(tmp_path.glob("shoot_*.zip"))
+        assert [path.name for path in archives] == [
+            "shoot_1.zip",
+            "shoot_2.zip",
+            "shoot_3.zip",
+        ]
+        members = {}
+        for path in archives:
+            with zipfile.ZipFile(path) as zf:
+                assert zf.testzip() is None
+                members.update({name: zf.read(name) for name in zf.namelist()})
+        assert members == {
+            f"IMG_{i}.ARW": (directory / f"IMG_{i}.ARW").read_bytes() for i in range(5)
+        }
+
+    def test_resume_skips_completed(self, tmp_path: Path) -> None:
+        """再実行時に完了済みのアーカイブを書き込まず、欠けたものだけ作成することを確認。"""
+        directory = self._make_directory(tmp_path)
+        zip_chunker([directory], 2000, verbose=False)
+        records = ArchiveManifest(manifest_path(directory)).load()
+        assert sorted(records) == [1, 2, 3]
+        assert [f.path for f in records[1].files] == ["IMG_0.ARW", "IMG_1.ARW"]
+
+        first = tmp_path / "shoot_1.zip"
+        mtime = first.stat().st_mtime_ns
+        (tmp_path / "shoot_2.zip").unlink()
+        # 書き込み途中で中断したアーカイブ（マニフェストに未記録）
+        path = manifest_path(directory)
+        path.write_text("\n".join(path.read_text().splitlines()[:2] + ['{"index"']))
+        (tmp_path / "shoot_3.zip").write_bytes(b"PK\x03\x04partial")
+        zip_chunker([directory], 2000, verbose=False)
+
+        assert first.stat().st_mtime_ns == mtime
+        for name in ["shoot_2.zip", "shoot_3.zip"]:
+            with zipfile.ZipFile(tmp_path / name) as zf:
+                assert zf.testzip() is None
+        assert sorted(ArchiveManifest(manifest_path(directory)).load()) == [1, 2, 3]
+
+    def test_incremental(self, tmp_path: Path) -> None:
+        """--incrementalで追加・変更されたファイルだけを新しいアーカイブに格納することを確認。"""
+        directory = self._make_directory(tmp_path)
+        zip_chunker([directory], 2000, verbose=False)
+        (directory / "IMG_5.ARW").write_bytes(b"new")
+        (directory / "IMG_0.ARW").write_bytes(b"changed")
+        zip_chunker([directory], 2000, verbose=False, incremental=True)
+
+        with zipfile.ZipFile(tmp_path / "shoot_4.zip") as zf:
+            assert zf.namelist() == ["IMG_0.ARW", "IMG_5.ARW"]
+        assert not (tmp_path / "shoot_5.zip").exists()
+
+        # 変更がなければアーカイブを作成しない
+        zip_chunker([directory], 2000, verbose=False, incremental=True)
+        assert not (tmp_path / "shoot_5.zip").exists()
+
+    def test_recursive_multiple_roots(self, tmp_path: Path) -> None:
+        """複数のディレクトリを再帰的に格納し、相対パスをアーカイブ内の名前とすることを確認。"""
+        for root in ("2024", "2025"):
+            for relative in ("a/IMG_1.ARW", "a/IMG_1.xmp", "b/IMG_2.ARW"):
+                path = tmp_path / root / relative
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(b"x" * 100)
+        output = tmp_path / "out" / "photos"
+        output.parent.mkdir()
+        zip_chunker(
+            [tmp_path / "2024", tmp_path / "2025"],
+            300,
+            verbose=False,
+            recursive=True,
+            output=output,
+        )
+
+        archives = sorted(output.parent.glob("photos_*.zip"))
+        contents = []
+        for path in archives:
+            with zipfile.ZipFile(path) as zf:
+                contents.append(zf.namelist())
+        assert contents == [
+            ["2024/a/IMG_1.ARW", "2024/a/IMG_1.xmp", "2024/b/IMG_2.ARW"],
+            ["2025/a/IMG_1.ARW", "2025/a/IMG_1.xmp", "2025/b/IMG_2.ARW"],
+        ]
+        assert manifest_path(output).exists()
+
+    def test_tar_format_resume(self, tmp_path: Path) -> None:
+        """tar.xz形式のアーカイブを作成し、再実行時に完了済みのものを省略することを確認。"""
+        directory = self._make_directory(tmp_path)
+        zip_chunker([directory], 2000, verbose=False, archive_format="tar.xz")
+
+        archives = sorted(tmp_path.glob("shoot_*.tar.xz"))
+        assert [path.name for path in archives] == [
+            "shoot_1.tar.xz",
+            "shoot_2.tar.xz",
+            "shoot_3.tar.xz",
+        ]
+        with tarfile.open(archives[0]) as tar:
+            assert tar.getnames() == ["IMG_0.ARW", "IMG_1.ARW"]
+        records = ArchiveManifest(manifest_path(directory)).load()
+        assert records[1].files[0].crc == zlib.crc32(bytes([0]) * 1000)
+
+        mtime = archives[0].stat().st_mtime_ns
+        zip_chunker([directory], 2000, verbose=False, archive_format="tar.xz")
+        assert archives[0].stat().st_mtime_ns == mtime
+
+    def test_sink(self, tmp_path: Path) -> None:
+        """--sinkで1つの書き込み先に連結したアーカイブと、アーカイブごとのファイルを確認。"""
+        directory = self._make_directory(tmp_path)
+        stream = tmp_path / "stream.tar"
+        zip_chunker(
+            [directory], 2000, verbose=False, archive_format="tar", sink=str(stream)
+        )
+
+        # tarの終端ブロックを無視して読み込むと連結した全アーカイブの内容となる
+        with tarfile.open(stream, ignore_zeros=True) as tar:
+            assert tar.getnames() == [f"IMG_{i}.ARW" for i in range(5)]
+        assert not manifest_path(directory).exists()
+
+        out = tmp_path / "out"
+        out.mkdir()
+        zip_chunker([directory], 2000, verbose=False, sink=str(out / "{name}"))
+        assert sorted(path.name for path in out.iterdir()) == [
+            "shoot_1.zip",
+            "shoot_2.zip",
+            "shoot_3.zip",
+        ]
+        with zipfile.ZipFile(out / "shoot_3.zip") as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == ["IMG_4.ARW"]
@@ -0,0 +1,39 @@
+import io
+import zipfile
+
+import pytest
+
+from lrutility.archive.ZipStreamWriter import (
+    ZIP_FILECOUNT_LIMIT,
+    ZipStreamWriter,
+    end_records,
+)
+
+
+class TestZipStreamWriter:
+    """ZIPアーカイブを先頭から順に書き込むクラスのテストクラス。"""
+
+    @pytest.mark.parametrize(
+        ("count", "zip64"),
+        [(ZIP_FILECOUNT_LIMIT - 1, False), (ZIP_FILECOUNT_LIMIT, True)],
+    )
+    def test_end_records_zip64_count(self, count: int, zip64: bool) -> None:
+        """メンバー数が0xFFFF以上の場合にZIP64の終端レコードを書き込むことを確認。"""
+        records = end_records(count, 0, 0)
+        assert records.startswith(b"PK\x06\x06") is zip64
+
+    def test_roundtrip(self) -> None:
+        """書き込んだアーカイブをzipfileで検証・展開でき、sizeと一致することを確認。"""
+        stream = io.BytesIO()
+        with ZipStreamWriter(stream) as writer:
+            for name, data in (("IMG_0001.ARW", b"raw" * 100), ("写真.xmp", b"")):
+                writer.begin(zipfile.ZipInfo(name))
+                writer.write(data)
+                writer.end()
+            size = writer.size()
+
+        assert len(stream.getvalue()) == size
+        with zipfile.ZipFile(stream) as zf:
+            assert zf.testzip() is None
+            assert zf.read("IMG_0001.ARW") == b"raw" * 100
+            assert zf.getinfo("写真.xmp").flag_bits & 0x800